@@ -0,0 +1,42 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from utils.leaderboard import MonthlyKarmaRollup
+
+
+def create_monthly_karma():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS monthly_karma
+(
+    id         VARCHAR(36) PRIMARY KEY NOT NULL,
+    user_id    VARCHAR(36)             NOT NULL,
+    org_id     VARCHAR(36),
+    month      DATE                    NOT NULL,
+    karma      INT DEFAULT 0           NOT NULL,
+    updated_at DATETIME                NOT NULL,
+    INDEX idx_monthly_karma_month_karma (month, karma),
+    INDEX idx_monthly_karma_month_org (month, org_id),
+    INDEX idx_monthly_karma_user_month (user_id, month),
+    CONSTRAINT fk_monthly_karma_ref_user_id FOREIGN KEY (user_id) REFERENCES user (id) ON DELETE CASCADE,
+    CONSTRAINT fk_monthly_karma_ref_org_id FOREIGN KEY (org_id) REFERENCES organization (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_monthly_karma()
+    MonthlyKarmaRollup.backfill()
+    execute(
+        "UPDATE system_setting SET value = '1.60', updated_at = now() WHERE `key` = 'db.version';"
+    )
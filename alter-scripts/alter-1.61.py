@@ -0,0 +1,42 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from utils.leaderboard import KarmaAggregateTree
+
+
+def create_karma_aggregate():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS karma_aggregate
+(
+    id             VARCHAR(36) PRIMARY KEY NOT NULL,
+    level          VARCHAR(10)             NOT NULL,
+    entity_id      VARCHAR(36)             NOT NULL,
+    parent_id      VARCHAR(36),
+    total_karma    BIGINT DEFAULT 0        NOT NULL,
+    member_count   INT DEFAULT 0           NOT NULL,
+    active_members INT DEFAULT 0           NOT NULL,
+    updated_at     DATETIME                NOT NULL,
+    CONSTRAINT KarmaAggregateEntity UNIQUE (level, entity_id),
+    INDEX idx_karma_aggregate_level_karma (level, total_karma),
+    INDEX idx_karma_aggregate_parent_karma (parent_id, total_karma)
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_karma_aggregate()
+    KarmaAggregateTree.rebuild()
+    execute(
+        "UPDATE system_setting SET value = '1.61', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from api.launchpad.launchpad_helper import LaunchpadStandings
+
+
+def create_launchpad_standing():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS launchpad_standing
+(
+    id            VARCHAR(36) PRIMARY KEY NOT NULL,
+    user_id       VARCHAR(36) UNIQUE      NOT NULL,
+    karma         INT DEFAULT 0           NOT NULL,
+    last_karma_at DATETIME                NOT NULL,
+    position      INT,
+    org           VARCHAR(100),
+    district_name VARCHAR(75),
+    state         VARCHAR(75),
+    updated_at    DATETIME                NOT NULL,
+    INDEX idx_launchpad_standing_karma (karma DESC, last_karma_at),
+    INDEX idx_launchpad_standing_position (position),
+    CONSTRAINT fk_launchpad_standing_ref_user_id FOREIGN KEY (user_id) REFERENCES user (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_launchpad_standing()
+    LaunchpadStandings.rebuild()
+    execute(
+        "UPDATE system_setting SET value = '1.62', updated_at = now() WHERE `key` = 'db.version';"
+    )
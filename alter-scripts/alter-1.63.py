@@ -0,0 +1,39 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from utils.leaderboard import LearningCircleKarma
+
+
+def create_circle_karma():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS circle_karma
+(
+    id          VARCHAR(36) PRIMARY KEY NOT NULL,
+    circle_id   VARCHAR(36) UNIQUE      NOT NULL,
+    ig_id       VARCHAR(36)             NOT NULL,
+    total_karma INT DEFAULT 0           NOT NULL,
+    updated_at  DATETIME                NOT NULL,
+    INDEX idx_circle_karma_ig_karma (ig_id, total_karma),
+    CONSTRAINT fk_circle_karma_ref_circle_id FOREIGN KEY (circle_id) REFERENCES learning_circle (id) ON DELETE CASCADE,
+    CONSTRAINT fk_circle_karma_ref_ig_id FOREIGN KEY (ig_id) REFERENCES interest_group (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_circle_karma()
+    LearningCircleKarma.rebuild()
+    execute(
+        "UPDATE system_setting SET value = '1.63', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def add_approver_indexes():
+    execute(
+        "CREATE INDEX idx_karma_activity_log_peer_approver ON karma_activity_log (peer_approved_by, created_at);"
+    )
+    execute(
+        "CREATE INDEX idx_karma_activity_log_appraiser_approver ON karma_activity_log (appraiser_approved_by, created_at);"
+    )
+
+
+if __name__ == "__main__":
+    add_approver_indexes()
+    execute(
+        "UPDATE system_setting SET value = '1.64', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def create_circle_chat_message():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS circle_chat_message
+(
+    id         VARCHAR(36) PRIMARY KEY NOT NULL,
+    circle_id  VARCHAR(36)             NOT NULL,
+    room_name  VARCHAR(100)            NOT NULL,
+    user_id    VARCHAR(36)             NOT NULL,
+    message    TEXT                    NOT NULL,
+    created_at DATETIME(6)             NOT NULL,
+    INDEX idx_circle_chat_message_room (circle_id, room_name, created_at, id),
+    CONSTRAINT fk_circle_chat_message_ref_circle_id FOREIGN KEY (circle_id) REFERENCES learning_circle (id) ON DELETE CASCADE,
+    CONSTRAINT fk_circle_chat_message_ref_user_id FOREIGN KEY (user_id) REFERENCES user (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_circle_chat_message()
+    execute(
+        "UPDATE system_setting SET value = '1.65', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from utils.search import SearchIndex
+
+
+def create_search_document():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS search_document
+(
+    id         VARCHAR(36) PRIMARY KEY NOT NULL,
+    entity     VARCHAR(30)             NOT NULL,
+    entity_id  VARCHAR(36)             NOT NULL,
+    content    TEXT                    NOT NULL,
+    updated_at DATETIME(6)             NOT NULL,
+    UNIQUE KEY uq_search_document_entity (entity, entity_id),
+    FULLTEXT INDEX ft_search_document_content (content)
+) ENGINE = InnoDB;
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_search_document()
+    # Searches fall back to icontains until the first rebuild marks each
+    # entity's index ready
+    SearchIndex.rebuild_all()
+    execute(
+        "UPDATE system_setting SET value = '1.66', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def create_export_job():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS export_job
+(
+    id           VARCHAR(36) PRIMARY KEY NOT NULL,
+    export_type  VARCHAR(50)             NOT NULL,
+    params       JSON                    NOT NULL,
+    dedupe_key   VARCHAR(64)             NOT NULL,
+    status       VARCHAR(20)             NOT NULL,
+    rows_written INT                     NOT NULL DEFAULT 0,
+    total_rows   INT,
+    file_path    VARCHAR(255),
+    error        TEXT,
+    created_by   VARCHAR(36)             NOT NULL,
+    created_at   DATETIME(6)             NOT NULL,
+    updated_at   DATETIME(6)             NOT NULL,
+    completed_at DATETIME(6),
+    INDEX idx_export_job_dedupe (dedupe_key, created_at),
+    INDEX idx_export_job_created_at (created_at),
+    CONSTRAINT fk_export_job_ref_created_by FOREIGN KEY (created_by) REFERENCES user (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_export_job()
+    execute(
+        "UPDATE system_setting SET value = '1.67', updated_at = now() WHERE `key` = 'db.version';"
+    )
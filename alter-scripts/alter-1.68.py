@@ -0,0 +1,45 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def create_import_job():
+    execute(
+        """
+CREATE TABLE IF NOT EXISTS import_job
+(
+    id              VARCHAR(36) PRIMARY KEY NOT NULL,
+    import_type     VARCHAR(50)             NOT NULL,
+    file_path       VARCHAR(255)            NOT NULL,
+    params          JSON                    NOT NULL,
+    status          VARCHAR(20)             NOT NULL,
+    total_rows      INT,
+    processed_rows  INT                     NOT NULL DEFAULT 0,
+    success_count   INT                     NOT NULL DEFAULT 0,
+    error_count     INT                     NOT NULL DEFAULT 0,
+    error_file_path VARCHAR(255),
+    error           TEXT,
+    created_by      VARCHAR(36),
+    created_at      DATETIME(6)             NOT NULL,
+    updated_at      DATETIME(6)             NOT NULL,
+    completed_at    DATETIME(6),
+    INDEX idx_import_job_created_at (created_at),
+    CONSTRAINT fk_import_job_ref_created_by FOREIGN KEY (created_by) REFERENCES user (id) ON DELETE CASCADE
+);
+"""
+    )
+
+
+if __name__ == "__main__":
+    create_import_job()
+    execute(
+        "UPDATE system_setting SET value = '1.68', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def add_voucher_mail_status():
+    execute(
+        """
+ALTER TABLE voucher_log
+    ADD COLUMN mail_status   VARCHAR(20),
+    ADD COLUMN mail_attempts INT NOT NULL DEFAULT 0,
+    ADD COLUMN mail_error    TEXT,
+    ADD COLUMN mailed_at     DATETIME(6);
+"""
+    )
+
+
+def mark_existing_vouchers_sent():
+    # Vouchers created before this version were mailed on creation; the
+    # stale mail sweep must not send them again
+    execute("UPDATE voucher_log SET mail_status = 'sent' WHERE mail_status IS NULL;")
+
+
+if __name__ == "__main__":
+    add_voucher_mail_status()
+    mark_existing_vouchers_sent()
+    execute(
+        "UPDATE system_setting SET value = '1.69', updated_at = now() WHERE `key` = 'db.version';"
+    )
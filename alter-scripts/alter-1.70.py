@@ -0,0 +1,45 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def delete_duplicate_monthly_karma():
+    execute(
+        """
+DELETE newer
+FROM monthly_karma newer
+         JOIN monthly_karma older
+              ON newer.user_id = older.user_id
+                  AND newer.month = older.month
+                  AND newer.org_id <=> older.org_id
+                  AND newer.id > older.id;
+"""
+    )
+
+
+def add_monthly_karma_unique_key():
+    # A UNIQUE key allows repeated NULLs, so users without a college are
+    # keyed on an empty org instead
+    execute(
+        """
+ALTER TABLE monthly_karma
+    ADD COLUMN org_key VARCHAR(36) AS (IFNULL(org_id, '')) STORED NOT NULL,
+    ADD UNIQUE KEY uq_monthly_karma_user_org_month (user_id, org_key, month);
+"""
+    )
+
+
+if __name__ == "__main__":
+    delete_duplicate_monthly_karma()
+    add_monthly_karma_unique_key()
+    execute(
+        "UPDATE system_setting SET value = '1.70', updated_at = now() WHERE `key` = 'db.version';"
+    )
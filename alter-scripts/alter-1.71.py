@@ -0,0 +1,22 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+from utils.leaderboard import KarmaLeaderboard
+
+
+if __name__ == "__main__":
+    # Seeds the Redis karma leaderboards, which the profile rank, students
+    # leaderboard and Beken API read
+    KarmaLeaderboard.rebuild()
+    execute(
+        "UPDATE system_setting SET value = '1.71', updated_at = now() WHERE `key` = 'db.version';"
+    )
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import django
+
+from connection import execute
+
+os.chdir("..")
+sys.path.append(os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mulearnbackend.settings")
+django.setup()
+
+
+def add_export_job_attempts():
+    execute(
+        """
+ALTER TABLE export_job
+    ADD COLUMN attempts INT NOT NULL DEFAULT 0 AFTER error,
+    ADD INDEX idx_export_job_status_updated_at (status, updated_at);
+"""
+    )
+
+
+if __name__ == "__main__":
+    add_export_job_attempts()
+    execute(
+        "UPDATE system_setting SET value = '1.72', updated_at = now() WHERE `key` = 'db.version';"
+    )
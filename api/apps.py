@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Connects the signal receivers that keep the api snapshots current
+        from .common import common_consumer  # noqa: F401
+        from .dashboard.lc import dash_lc_chat_helper  # noqa: F401
+        from .launchpad import launchpad_helper  # noqa: F401
+        from .top100_coders import top100_helper  # noqa: F401
@@ -1,13 +1,22 @@
+import asyncio
 import json
+import os
+import socket
+import threading
+import time
 
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db.models import Count, Sum
 from django.db.models.functions import Coalesce
 
-from channels.generic.websocket import WebsocketConsumer
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
+from django_redis import get_redis_connection
 
 from db.learning_circle import LearningCircle
 from db.learning_circle import UserCircleLink
@@ -15,10 +24,51 @@ from db.organization import Organization
 from db.task import InterestGroup, KarmaActivityLog
 from db.user import User, UserRoleLink
 
-from utils.types import IntegrationType, OrganizationType
+from utils.types import IntegrationType, OrganizationType, RoleType
 
 class LandingStats:
-    data = {}
+    """
+    Landing page counters shared by every worker through a Redis hash.
+
+    Creates and deletes adjust the counters atomically after commit, and
+    reconcile() periodically resets them from the database to correct any
+    drift. Changed categories are broadcast to the landing_stats group at
+    most once per FLUSH_INTERVAL. The connection count changes with every
+    socket, so it never queues a broadcast itself; it rides along with the
+    next one, and new sockets read it on connect.
+
+    Each process publishes its own connection count under a key that
+    expires unless a heartbeat refreshes it, so the sockets of a crashed
+    process drop out of the total.
+    """
+
+    COUNTERS_KEY = "landing_stats:counters"
+    DIRTY_KEY = "landing_stats:dirty"
+    QUEUED_KEY = "landing_stats:flush_queued"
+    CONNECTIONS_KEY = "landing_stats:connections:{process}"
+    PROCESSES_KEY = "landing_stats:connection_processes"
+    # Seconds a process's connection count outlives its last heartbeat
+    CONNECTIONS_TTL = 60
+    # Seconds to coalesce changes into one broadcast
+    FLUSH_INTERVAL = 5
+    # Seconds a process serves its snapshot before re-reading Redis
+    SNAPSHOT_TTL = 30
+
+    ORG_TYPES = [OrganizationType.COLLEGE.value, OrganizationType.COMPANY.value,
+                 OrganizationType.COMMUNITY.value]
+    ROLES = [RoleType.MENTOR.value, RoleType.ENABLER.value]
+    CATEGORIES = ['members', 'org_type_counts', 'enablers_mentors_count', 'ig_count',
+                  'learning_circle_count', 'karma_pow_count']
+
+    _snapshot = None
+    _loaded_at = 0
+    _connections = 0
+    _connections_lock = threading.Lock()
+    _heartbeat = None
+
+    @staticmethod
+    def get_connection():
+        return get_redis_connection("redis")
 
     def members_count(self):
         members_count = User.objects.all().count()
@@ -26,8 +76,7 @@ class LandingStats:
 
     def org_type_counts(self):
         org_type_counts = Organization.objects.filter(
-                org_type__in=[OrganizationType.COLLEGE.value, OrganizationType.COMPANY.value,
-                                OrganizationType.COMMUNITY.value]
+                org_type__in=self.ORG_TYPES
             ).values('org_type').annotate(org_count=Coalesce(Count('org_type'), 0))
         org_type_counts = list(org_type_counts)
 
@@ -35,7 +84,7 @@ class LandingStats:
 
     def enablers_mentors_count(self):
         enablers_mentors_count = UserRoleLink.objects.filter(
-            role__title__in=["Mentor", "Enabler"]).values(
+            role__title__in=self.ROLES).values(
             'role__title').annotate(role_count=Coalesce(Count('role__title'), 0))
         enablers_mentors_count = list(enablers_mentors_count)
 
@@ -53,73 +102,236 @@ class LandingStats:
         karma_pow_count = KarmaActivityLog.objects.aggregate(karma_count=Coalesce(Sum('karma'), 0), pow_count=Count('id'))
         return karma_pow_count
 
-    def get_data(self, sender):
-        if sender == None:
-            self.data = {
-                'members': self.members_count(),
-                'org_type_counts': self.org_type_counts(),
-                'enablers_mentors_count': self.enablers_mentors_count(),
-                'ig_count': self.interest_groups_count(),
-                'learning_circle_count': self.learning_circles_count(),
-                'karma_pow_count': self.karma_pow_count()
-            }
-        elif sender == User:
-            self.data['members'] = self.members_count()
+    def reconcile(self):
+        """
+        Resets every counter from the database and broadcasts the result.
+        """
+        counters = {
+            'members': self.members_count(),
+            'ig_count': self.interest_groups_count(),
+            'learning_circle_count': self.learning_circles_count(),
+            **{f'org:{org_type}': 0 for org_type in self.ORG_TYPES},
+            **{f'role:{role}': 0 for role in self.ROLES},
+        }
+        for org_type in self.org_type_counts():
+            counters[f"org:{org_type['org_type']}"] = org_type['org_count']
+        for role in self.enablers_mentors_count():
+            counters[f"role:{role['role__title']}"] = role['role_count']
+        karma_pow_count = self.karma_pow_count()
+        counters['karma'] = karma_pow_count['karma_count']
+        counters['pow'] = karma_pow_count['pow_count']
+
+        self.get_connection().hset(self.COUNTERS_KEY, mapping=counters)
+        self.mark_dirty(*self.CATEGORIES)
+
+    def increment(self, category, amounts: dict):
+        pipeline = self.get_connection().pipeline()
+        for field, amount in amounts.items():
+            pipeline.hincrby(self.COUNTERS_KEY, field, amount)
+        pipeline.execute()
+        self.mark_dirty(category)
+
+    def get_data(self, categories=None):
+        counters = {
+            field.decode(): int(value)
+            for field, value in self.get_connection().hgetall(self.COUNTERS_KEY).items()
+        }
+        if 'members' not in counters:
+            self.reconcile()
+            return self.get_data(categories)
+
+        data = {
+            'members': counters.get('members', 0),
+            'org_type_counts': [
+                {'org_type': org_type, 'org_count': counters.get(f'org:{org_type}', 0)}
+                for org_type in self.ORG_TYPES
+            ],
+            'enablers_mentors_count': [
+                {'role__title': role, 'role_count': counters.get(f'role:{role}', 0)}
+                for role in self.ROLES
+            ],
+            'ig_count': counters.get('ig_count', 0),
+            'learning_circle_count': counters.get('learning_circle_count', 0),
+            'karma_pow_count': {
+                'karma_count': counters.get('karma', 0),
+                'pow_count': counters.get('pow', 0),
+            },
+            'connections': self.get_connections(),
+        }
+        if categories is None:
+            return data
+        return {category: data[category] for category in categories}
+
+    def get_snapshot(self):
+        """
+        Returns this process's copy of the stats, reloaded from Redis every
+        SNAPSHOT_TTL seconds and kept current in between by the deltas the
+        connected consumers receive.
+        """
+        if self._snapshot is None or time.monotonic() - self._loaded_at > self.SNAPSHOT_TTL:
+            self._snapshot, self._loaded_at = self.get_data(), time.monotonic()
+        return self._snapshot
+
+    def apply_delta(self, data):
+        if self._snapshot is not None:
+            self._snapshot.update(data)
+
+    @staticmethod
+    def get_process_id():
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def track_connection(self, amount) -> int:
+        """
+        Returns the number of connected sockets after the change.
+        """
+        with self._connections_lock:
+            self._connections += amount
+        self.publish_connections()
+        return self.get_connections()
+
+    def publish_connections(self):
+        process = self.get_process_id()
+        pipeline = self.get_connection().pipeline()
+        if self._connections > 0:
+            pipeline.set(
+                self.CONNECTIONS_KEY.format(process=process),
+                self._connections,
+                ex=self.CONNECTIONS_TTL,
+            )
+            pipeline.sadd(self.PROCESSES_KEY, process)
+        else:
+            pipeline.delete(self.CONNECTIONS_KEY.format(process=process))
+            pipeline.srem(self.PROCESSES_KEY, process)
+        pipeline.execute()
+
+    def get_connections(self) -> int:
+        """
+        Sums the connection counts of the processes whose heartbeat is
+        current, forgetting the others.
+        """
+        connection = self.get_connection()
+        processes = [process.decode() for process in connection.smembers(self.PROCESSES_KEY)]
+        if not processes:
+            return 0
+        counts = connection.mget(
+            [self.CONNECTIONS_KEY.format(process=process) for process in processes]
+        )
+        if expired := [process for process, count in zip(processes, counts) if count is None]:
+            connection.srem(self.PROCESSES_KEY, *expired)
+        return sum(int(count) for count in counts if count is not None)
 
-        elif sender == Organization:
-            self.data['org_type_counts'] = self.org_type_counts()
+    def start_heartbeat(self):
+        """
+        Keeps this process's connection count alive while it has sockets.
+        Must be called from the event loop.
+        """
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
 
-        elif sender == UserRoleLink:
-            self.data['enablers_mentors_count'] = self.enablers_mentors_count()
+    async def _beat(self):
+        while self._connections > 0:
+            await asyncio.sleep(self.CONNECTIONS_TTL / 3)
+            await sync_to_async(self.publish_connections, thread_sensitive=False)()
 
-        elif sender == InterestGroup:
-            self.data['ig_count'] = self.interest_groups_count()
+    def mark_dirty(self, *categories):
+        """
+        Records changed categories and queues one flush for every burst of
+        changes, so bulk writes cost a single broadcast.
+        """
+        from mu_celery.task import flush_landing_stats
 
-        elif sender == LearningCircle:
-            self.data['learning_circle_count'] = self.learning_circles_count()
+        self.get_connection().sadd(self.DIRTY_KEY, *categories)
+        if cache.add(self.QUEUED_KEY, True, timeout=self.FLUSH_INTERVAL * 2):
+            flush_landing_stats.apply_async(countdown=self.FLUSH_INTERVAL)
+
+    def flush(self):
+        cache.delete(self.QUEUED_KEY)
+
+        pipeline = self.get_connection().pipeline()
+        pipeline.smembers(self.DIRTY_KEY)
+        pipeline.delete(self.DIRTY_KEY)
+        dirty, _ = pipeline.execute()
+        if not dirty:
+            return
+
+        async_to_sync(channel_layer.group_send)(
+            GlobalCount.group_name,
+            {
+                "type": "send_data",
+                "data": self.get_data([*(category.decode() for category in dirty), 'connections']),
+            }
+        )
 
 
 landing_stats = LandingStats()
 
-class GlobalCount(WebsocketConsumer):
-    data = {}
+class GlobalCount(AsyncWebsocketConsumer):
+    """
+    Landing page stats socket. Sends the process's snapshot on connect and
+    then the changed categories after every debounced flush, so
+    connections cost no database work.
+    """
+
     group_name = "landing_stats"
 
-    def connect(self):
-        async_to_sync(self.channel_layer.group_add)(
-                self.group_name, 
-                self.channel_name
-            )
-        self.accept()
+    async def connect(self):
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        connections = await sync_to_async(landing_stats.track_connection, thread_sensitive=False)(1)
+        landing_stats.start_heartbeat()
 
-        landing_stats.get_data(None)
-        self.data = landing_stats.data
+        # Reconciles from the ORM when Redis is empty
+        snapshot = await database_sync_to_async(landing_stats.get_snapshot)()
+        await self.send(text_data=json.dumps({**snapshot, 'connections': connections}))
 
-        self.send(text_data=json.dumps(self.data))
-    
-    def disconnect(self, code):
-        self.channel_layer.group_discard(self.group_name, self.channel_name)
-    
-    def send_data(self, event):
-        self.send(text_data=json.dumps(event['data']))
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await sync_to_async(landing_stats.track_connection, thread_sensitive=False)(-1)
+
+    async def send_data(self, event):
+        landing_stats.apply_delta(event['data'])
+        await self.send(text_data=json.dumps(event['data']))
 
 channel_layer = get_channel_layer()
-    
+
+SENDER_COUNTERS = {
+    User: 'members',
+    InterestGroup: 'ig_count',
+    LearningCircle: 'learning_circle_count',
+}
+
 @receiver(post_save, sender=User)
 @receiver(post_save, sender=LearningCircle)
 @receiver(post_save, sender=InterestGroup)
 @receiver(post_save, sender=UserRoleLink)
 @receiver(post_save, sender=Organization)
+@receiver(post_save, sender=KarmaActivityLog)
 @receiver(post_delete, sender=User)
 @receiver(post_delete, sender=LearningCircle)
 @receiver(post_delete, sender=InterestGroup)
 @receiver(post_delete, sender=UserRoleLink)
 @receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=KarmaActivityLog)
 def db_signals(sender, instance, created=None, *args, **kwargs):
-    if created or created == None:
-        landing_stats.get_data(sender)
-        data = landing_stats.data
-        async_to_sync(channel_layer.group_send)(
-            "landing_stats",
-            {"type": "send_data", "data": data}
-        )
+    if created is False:
+        return
+    amount = 1 if created else -1
+
+    if sender in SENDER_COUNTERS:
+        category = SENDER_COUNTERS[sender]
+        amounts = {category: amount}
+    elif sender == Organization:
+        if instance.org_type not in landing_stats.ORG_TYPES:
+            return
+        category = 'org_type_counts'
+        amounts = {f'org:{instance.org_type}': amount}
+    elif sender == UserRoleLink:
+        if instance.role.title not in landing_stats.ROLES:
+            return
+        category = 'enablers_mentors_count'
+        amounts = {f'role:{instance.role.title}': amount}
+    else:
+        category = 'karma_pow_count'
+        amounts = {'pow': amount, 'karma': amount * instance.karma}
+
+    transaction.on_commit(lambda: landing_stats.increment(category, amounts))
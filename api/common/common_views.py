@@ -4,17 +4,18 @@ import requests
 from django.db import models
 from django.db.models import Case, When, Value, CharField, Count, Q, F, Sum
 from django.db.models import Subquery, OuterRef
-from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 
 from db.learning_circle import LearningCircle
 from db.learning_circle import UserCircleLink
 from db.organization import Organization,Department,District,State,Country
-from db.task import InterestGroup, KarmaActivityLog, UserIgLink
-from db.user import User, UserRoleLink
+from db.task import InterestGroup, UserIgLink
+from db.user import User
+from utils.leaderboard import InterestGroupLeaderboard, KarmaLeaderboard
 from utils.response import CustomResponse
-from utils.types import IntegrationType, OrganizationType, RoleType
+from utils.types import IntegrationType, KarmaLeaderboardType, OrganizationType
 from utils.utils import CommonUtils
+from .common_consumer import landing_stats
 from .serializer import StudentInfoSerializer, CollegeInfoSerializer, LearningCircleEnrollmentSerializer, \
     UserLeaderboardSerializer,OrgSerializer,DistrictSerializer,StateSerializer,CountrySerializer, LcDetailsSerializer, \
     LcListSerializer
@@ -33,7 +34,7 @@ class LcDetailsAPI(APIView):
 
 class LcListAPI(APIView):
     def get(self, request):
-        all_circles = LearningCircle.objects.all()
+        all_circles = LearningCircle.objects.select_related("circle_karma_circle")
         
         ig = request.query_params.get("ig")
         org = request.query_params.get("org")
@@ -52,6 +53,7 @@ class LcListAPI(APIView):
             all_circles,
             request,
             search_fields=[],
+            sort_fields={"karma": "circle_karma_circle__total_karma"},
         )
 
         serializer = LcListSerializer(
@@ -314,9 +316,9 @@ class LcReportDownloadAPI(APIView):
             )
         )
 
-        student_info_data = StudentInfoSerializer(student_info, many=True).data
+        student_info_rows = CommonUtils.iter_serialized(student_info, StudentInfoSerializer)
 
-        return CommonUtils.generate_csv(student_info_data, "Learning Circle Report")
+        return CommonUtils.generate_csv(student_info_rows, "Learning Circle Report")
 
 
 class CollegeWiseLcReport(APIView):
@@ -399,51 +401,60 @@ class CollegeWiseLcReportCSV(APIView):
             is_pagination=False
         )
 
-        lc_report = CollegeInfoSerializer(paginated_queryset, many=True).data
+        lc_report_rows = CommonUtils.iter_serialized(
+            paginated_queryset, CollegeInfoSerializer
+        )
 
-        return CommonUtils.generate_csv(lc_report, "Learning Circle Report")
+        return CommonUtils.generate_csv(lc_report_rows, "Learning Circle Report")
+
+
+LC_ENROLLMENT_SEARCH_FIELDS = ["full_name", "email", "muid", "circle_name", "district", "circle_ig",
+                               "organisation", "karma_earned"]
+LC_ENROLLMENT_SORT_FIELDS = {"full_name": "full_name", "email": "email", "muid": "muid",
+                             "circle_name": "circle_name", "district": "district", "circle_ig": "circle_ig",
+                             "organisation": "organisation", "dwms_id": "dwms_id", "karma_earned": "karma_earned"}
+
+
+def get_lc_enrollment():
+    return (UserCircleLink.objects.filter(accepted=True,
+                                          user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value).values(
+        full_name=F("user__full_name"),
+        email=F("user__email"),
+        muid=F("user__muid"),
+        circle_name=F("circle__name"),
+        district=F("user__user_organization_link_user__org__district__name"),
+        circle_ig=F("circle__ig__name"),
+        organisation=F("user__user_organization_link_user__org__title"),
+    )
+    .annotate(
+        karma_earned=Sum(
+            "user__karma_activity_log_user__task__karma",
+            filter=Q(
+                user__karma_activity_log_user__task__ig=F("circle__ig")
+            ),
+        ),
+        dwms_id=Case(
+            When(
+                user__integration_authorization_user__integration__name=IntegrationType.KKEM.value,
+                then=F(
+                    "user__integration_authorization_user__additional_field"
+                ),
+            ),
+            default=Value(None, output_field=CharField()),
+            output_field=CharField(),
+        ),
+    )
+    )
 
 
 class LearningCircleEnrollment(APIView):
 
     def get(self, request):
-        total_no_enrollment = (UserCircleLink.objects.filter(accepted=True,
-                                                             user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value).values(
-            full_name=F("user__full_name"),
-            email=F("user__email"),
-            muid=F("user__muid"),
-            circle_name=F("circle__name"),
-            district=F("user__user_organization_link_user__org__district__name"),
-            circle_ig=F("circle__ig__name"),
-            organisation=F("user__user_organization_link_user__org__title"),
-        )
-        .annotate(
-            karma_earned=Sum(
-                "user__karma_activity_log_user__task__karma",
-                filter=Q(
-                    user__karma_activity_log_user__task__ig=F("circle__ig")
-                ),
-            ),
-            dwms_id=Case(
-                When(
-                    user__integration_authorization_user__integration__name=IntegrationType.KKEM.value,
-                    then=F(
-                        "user__integration_authorization_user__additional_field"
-                    ),
-                ),
-                default=Value(None, output_field=CharField()),
-                output_field=CharField(),
-            ),
-        )
-        )
         paginated_queryset = CommonUtils.get_paginated_queryset(
-            total_no_enrollment,
+            get_lc_enrollment(),
             request,
-            search_fields=["full_name", "email", "muid", "circle_name", "district", "circle_ig",
-                           "organisation", "karma_earned"],
-            sort_fields={"full_name": "full_name", "email": "email", "muid": "muid",
-                         "circle_name": "circle_name", "district": "district", "circle_ig": "circle_ig",
-                         "organisation": "organisation", "dwms_id": "dwms_id", "karma_earned": "karma_earned"},
+            search_fields=LC_ENROLLMENT_SEARCH_FIELDS,
+            sort_fields=LC_ENROLLMENT_SORT_FIELDS,
             is_pagination=True)
         lc_enrollment = LearningCircleEnrollmentSerializer(paginated_queryset.get('queryset'), many=True).data
 
@@ -454,85 +465,23 @@ class LearningCircleEnrollment(APIView):
 
 class LearningCircleEnrollmentCSV(APIView):
     def get(self, request):
-        total_no_enrollment = (UserCircleLink.objects.filter(accepted=True,
-                                                             user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value).values(
-            full_name=F("user__full_name"),
-            email=F("user__email"),
-            muid=F("user__muid"),
-            circle_name=F("circle__name"),
-            district=F("user__user_organization_link_user__org__district__name"),
-            circle_ig=F("circle__ig__name"),
-            organisation=F("user__user_organization_link_user__org__title"),
-
-        )
-        .annotate(
-            karma_earned=Sum(
-                "user__karma_activity_log_user__task__karma",
-                filter=Q(
-                    user__karma_activity_log_user__task__ig=F("circle__ig")
-                ),
-            ),
-            dwms_id=Case(
-                When(
-                    user__integration_authorization_user__integration__name=IntegrationType.KKEM.value,
-                    then=F(
-                        "user__integration_authorization_user__additional_field"
-                    ),
-                ),
-                default=Value(None, output_field=CharField()),
-                output_field=CharField(),
-            ),
-        )
-        )
         paginated_queryset = CommonUtils.get_paginated_queryset(
-            total_no_enrollment,
+            get_lc_enrollment(),
             request,
-            search_fields=["full_name", "email", "muid", "circle_name", "district", "circle_ig",
-                           "organisation", "karma_earned"],
-            sort_fields={"full_name": "full_name", "email": "email", "muid": "muid",
-                         "circle_name": "circle_name", "district": "district", "circle_ig": "circle_ig",
-                         "organisation": "organisation", "dwms_id": "dwms_id", "karma_earned": "karma_earned"},
+            search_fields=LC_ENROLLMENT_SEARCH_FIELDS,
+            sort_fields=LC_ENROLLMENT_SORT_FIELDS,
             is_pagination=False)
 
-        lc_enrollment = LearningCircleEnrollmentSerializer(paginated_queryset, many=True).data
+        lc_enrollment_rows = CommonUtils.iter_serialized(
+            paginated_queryset, LearningCircleEnrollmentSerializer
+        )
 
-        return CommonUtils.generate_csv(lc_enrollment, "Learning Enrollment Report")
+        return CommonUtils.generate_csv(lc_enrollment_rows, "Learning Enrollment Report")
 
 
 class GlobalCountAPI(APIView):
     def get(self, request):
-        members_count = User.objects.all().count()
-        org_type_counts = (
-            Organization.objects.filter(
-                org_type__in=[
-                    OrganizationType.COLLEGE.value,
-                    OrganizationType.COMPANY.value,
-                    OrganizationType.COMMUNITY.value,
-                ]
-            )
-            .values("org_type")
-            .annotate(org_count=Coalesce(Count("org_type"), 0))
-        )
-
-        enablers_mentors_count = (
-            UserRoleLink.objects.filter(
-                role__title__in=[RoleType.MENTOR.value, RoleType.ENABLER.value]
-            )
-            .values("role__title")
-            .annotate(role_count=Coalesce(Count("role__title"), 0))
-        )
-
-        interest_groups_count = InterestGroup.objects.all().count()
-        learning_circles_count = LearningCircle.objects.all().count()
-
-        data = {
-            "members": members_count,
-            "org_type_counts": org_type_counts,
-            "enablers_mentors_count": enablers_mentors_count,
-            "ig_count": interest_groups_count,
-            "learning_circle_count": learning_circles_count,
-        }
-        return CustomResponse(response=data).get_success_response()
+        return CustomResponse(response=landing_stats.get_data()).get_success_response()
 
 
 class GTASANDSHOREAPI(APIView):
@@ -582,15 +531,21 @@ class ListTopIgUsersAPI(APIView):
     def get(self, request):
         ig_name = request.query_params.getlist("ig_name", [])
 
-        user_karma_by_ig = KarmaActivityLog.objects.filter(
-            task__ig__name__in=ig_name, appraiser_approved=True
-        ).values(
-            userid=F('user__id'),
-            muid=F('user__muid'),
-            full_name=F('user__full_name'),
-        ).annotate(
-            ig_karma=Sum('karma')
-        ).order_by('-ig_karma')[:100]
+        ig_ids = list(
+            InterestGroup.objects.filter(name__in=ig_name).values_list("id", flat=True)
+        )
+        top_users = InterestGroupLeaderboard.get_top(ig_ids, 100)
+        users = {
+            user["userid"]: user
+            for user in User.objects.filter(
+                id__in=[entry["user_id"] for entry in top_users]
+            ).values(userid=F("id"), muid=F("muid"), full_name=F("full_name"))
+        }
+        user_karma_by_ig = [
+            {**users[entry["user_id"]], "ig_karma": entry["karma"]}
+            for entry in top_users
+            if entry["user_id"] in users
+        ]
 
         # Extract 'userid' values into a new list
         userid_list = [entry['userid'] for entry in user_karma_by_ig]
@@ -623,9 +578,11 @@ class ListTopIgUsersAPI(APIView):
 
 class BekenAPI(APIView):
     def get(self, request):
-        user_info = User.objects.exclude(
-            user_role_link_user__role__title__in=[RoleType.ENABLER.value, RoleType.MENTOR.value]).order_by(
-            '-wallet_user__karma')[:100]
+        user_info = KarmaLeaderboard.get_top_users(
+            KarmaLeaderboardType.STUDENT.value,
+            User.objects.select_related("wallet_user"),
+            100,
+        )
         data = UserLeaderboardSerializer(user_info, many=True)
         return CustomResponse(response=data.data).get_success_response()
 
@@ -11,6 +11,7 @@ from db.organization import (
 from db.learning_circle import LearningCircle
 from db.task import KarmaActivityLog
 from db.user import User
+from utils.leaderboard import LearningCircleKarma
 
 class LcListSerializer(serializers.ModelSerializer):
     ig_name = serializers.CharField(source='ig.name')
@@ -56,16 +57,7 @@ class LcListSerializer(serializers.ModelSerializer):
         )
 
     def get_karma(self, obj):
-        
-        karma_activity_log = KarmaActivityLog.objects.filter(
-            user__user_circle_link_user__circle=obj,
-        ).aggregate(
-            karma=Sum(
-                'karma'
-            )
-        )['karma']
-
-        return karma_activity_log if karma_activity_log else 0
+        return LearningCircleKarma.get_total_karma(obj)
     
 class LcDetailsSerializer(serializers.ModelSerializer):
     college = serializers.CharField(source='org.title', allow_null=True)
@@ -93,17 +85,7 @@ class LcDetailsSerializer(serializers.ModelSerializer):
         ]
 
     def get_total_karma(self, obj):
-        return (
-            KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=obj,
-                user__user_circle_link_user__accepted=True,
-                task__ig=obj.ig,
-                appraiser_approved=True,
-            ).aggregate(
-                total_karma=Sum(
-                    'karma'
-                ))['total_karma'] or 0
-        )
+        return LearningCircleKarma.get_total_karma(obj)
 
     def get_members(self, obj):
         return self._get_member_info(obj, accepted=1)
@@ -140,53 +122,7 @@ class LcDetailsSerializer(serializers.ModelSerializer):
         return member_info
 
     def get_rank(self, obj):
-        total_karma = KarmaActivityLog.objects.filter(
-            user__user_circle_link_user__circle=obj,
-            user__user_circle_link_user__accepted=True,
-            task__ig=obj.ig,
-            appraiser_approved=True
-        ).aggregate(
-            total_karma=Sum(
-                'karma'
-            )
-        )['total_karma'] or 0
-
-        circle_ranks = {obj.name: {'total_karma': total_karma}}
-
-        all_learning_circles = LearningCircle.objects.filter(
-            ig=obj.ig
-        ).exclude(
-            id=obj.id
-        )
-
-        for lc in all_learning_circles:
-            total_karma_lc = KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=lc,
-                user__user_circle_link_user__accepted=True,
-                task__ig=lc.ig,
-                appraiser_approved=True
-            ).aggregate(
-                total_karma=Sum(
-                    'karma'
-                )
-            )['total_karma'] or 0
-
-            circle_ranks[lc.name] = {'total_karma': total_karma_lc}
-
-        sorted_ranks = sorted(
-            circle_ranks.items(),
-            key=lambda x: x[1]['total_karma'],
-            reverse=True
-        )
-
-        return next(
-            (
-                i + 1
-                for i, (circle_name, data) in enumerate(sorted_ranks)
-                if circle_name == obj.name
-            ),
-            None,
-        )
+        return LearningCircleKarma.get_rank(obj)
 
 
 class StudentInfoSerializer(serializers.Serializer):
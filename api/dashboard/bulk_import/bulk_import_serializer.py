@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from db.bulk_import import ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "import_type",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "success_count",
+            "error_count",
+            "error",
+            "created_at",
+            "completed_at",
+        ]
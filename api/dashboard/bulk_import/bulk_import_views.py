@@ -0,0 +1,72 @@
+import os
+
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+
+from db.bulk_import import ImportJob
+from utils.bulk_import import ImportJobs
+from utils.permission import CustomizePermission, JWTUtils
+from utils.response import CustomResponse
+from utils.types import JobStatus
+from utils.utils import CommonUtils
+from .bulk_import_serializer import ImportJobSerializer
+
+# Bytes read per chunk when streaming an error sheet
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def get_error_sheet_response(job: ImportJob):
+    if job.status != JobStatus.COMPLETED.value or job.error_file_path is None:
+        return CustomResponse(
+            general_message="Import has no error sheet"
+        ).get_failure_response()
+    if not os.path.exists(file_path := ImportJobs.get_file_path(job.error_file_path)):
+        return CustomResponse(
+            general_message="Error sheet has expired"
+        ).get_failure_response()
+
+    def read_chunks():
+        with open(file_path, "rb") as error_file:
+            while chunk := error_file.read(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+
+    response = StreamingHttpResponse(
+        CommonUtils.iter_async(read_chunks()),
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{job.import_type}-errors.xlsx"'
+    )
+    return response
+
+
+class ImportJobAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = ImportJob.objects.filter(
+            id=job_id, created_by_id=JWTUtils.fetch_user_id(request)
+        ).first()
+        if job is None:
+            return CustomResponse(
+                general_message="Import not found"
+            ).get_failure_response()
+
+        return CustomResponse(
+            response=ImportJobSerializer(job).data
+        ).get_success_response()
+
+
+class ImportErrorSheetAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = ImportJob.objects.filter(
+            id=job_id, created_by_id=JWTUtils.fetch_user_id(request)
+        ).first()
+        if job is None:
+            return CustomResponse(
+                general_message="Import not found"
+            ).get_failure_response()
+
+        return get_error_sheet_response(job)
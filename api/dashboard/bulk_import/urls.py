@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import bulk_import_views
+
+urlpatterns = [
+    path("jobs/<str:job_id>/", bulk_import_views.ImportJobAPI.as_view(), name="import-job"),
+    path(
+        "jobs/<str:job_id>/errors/",
+        bulk_import_views.ImportErrorSheetAPI.as_view(),
+        name="import-error-sheet",
+    ),
+]
@@ -3,14 +3,14 @@ from django.db.models import Q
 from rest_framework.views import APIView
 
 from db.organization import UserOrganizationLink
-from db.task import Level, Wallet, InterestGroup
+from db.task import Level, InterestGroup
 from db.user import User, Role, UserRoleLink
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
 from utils.types import OrganizationType, RoleType
 from utils.utils import CommonUtils
 from . import serializers
-from .dash_campus_helper import get_user_college_link
+from .dash_campus_helper import get_campus_student_details, get_user_college_link
 
 
 class CampusDetailsAPI(APIView):
@@ -99,76 +99,9 @@ class CampusStudentDetailsAPI(APIView):
             return CustomResponse(
                 general_message="Campus lead has no college"
             ).get_failure_response()
-        if is_alumni:
-            rank = (
-                Wallet.objects.filter(
-                    user__user_organization_link_user__org=user_org_link.org,
-                    user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                    user__user_organization_link_user__is_alumni=is_alumni,
-                )
-                .distinct()
-                .order_by("-karma", "-created_at")
-                .values(
-                    "user_id",
-                    "karma",
-                )
-            )
-
-            ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-            user_org_links = (
-                User.objects.filter(
-                    user_organization_link_user__org=user_org_link.org,
-                    user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                    user_organization_link_user__is_alumni=is_alumni,
-                )
-                .distinct()
-                .annotate(
-                    user_id=F("id"),
-                    email_=F("email"),
-                    mobile_=F("mobile"),
-                    karma=F("wallet_user__karma"),
-                    level=F("user_lvl_link_user__level__name"),
-                    join_date=F("created_at"),
-                    last_karma_gained=F("wallet_user__karma_last_updated_at"),
-                    department=F('user_organization_link_user__department__title'),
-                    graduation_year=F("user_organization_link_user__graduation_year"),
-                    is_alumni=F('user_organization_link_user__is_alumni'),
-                ))
-        else:
-            rank = (
-                Wallet.objects.filter(
-                    user__user_organization_link_user__org=user_org_link.org,
-                    user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                )
-                .distinct()
-                .order_by("-karma", "-created_at")
-                .values(
-                    "user_id",
-                    "karma",
-                )
-            )
-
-            ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-            user_org_links = (
-                User.objects.filter(
-                    user_organization_link_user__org=user_org_link.org,
-                    user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                )
-                .distinct()
-                .annotate(
-                    user_id=F("id"),
-                    email_=F("email"),
-                    mobile_=F("mobile"),
-                    karma=F("wallet_user__karma"),
-                    level=F("user_lvl_link_user__level__name"),
-                    join_date=F("created_at"),
-                    last_karma_gained=F("wallet_user__karma_last_updated_at"),
-                    department=F('user_organization_link_user__department__title'),
-                    graduation_year=F("user_organization_link_user__graduation_year"),
-                    is_alumni=F('user_organization_link_user__is_alumni'),
-                ))
+        user_org_links = get_campus_student_details(
+            user_org_link.org, is_alumni, request
+        )
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
             user_org_links,
@@ -187,8 +120,7 @@ class CampusStudentDetailsAPI(APIView):
             },
         )
 
-        serializer = serializers.CampusStudentDetailsSerializer(paginated_queryset.get("queryset"), many=True,
-                                                                context={"ranks": ranks})
+        serializer = serializers.CampusStudentDetailsSerializer(paginated_queryset.get("queryset"), many=True)
         return CustomResponse(
             response={
                 "data": serializer.data,
@@ -214,76 +146,7 @@ class CampusStudentDetailsCSVAPI(APIView):
                 general_message="Campus lead has no college"
             ).get_failure_response()
 
-        if is_alumni:
-            rank = (
-                Wallet.objects.filter(
-                    user__user_organization_link_user__org=user_org_link.org,
-                    user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                    user__user_organization_link_user__is_alumni=is_alumni,
-                )
-                .distinct()
-                .order_by("-karma", "-created_at")
-                .values(
-                    "user_id",
-                    "karma",
-                )
-            )
-
-            ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-            user_org_links = (
-                User.objects.filter(
-                    user_organization_link_user__org=user_org_link.org,
-                    user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                    user_organization_link_user__is_alumni=is_alumni,
-                )
-                .distinct()
-                .annotate(
-                    user_id=F("id"),
-                    email_=F("email"),
-                    mobile_=F("mobile"),
-                    karma=F("wallet_user__karma"),
-                    level=F("user_lvl_link_user__level__name"),
-                    join_date=F("created_at"),
-                    last_karma_gained=F("wallet_user__karma_last_updated_at"),
-                    department=F('user_organization_link_user__department__title'),
-                    graduation_year=F("user_organization_link_user__graduation_year"),
-                    is_alumni=F('user_organization_link_user__is_alumni'),
-                ))
-        else:
-            rank = (
-                Wallet.objects.filter(
-                    user__user_organization_link_user__org=user_org_link.org,
-                    user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                )
-                .distinct()
-                .order_by("-karma", "-created_at")
-                .values(
-                    "user_id",
-                    "karma",
-                )
-            )
-
-            ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-            user_org_links = (
-                User.objects.filter(
-                    user_organization_link_user__org=user_org_link.org,
-                    user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                )
-                .distinct()
-                .annotate(
-                    user_id=F("id"),
-                    email_=F("email"),
-                    mobile_=F("mobile"),
-                    karma=F("wallet_user__karma"),
-                    level=F("user_lvl_link_user__level__name"),
-                    join_date=F("created_at"),
-                    last_karma_gained=F("wallet_user__karma_last_updated_at"),
-                    department=F('user_organization_link_user__department__title'),
-                    graduation_year=F("user_organization_link_user__graduation_year"),
-                    is_alumni=F('user_organization_link_user__is_alumni'),
-                ))
+        user_org_links = get_campus_student_details(user_org_link.org, is_alumni)
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
             user_org_links,
@@ -302,10 +165,10 @@ class CampusStudentDetailsCSVAPI(APIView):
             },
         )
 
-        serializer = serializers.CampusStudentDetailsSerializer(
-            user_org_links, many=True, context={"ranks": ranks}
+        student_rows = CommonUtils.iter_serialized(
+            user_org_links, serializers.CampusStudentDetailsSerializer
         )
-        return CommonUtils.generate_csv(serializer.data, "Campus Student Details")
+        return CommonUtils.generate_csv(student_rows, "Campus Student Details")
 
 
 class WeeklyKarmaAPI(APIView):
@@ -1,5 +1,9 @@
+from django.db.models import F, OuterRef, Subquery
+
 from db.organization import UserOrganizationLink, Organization
+from db.user import User
 from utils.types import OrganizationType
+from utils.utils import CommonUtils
 
 
 def get_user_college_link(user_id):
@@ -7,3 +11,39 @@ def get_user_college_link(user_id):
         user_id=user_id,
         org__org_type=OrganizationType.COLLEGE.value
     ).first()
+
+
+def get_campus_student_details(org, is_alumni=None, request=None):
+    """
+    Returns the students of a college, ranked by karma, one row per student.
+    Pass the request the list is paginated with, so a search keeps the
+    ranks of the whole college.
+    """
+    college_links = UserOrganizationLink.objects.filter(
+        org=org, org__org_type=OrganizationType.COLLEGE.value
+    )
+    if is_alumni:
+        college_links = college_links.filter(is_alumni=is_alumni)
+    students = User.objects.filter(pk__in=college_links.values("user_id"))
+    student_link = college_links.filter(user_id=OuterRef("pk"))
+
+    return students.annotate(
+        user_id=F("id"),
+        email_=F("email"),
+        mobile_=F("mobile"),
+        karma=F("wallet_user__karma"),
+        level=F("user_lvl_link_user__level__name"),
+        rank=CommonUtils.get_rank(
+            students,
+            [
+                F("wallet_user__karma").desc(),
+                F("wallet_user__created_at").desc(),
+            ],
+            request,
+        ),
+        join_date=F("created_at"),
+        last_karma_gained=F("wallet_user__karma_last_updated_at"),
+        department=Subquery(student_link.values("department__title")[:1]),
+        graduation_year=Subquery(student_link.values("graduation_year")[:1]),
+        is_alumni=Subquery(student_link.values("is_alumni")[:1]),
+    )
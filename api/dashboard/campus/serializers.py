@@ -7,7 +7,8 @@ from rest_framework import serializers
 from db.organization import UserOrganizationLink, College
 from db.task import KarmaActivityLog
 from db.user import User, UserRoleLink
-from utils.types import OrganizationType
+from utils.leaderboard import KarmaAggregateTree
+from utils.types import KarmaAggregateLevel, OrganizationType
 from utils.types import RoleType
 from utils.utils import DateTimeUtils
 
@@ -65,49 +66,27 @@ class CampusDetailsSerializer(serializers.ModelSerializer):
 
         return None
 
+    def _get_aggregate(self, obj):
+        if not hasattr(self, "aggregate"):
+            self.aggregate = KarmaAggregateTree.get_aggregate(
+                KarmaAggregateLevel.ORG.value, obj.org_id
+            )
+        return self.aggregate
+
     def get_total_members(self, obj):
-        return obj.org.user_organization_link_org.count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.member_count if aggregate else 0
 
     def get_active_members(self, obj):
-
-        last_month = DateTimeUtils.get_current_utc_time() - timedelta(weeks=26)  # 6months
-        return obj.org.user_organization_link_org.filter(
-            verified=True,
-            user__wallet_user__isnull=False,
-            user__wallet_user__karma_last_updated_at__gte=last_month,
-        ).count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.active_members if aggregate else 0
 
     def get_total_karma(self, obj):
-        return (
-            obj.org.user_organization_link_org.filter(
-                org__org_type=OrganizationType.COLLEGE.value,
-                verified=True,
-                user__wallet_user__isnull=False,
-            ).aggregate(total_karma=Sum("user__wallet_user__karma"))["total_karma"]
-            or 0
-        )
+        aggregate = self._get_aggregate(obj)
+        return aggregate.total_karma if aggregate else 0
 
     def get_rank(self, obj):
-        org_karma_dict = (
-            UserOrganizationLink.objects.filter(
-                org__org_type=OrganizationType.COLLEGE.value)
-            .values("org")
-            .annotate(total_karma=Sum("user__wallet_user__karma"))
-        ).order_by("-total_karma", "org__created_at")
-
-        rank_dict = {
-            data["org"]: data["total_karma"] if data["total_karma"] is not None else 0
-            for data in org_karma_dict
-        }
-
-        sorted_rank_dict = dict(
-            sorted(rank_dict.items(), key=lambda x: x[1], reverse=True)
-        )
-
-        if obj.org.id in sorted_rank_dict:
-            keys_list = list(sorted_rank_dict.keys())
-            position = keys_list.index(obj.org.id)
-            return position + 1
+        return KarmaAggregateTree.get_rank(self._get_aggregate(obj))
 
 
 class CampusStudentDetailsSerializer(serializers.Serializer):
@@ -115,7 +94,7 @@ class CampusStudentDetailsSerializer(serializers.Serializer):
     full_name = serializers.SerializerMethodField()
     muid = serializers.CharField()
     karma = serializers.IntegerField()
-    rank = serializers.SerializerMethodField()
+    rank = serializers.IntegerField()
     level = serializers.CharField()
     # is_active = serializers.CharField()
     join_date = serializers.CharField()
@@ -130,10 +109,6 @@ class CampusStudentDetailsSerializer(serializers.Serializer):
         fields = ("user_id", "email", "mobile", "full_name", "karma", "muid", "rank", "level", "join_date", "is_alumni",
                   "last_karma_update_at")
 
-    def get_rank(self, obj):
-        ranks = self.context.get("ranks")
-        return ranks.get(obj.id, None)
-
     def get_full_name(self, obj):
         return obj.full_name
 
@@ -208,4 +183,4 @@ class UserRoleLinkSerializer(serializers.ModelSerializer):
         validated_data["verified"] = True
 
         user_role_link = UserRoleLink.objects.create(**validated_data)
-        return user_role_link
\ No newline at end of file
+        return user_role_link
\ No newline at end of file
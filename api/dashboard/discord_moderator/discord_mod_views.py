@@ -1,6 +1,6 @@
-from collections import defaultdict
+import datetime
 
-from django.db.models import Q
+from django.db.models import Count, F, Q
 from rest_framework.views import APIView
 
 from db.task import KarmaActivityLog
@@ -60,30 +60,57 @@ class LeaderBoard(APIView):
 
     def get(self, request):
         choice = request.query_params.get("option", "peer")
+        if choice not in ("peer", "appraiser"):
+            return CustomResponse(
+                general_message="option must be peer or appraiser"
+            ).get_failure_response()
+
+        try:
+            start_date, end_date = (
+                datetime.date.fromisoformat(date) if date else None
+                for date in (
+                    request.query_params.get("start_date"),
+                    request.query_params.get("end_date"),
+                )
+            )
+        except ValueError:
+            return CustomResponse(
+                general_message="Dates must be in YYYY-MM-DD format"
+            ).get_failure_response()
 
         approval_field = f"{choice}_approved_by"
         logs_with_approval = KarmaActivityLog.objects.filter(
             Q(**{f"{approval_field}__isnull": False}
               ) & ~Q(**{approval_field: ''})
         )
+        if start_date:
+            logs_with_approval = logs_with_approval.filter(
+                created_at__gte=datetime.datetime.combine(
+                    start_date, datetime.time.min, tzinfo=datetime.timezone.utc
+                )
+            )
+        if end_date:
+            logs_with_approval = logs_with_approval.filter(
+                created_at__lt=datetime.datetime.combine(
+                    end_date + datetime.timedelta(days=1),
+                    datetime.time.min,
+                    tzinfo=datetime.timezone.utc,
+                )
+            )
 
-        data = defaultdict(lambda: {"count": 0, "muid": None})
-
-        for obj in logs_with_approval:
-            approver_name = getattr(obj, approval_field).full_name
-            if data[approver_name]["muid"] is None:
-                data[approver_name]["muid"] = getattr(obj, approval_field).muid
-            data[approver_name]["count"] += 1
-
-        response_data = [
-            {"name": name, "count": info["count"], "muid": info["muid"]}
-            for name, info in data.items()
-        ]
+        approvers = logs_with_approval.values(
+            approver_id=F(approval_field),
+            name=F(f"{approval_field}__full_name"),
+            muid=F(f"{approval_field}__muid"),
+        ).annotate(
+            count=Count("id")
+        ).order_by("-count", "name")
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
-            response_data,
+            approvers,
             request,
-            []
+            ["name", "muid"],
+            {"name": "name", "count": "count"},
         )
         serializer = LeaderboardSerializer(
             paginated_queryset.get("queryset"),
@@ -95,4 +122,3 @@ class LeaderBoard(APIView):
                 "pagination"
             )
         )
-
@@ -1,17 +1,16 @@
-from itertools import islice
-
-from django.db.models import Sum, F, Case, CharField, When
+from django.db.models import F, Case, CharField, When
 from rest_framework.views import APIView
 
 from db.organization import UserOrganizationLink, Organization
-from db.task import Level, Wallet
+from db.task import Level
 from db.user import User
+from utils.leaderboard import KarmaAggregateTree
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
-from utils.types import RoleType, OrganizationType
+from utils.types import KarmaAggregateLevel, RoleType, OrganizationType
 from utils.utils import CommonUtils
 from . import dash_district_serializer
-from .dash_district_helper import get_user_college_link
+from .dash_district_helper import get_district_student_details, get_user_college_link
 
 
 class DistrictDetailAPI(APIView):
@@ -39,31 +38,20 @@ class DistrictTopThreeCampusAPI(APIView):
 
         user_org_link = get_user_college_link(user_id)
 
-        org_karma_dict = (
-            UserOrganizationLink.objects.filter(
-                org__org_type=OrganizationType.COLLEGE.value,
-                org__district=user_org_link.org.district,
-                verified=True,
+        top_three_orgs = {
+            aggregate.entity_id: aggregate.total_karma
+            for aggregate in KarmaAggregateTree.get_top(
+                KarmaAggregateLevel.ORG.value, user_org_link.org.district_id, 3
             )
-            .values("org")
-            .annotate(total_karma=Sum("user__wallet_user__karma")).order_by('-total_karma', 'org__created_at')
-        )
-
-        org_ranks = {
-            data["org"]: data["total_karma"] if data["total_karma"] is not None else 0
-            for data in org_karma_dict
         }
 
-        sorted_org_ranks = dict(
-            sorted(org_ranks.items(), key=lambda x: x[1], reverse=True)
+        user_org = Organization.objects.filter(id__in=top_three_orgs)
+        user_org = sorted(
+            user_org, key=lambda org: list(top_three_orgs).index(org.id)
         )
 
-        top_three_orgs = dict(islice(sorted_org_ranks.items(), 3))
-
-        user_org = Organization.objects.filter(id__in=top_three_orgs).distinct()
-
         serializer = dash_district_serializer.DistrictTopThreeCampusSerializer(
-            user_org, many=True, context={"ranks": org_ranks}
+            user_org, many=True, context={"ranks": top_three_orgs}
         )
 
         return CustomResponse(response=serializer.data).get_success_response()
@@ -97,32 +85,8 @@ class DistrictStudentDetailsAPI(APIView):
 
         user_org_link = get_user_college_link(user_id)
 
-        rank = (
-            Wallet.objects.filter(
-                user__user_organization_link_user__org__district=user_org_link.org.district,
-                user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .order_by("-karma", '-update_at', "created_at")
-            .values(
-                "user_id",
-                "karma",
-            )
-        )
-
-        ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-        user_org_links = (
-            User.objects.filter(
-                user_organization_link_user__org__district=user_org_link.org.district,
-                user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .annotate(
-                user_id=F("id"),
-                karma=F("wallet_user__karma"),
-                level=F("user_lvl_link_user__level__name"),
-            )
+        user_org_links = get_district_student_details(
+            user_org_link, request
         )
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
@@ -138,7 +102,7 @@ class DistrictStudentDetailsAPI(APIView):
         )
 
         serializer = dash_district_serializer.DistrictStudentDetailsSerializer(
-            paginated_queryset.get("queryset"), many=True, context={"ranks": ranks}
+            paginated_queryset.get("queryset"), many=True
         )
 
         return CustomResponse(
@@ -158,38 +122,12 @@ class DistrictStudentDetailsCSVAPI(APIView):
 
         user_org_link = get_user_college_link(user_id)
 
-        rank = (
-            Wallet.objects.filter(
-                user__user_organization_link_user__org__district=user_org_link.org.district,
-                user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .order_by("-karma", '-updated_at', "created_at")
-            .values(
-                "user_id",
-                "karma",
-            )
-        )
-
-        ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
+        user_org_links = get_district_student_details(user_org_link)
 
-        user_org_links = (
-            User.objects.filter(
-                user_organization_link_user__org__district=user_org_link.org.district,
-                user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .annotate(
-                user_id=F("id"),
-                karma=F("wallet_user__karma"),
-                level=F("user_lvl_link_user__level__name"),
-            )
-        )
-
-        serializer = dash_district_serializer.DistrictStudentDetailsSerializer(
-            user_org_links, many=True, context={"ranks": ranks}
+        student_rows = CommonUtils.iter_serialized(
+            user_org_links, dash_district_serializer.DistrictStudentDetailsSerializer
         )
-        return CommonUtils.generate_csv(serializer.data, "District Student Details")
+        return CommonUtils.generate_csv(student_rows, "District Student Details")
 
 
 class DistrictsCollageDetailsAPI(APIView):
@@ -295,7 +233,9 @@ class DistrictsCollageDetailsCSVAPI(APIView):
             )
         )
 
-        serializer = dash_district_serializer.DistrictCollegeDetailsSerializer(
-            organizations, many=True, context={"leads": leads}
+        college_rows = CommonUtils.iter_serialized(
+            organizations,
+            dash_district_serializer.DistrictCollegeDetailsSerializer,
+            context={"leads": leads},
         )
-        return CommonUtils.generate_csv(serializer.data, "District College Details")
+        return CommonUtils.generate_csv(college_rows, "District College Details")
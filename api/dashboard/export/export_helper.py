@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from api.common.common_views import (
+    LC_ENROLLMENT_SEARCH_FIELDS,
+    LC_ENROLLMENT_SORT_FIELDS,
+    get_lc_enrollment,
+)
+from api.common.serializer import LearningCircleEnrollmentSerializer
+from api.dashboard.district import dash_district_helper, dash_district_serializer
+from api.dashboard.user import dash_user_serializer
+from api.dashboard.zonal import dash_zonal_helper, dash_zonal_serializer
+from db.export import ExportJob
+from db.user import User
+from utils.types import JobStatus, RoleType
+from utils.utils import CommonUtils, DateTimeUtils
+
+# Query parameters an export keeps from the request that queued it
+EXPORT_PARAMS = ["search", "sortBy"]
+
+
+def get_users_export(user_id, params):
+    return (
+        User.objects.select_related(
+            "wallet_user", "user_lvl_link_user", "user_lvl_link_user__level"
+        ).all(),
+        dash_user_serializer.UserDashboardSerializer,
+    )
+
+
+def get_zonal_students_export(user_id, params):
+    if not (user_org_link := dash_zonal_helper.get_user_college_link(user_id)):
+        raise ValueError("User is not linked to a college")
+    return (
+        dash_zonal_helper.get_zonal_student_details(user_org_link),
+        dash_zonal_serializer.ZonalStudentDetailsSerializer,
+    )
+
+
+def get_district_students_export(user_id, params):
+    if not (user_org_link := dash_district_helper.get_user_college_link(user_id)):
+        raise ValueError("User is not linked to a college")
+    return (
+        dash_district_helper.get_district_student_details(user_org_link),
+        dash_district_serializer.DistrictStudentDetailsSerializer,
+    )
+
+
+def get_lc_enrollment_export(user_id, params):
+    return (
+        CommonUtils.get_paginated_queryset(
+            get_lc_enrollment(),
+            SimpleNamespace(query_params=params),
+            search_fields=LC_ENROLLMENT_SEARCH_FIELDS,
+            sort_fields=LC_ENROLLMENT_SORT_FIELDS,
+            is_pagination=False,
+        ),
+        LearningCircleEnrollmentSerializer,
+    )
+
+
+# name: download file name, roles: roles allowed to request it (None for
+# any user), is_user_scoped: whether the rows depend on who requested it
+EXPORTS = {
+    "users": {
+        "name": "User",
+        "roles": [RoleType.ADMIN.value],
+        "is_user_scoped": False,
+        "get_rows": get_users_export,
+    },
+    "zonal-students": {
+        "name": "Zonal Student Details",
+        "roles": [RoleType.ZONAL_CAMPUS_LEAD.value],
+        "is_user_scoped": True,
+        "get_rows": get_zonal_students_export,
+    },
+    "district-students": {
+        "name": "District Student Details",
+        "roles": [RoleType.DISTRICT_CAMPUS_LEAD.value],
+        "is_user_scoped": True,
+        "get_rows": get_district_students_export,
+    },
+    "lc-enrollment": {
+        "name": "Learning Enrollment Report",
+        "roles": None,
+        "is_user_scoped": False,
+        "get_rows": get_lc_enrollment_export,
+    },
+}
+
+
+class ExportJobs:
+    """
+    Runs large CSV exports in Celery instead of the web request.
+
+    A job row tracks status and progress while the task writes a gzip
+    compressed CSV under MEDIA_ROOT. Identical requests within
+    DEDUPE_WINDOW share one job. A running job touches `updated_at` as it
+    writes, so one that stops for STALE_AFTER is taken as lost with its
+    worker and queued again, up to MAX_ATTEMPTS runs.
+    """
+
+    DEDUPE_KEY = "export:dedupe:{dedupe_key}"
+    DEDUPE_WINDOW = 10 * 60
+    # Seconds a finished file stays downloadable
+    ARTIFACT_TTL = 24 * 60 * 60
+    EXPORT_DIR = "exports"
+    # Rows written between progress updates
+    PROGRESS_INTERVAL = 1000
+    # Seconds without a progress update after which a job counts as lost
+    STALE_AFTER = 30 * 60
+    MAX_ATTEMPTS = 3
+
+    @staticmethod
+    def has_access(export_type: str, user_id: str, roles: list[str], job: ExportJob = None) -> bool:
+        export = EXPORTS[export_type]
+        if export["roles"] and not set(export["roles"]) & set(roles):
+            return False
+        return job is None or not export["is_user_scoped"] or job.created_by_id == user_id
+
+    @staticmethod
+    def get_dedupe_key(export_type: str, user_id: str, params: dict) -> str:
+        scope = user_id if EXPORTS[export_type]["is_user_scoped"] else None
+        signature = json.dumps([export_type, scope, params], sort_keys=True)
+        return hashlib.sha256(signature.encode()).hexdigest()
+
+    @classmethod
+    def request(cls, export_type: str, user_id: str, params: dict) -> tuple[ExportJob, bool]:
+        """
+        Queues an export unless an identical one was queued within
+        DEDUPE_WINDOW and has not failed.
+
+        Returns:
+            tuple: The job, and whether it was created.
+        """
+        dedupe_key = cls.get_dedupe_key(export_type, user_id, params)
+        cache_key = cls.DEDUPE_KEY.format(dedupe_key=dedupe_key)
+        job_id = str(uuid.uuid4())
+
+        if not cache.add(cache_key, job_id, cls.DEDUPE_WINDOW):
+            if (
+                job := ExportJob.objects.filter(id=cache.get(cache_key))
+                .exclude(status=JobStatus.FAILED.value)
+                .first()
+            ):
+                return job, False
+            cache.set(cache_key, job_id, cls.DEDUPE_WINDOW)
+
+        job = ExportJob.objects.create(
+            id=job_id,
+            export_type=export_type,
+            params=params,
+            dedupe_key=dedupe_key,
+            status=JobStatus.PENDING.value,
+            created_by_id=user_id,
+        )
+
+        from mu_celery.task import run_export_job
+
+        transaction.on_commit(lambda: run_export_job.delay(job_id))
+        return job, True
+
+    @classmethod
+    def get_file_path(cls, job: ExportJob) -> str:
+        return os.path.join(settings.MEDIA_ROOT, job.file_path)
+
+    @classmethod
+    def run(cls, job_id: str) -> None:
+        # Claims the job in one statement, so a redelivered task finds it
+        # already running
+        if not ExportJob.objects.filter(
+            id=job_id, status=JobStatus.PENDING.value
+        ).update(
+            status=JobStatus.RUNNING.value,
+            attempts=F("attempts") + 1,
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        ):
+            return
+
+        jobs = ExportJob.objects.filter(id=job_id)
+        job = jobs.get()
+        file_path = os.path.join(cls.EXPORT_DIR, f"{job.id}.csv.gz")
+        absolute_path = os.path.join(settings.MEDIA_ROOT, file_path)
+        rows_written = 0
+
+        def track_progress(rows):
+            nonlocal rows_written
+            for row in rows:
+                yield row
+                rows_written += 1
+                if rows_written % cls.PROGRESS_INTERVAL == 0:
+                    jobs.update(
+                        rows_written=rows_written,
+                        updated_at=DateTimeUtils.get_current_utc_time(),
+                    )
+
+        try:
+            queryset, serializer_class = EXPORTS[job.export_type]["get_rows"](
+                job.created_by_id, job.params
+            )
+            jobs.update(
+                total_rows=queryset.count(),
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            )
+
+            os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+            with open(f"{absolute_path}.part", "wb") as export_file:
+                for chunk in CommonUtils.iter_gzip_csv(
+                    track_progress(CommonUtils.iter_serialized(queryset, serializer_class))
+                ):
+                    export_file.write(chunk)
+            os.replace(f"{absolute_path}.part", absolute_path)
+        except Exception as e:
+            jobs.update(
+                status=JobStatus.FAILED.value,
+                error=str(e),
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            )
+            if os.path.exists(f"{absolute_path}.part"):
+                os.remove(f"{absolute_path}.part")
+            return
+
+        jobs.update(
+            status=JobStatus.COMPLETED.value,
+            rows_written=rows_written,
+            file_path=file_path,
+            updated_at=DateTimeUtils.get_current_utc_time(),
+            completed_at=DateTimeUtils.get_current_utc_time(),
+        )
+
+    @classmethod
+    def requeue_stale(cls) -> int:
+        """
+        Enqueues again the jobs left pending or running without an update
+        for STALE_AFTER, and fails those already run MAX_ATTEMPTS times.
+
+        Returns:
+            int: The number of jobs requeued.
+        """
+        from mu_celery.task import run_export_job
+
+        stale_jobs = ExportJob.objects.filter(
+            status__in=[JobStatus.PENDING.value, JobStatus.RUNNING.value],
+            updated_at__lt=DateTimeUtils.get_current_utc_time()
+            - timedelta(seconds=cls.STALE_AFTER),
+        )
+        stale_jobs.filter(attempts__gte=cls.MAX_ATTEMPTS).update(
+            status=JobStatus.FAILED.value,
+            error="Export stopped responding",
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        )
+
+        requeued = 0
+        for job_id in stale_jobs.filter(attempts__lt=cls.MAX_ATTEMPTS).values_list(
+            "id", flat=True
+        ):
+            # Resetting a running job lets the task claim it again. The filter
+            # skips a job that made progress since it was listed
+            if stale_jobs.filter(id=job_id).update(
+                status=JobStatus.PENDING.value,
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            ):
+                run_export_job.delay(job_id)
+                requeued += 1
+        return requeued
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        """
+        Deletes jobs older than ARTIFACT_TTL and their files.
+
+        Returns:
+            int: The number of jobs deleted.
+        """
+        expired_jobs = ExportJob.objects.filter(
+            created_at__lt=DateTimeUtils.get_current_utc_time()
+            - timedelta(seconds=cls.ARTIFACT_TTL)
+        )
+        for file_path in expired_jobs.exclude(file_path=None).values_list(
+            "file_path", flat=True
+        ):
+            absolute_path = os.path.join(settings.MEDIA_ROOT, file_path)
+            if os.path.exists(absolute_path):
+                os.remove(absolute_path)
+        deleted, _ = expired_jobs.delete()
+        return deleted
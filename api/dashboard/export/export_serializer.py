@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from db.export import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "export_type",
+            "params",
+            "status",
+            "rows_written",
+            "total_rows",
+            "error",
+            "created_at",
+            "completed_at",
+        ]
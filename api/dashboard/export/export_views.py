@@ -0,0 +1,100 @@
+import os
+
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+
+from db.export import ExportJob
+from utils.permission import CustomizePermission, JWTUtils
+from utils.response import CustomResponse
+from utils.types import JobStatus
+from utils.utils import CommonUtils
+from .export_helper import EXPORT_PARAMS, EXPORTS, ExportJobs
+from .export_serializer import ExportJobSerializer
+
+# Bytes read per chunk when streaming a finished export
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class ExportCreateAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def post(self, request, export_type):
+        if export_type not in EXPORTS:
+            return CustomResponse(
+                general_message="Invalid export type"
+            ).get_failure_response()
+
+        user_id = JWTUtils.fetch_user_id(request)
+        if not ExportJobs.has_access(export_type, user_id, JWTUtils.fetch_role(request)):
+            return CustomResponse(
+                general_message="You do not have the required role to access this page."
+            ).get_failure_response()
+
+        params = {
+            key: request.query_params[key]
+            for key in EXPORT_PARAMS
+            if key in request.query_params
+        }
+        job, created = ExportJobs.request(export_type, user_id, params)
+
+        return CustomResponse(
+            general_message="Export queued" if created else "Export already requested",
+            response=ExportJobSerializer(job).data,
+        ).get_success_response()
+
+
+class ExportJobAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = ExportJob.objects.filter(id=job_id).first()
+        if job is None or not ExportJobs.has_access(
+            job.export_type,
+            JWTUtils.fetch_user_id(request),
+            JWTUtils.fetch_role(request),
+            job,
+        ):
+            return CustomResponse(
+                general_message="Export not found"
+            ).get_failure_response()
+
+        return CustomResponse(
+            response=ExportJobSerializer(job).data
+        ).get_success_response()
+
+
+class ExportDownloadAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, job_id):
+        job = ExportJob.objects.filter(id=job_id).first()
+        if job is None or not ExportJobs.has_access(
+            job.export_type,
+            JWTUtils.fetch_user_id(request),
+            JWTUtils.fetch_role(request),
+            job,
+        ):
+            return CustomResponse(
+                general_message="Export not found"
+            ).get_failure_response()
+
+        if job.status != JobStatus.COMPLETED.value or not os.path.exists(
+            file_path := ExportJobs.get_file_path(job)
+        ):
+            return CustomResponse(
+                general_message="Export is not ready for download"
+            ).get_failure_response()
+
+        def read_chunks():
+            with open(file_path, "rb") as export_file:
+                while chunk := export_file.read(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+
+        response = StreamingHttpResponse(
+            CommonUtils.iter_async(read_chunks()), content_type="text/csv"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{EXPORTS[job.export_type]["name"]}.csv"'
+        )
+        response["Content-Encoding"] = "gzip"
+        return response
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import export_views
+
+urlpatterns = [
+    path("jobs/<str:job_id>/", export_views.ExportJobAPI.as_view(), name="export-job"),
+    path(
+        "jobs/<str:job_id>/download/",
+        export_views.ExportDownloadAPI.as_view(),
+        name="export-download",
+    ),
+    path("<str:export_type>/", export_views.ExportCreateAPI.as_view(), name="create-export"),
+]
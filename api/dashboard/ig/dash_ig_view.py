@@ -237,9 +237,9 @@ class InterestGroupCSV(APIView):
             .all()
         )
 
-        ig_serializer_data = InterestGroupSerializer(ig_serializer, many=True).data
+        ig_rows = CommonUtils.iter_serialized(ig_serializer, InterestGroupSerializer)
 
-        return CommonUtils.generate_csv(ig_serializer_data, "Interest Group")
+        return CommonUtils.generate_csv(ig_rows, "Interest Group")
 
 
 class InterestGroupGetAPI(APIView):
@@ -0,0 +1,260 @@
+import uuid
+from datetime import timedelta
+from email.mime.image import MIMEImage
+
+import decouple
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+
+from db.task import TaskList, VoucherLog
+from db.user import User
+from utils.bulk_import import BulkImporter
+from utils.karma_voucher import allocate_voucher_codes, render_karma_voucher
+from utils.types import VoucherMailStatus
+from utils.utils import DateTimeUtils
+from .karma_voucher_serializer import VoucherLogCSVSerializer
+
+
+def get_voucher_card(voucher: dict) -> dict:
+    """
+    Returns the text drawn on the image of a voucher, as represented by
+    VoucherLogCSVSerializer.
+    """
+    time_or_event = f"{voucher['month']}/{voucher['week']}"
+    if voucher['event'] != '' and voucher['event'] is not None:
+        time_or_event = f"{voucher['event']}/{voucher['description']}"
+    return {
+        'name': str(voucher['full_name']),
+        'hashtag': voucher['hashtag'],
+        'karma': str(int(voucher['karma'])),
+        'code': voucher['code'],
+        'month': time_or_event,
+    }
+
+
+def get_voucher_mail(voucher: dict, karma_voucher_image) -> EmailMessage:
+    """
+    Builds the mail of a voucher, as represented by VoucherLogCSVSerializer,
+    with its rendered image attached.
+    """
+    full_name = voucher['full_name']
+    code = voucher['code']
+
+    from_mail = decouple.config("FROM_MAIL")
+    subject = "Congratulations on earning Karma points!"
+    text = f"""Greetings from GTech µLearn!
+
+    Great news! You are just one step away from claiming your internship/contribution Karma points.
+
+    Name: {full_name}
+    Email: {voucher['email']}
+
+    To claim your karma points copy this `voucher {code}` and paste it #task-dropbox channel along with your voucher image.
+    """
+
+    karma_voucher_image.seek(0)
+    email_obj = EmailMessage(
+        subject=subject,
+        body=text,
+        from_email=from_mail,
+        to=[voucher['email']],
+    )
+    attachment = MIMEImage(karma_voucher_image.read())
+    attachment.add_header(
+        'Content-Disposition',
+        'attachment',
+        filename=f'{str(full_name)}.jpg',
+    )
+    email_obj.attach(attachment)
+    return email_obj
+
+
+class VoucherMails:
+    """
+    Sends voucher mails from Celery in batches of BATCH_SIZE, each batch
+    over one SMTP connection, and records every voucher's delivery on its
+    row. Failed mails are retried with exponential backoff until
+    MAX_ATTEMPTS.
+
+    Rows are only marked queued or retrying once their task is enqueued,
+    and requeue_stale() periodically sends again the ones whose task was
+    lost or never enqueued, e.g. to a worker crash or a broker outage.
+    """
+
+    BATCH_SIZE = 50
+    MAX_ATTEMPTS = 5
+    # Seconds before the first retry, doubled for every later one
+    RETRY_DELAY = 60
+    # Seconds an unsent row may wait, well past the longest retry delay,
+    # before its task is assumed lost
+    STALE_AFTER = 60 * 60
+
+    @classmethod
+    def queue(cls, voucher_ids: list[str]) -> None:
+        from mu_celery.task import send_voucher_mails
+
+        voucher_ids = list(voucher_ids)
+        for start in range(0, len(voucher_ids), cls.BATCH_SIZE):
+            batch = voucher_ids[start:start + cls.BATCH_SIZE]
+            send_voucher_mails.delay(batch)
+            # Rows the worker already picked up keep the status it recorded
+            VoucherLog.objects.filter(id__in=batch, mail_status=None).update(
+                mail_status=VoucherMailStatus.QUEUED.value,
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            )
+
+    @classmethod
+    def requeue_stale(cls) -> int:
+        """
+        Enqueues again the rows left unqueued, queued or retrying for
+        STALE_AFTER, and fails those already tried MAX_ATTEMPTS times.
+
+        Returns:
+            int: The number of vouchers requeued.
+        """
+        from mu_celery.task import send_voucher_mails
+
+        stale_before = DateTimeUtils.get_current_utc_time() - timedelta(seconds=cls.STALE_AFTER)
+        stale_vouchers = VoucherLog.objects.filter(
+            Q(mail_status=None, created_at__lt=stale_before)
+            | Q(
+                mail_status__in=[VoucherMailStatus.QUEUED.value, VoucherMailStatus.RETRYING.value],
+                updated_at__lt=stale_before,
+            )
+        )
+        stale_vouchers.filter(mail_attempts__gte=cls.MAX_ATTEMPTS).update(
+            mail_status=VoucherMailStatus.FAILED.value,
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        )
+
+        stale_vouchers = stale_vouchers.filter(mail_attempts__lt=cls.MAX_ATTEMPTS)
+        ids_by_attempt = {}
+        for voucher_id, attempts in stale_vouchers.values_list('id', 'mail_attempts'):
+            ids_by_attempt.setdefault(attempts + 1, []).append(voucher_id)
+
+        for attempt, voucher_ids in ids_by_attempt.items():
+            for start in range(0, len(voucher_ids), cls.BATCH_SIZE):
+                batch = voucher_ids[start:start + cls.BATCH_SIZE]
+                send_voucher_mails.delay(batch, attempt)
+                stale_vouchers.filter(id__in=batch).update(
+                    mail_status=Coalesce('mail_status', Value(VoucherMailStatus.QUEUED.value)),
+                    updated_at=DateTimeUtils.get_current_utc_time(),
+                )
+        return sum(len(voucher_ids) for voucher_ids in ids_by_attempt.values())
+
+    @classmethod
+    def send(cls, voucher_ids: list[str], attempt: int = 1) -> None:
+        vouchers = VoucherLogCSVSerializer(
+            VoucherLog.objects.filter(id__in=voucher_ids)
+            .exclude(mail_status=VoucherMailStatus.SENT.value)
+            .select_related('user', 'task'),
+            many=True,
+        ).data
+        if not vouchers:
+            return
+
+        sent_ids = []
+        errors = {}
+        try:
+            with get_connection(fail_silently=False) as connection:
+                for voucher in vouchers:
+                    try:
+                        image = render_karma_voucher(get_voucher_card(voucher))
+                        connection.send_messages([get_voucher_mail(voucher, image)])
+                        sent_ids.append(voucher['id'])
+                    except Exception as e:
+                        # Also covers vouchers that fail to render, so every
+                        # attempt is counted towards MAX_ATTEMPTS
+                        errors[voucher['id']] = str(e) or type(e).__name__
+        except Exception as e:
+            # The connection failed to open or close; nothing else was tried
+            errors |= {
+                voucher['id']: str(e) or type(e).__name__
+                for voucher in vouchers
+                if voucher['id'] not in sent_ids and voucher['id'] not in errors
+            }
+
+        VoucherLog.objects.filter(id__in=sent_ids).update(
+            mail_status=VoucherMailStatus.SENT.value,
+            mail_attempts=F('mail_attempts') + 1,
+            mail_error=None,
+            mailed_at=DateTimeUtils.get_current_utc_time(),
+            updated_at=DateTimeUtils.get_current_utc_time(),
+        )
+        if not errors:
+            return
+
+        will_retry = attempt < cls.MAX_ATTEMPTS
+        if will_retry:
+            from mu_celery.task import send_voucher_mails
+
+            send_voucher_mails.apply_async(
+                (list(errors), attempt + 1), countdown=cls.RETRY_DELAY * 2 ** (attempt - 1)
+            )
+
+        ids_by_error = {}
+        for voucher_id, error in errors.items():
+            ids_by_error.setdefault(error, []).append(voucher_id)
+        for error, failed_ids in ids_by_error.items():
+            VoucherLog.objects.filter(id__in=failed_ids).update(
+                mail_status=(
+                    VoucherMailStatus.RETRYING.value if will_retry else VoucherMailStatus.FAILED.value
+                ),
+                mail_attempts=F('mail_attempts') + 1,
+                mail_error=error,
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            )
+
+
+class VoucherLogImporter(BulkImporter):
+    required_headers = ['muid', 'karma', 'hashtag', 'month', 'week', 'description', 'event']
+
+    @classmethod
+    def get_error_message(cls, errors) -> str:
+        # VoucherLogCSVSerializer.validate reports the row's code beside the error
+        if isinstance(errors, dict) and 'error' in errors:
+            return super().get_error_message(errors['error'])
+        return super().get_error_message(errors)
+
+    def process_chunk(self, rows):
+        users = User.objects.filter(muid__in={row.get('muid') for row in rows}).values('id', 'muid')
+        tasks = TaskList.objects.filter(hashtag__in={row.get('hashtag') for row in rows}).values('id', 'hashtag')
+        user_dict = {user['muid']: user['id'] for user in users}
+        task_dict = {task['hashtag']: task['id'] for task in tasks}
+
+        errors = {}
+        valid_rows = {}
+        for index, row in enumerate(rows):
+            muid = row.get('muid')
+            task_hashtag = row.get('hashtag')
+            user_id = user_dict.get(muid)
+            task_id = task_dict.get(task_hashtag)
+            if user_id is None:
+                errors[index] = f"Invalid muid: {muid}"
+            elif task_id is None:
+                errors[index] = f"Invalid task hashtag: {task_hashtag}"
+            elif row.get('karma') == 0:
+                errors[index] = "Karma cannot be 0"
+            elif row.get('month') is None:
+                errors[index] = "Month cannot be empty"
+            else:
+                row['user_id'] = user_id
+                row['task_id'] = task_id
+                row['id'] = str(uuid.uuid4())
+                row['claimed'] = False
+                row['created_by_id'] = self.user_id
+                row['updated_by_id'] = self.user_id
+                row['created_at'] = DateTimeUtils.get_current_utc_time()
+                row['updated_at'] = DateTimeUtils.get_current_utc_time()
+                valid_rows[index] = row
+
+        for row, code in zip(valid_rows.values(), allocate_voucher_codes(len(valid_rows))):
+            row['code'] = code
+
+        serializer_errors, _ = self.save_rows(VoucherLogCSVSerializer, valid_rows)
+        voucher_ids = [row['id'] for index, row in valid_rows.items() if index not in serializer_errors]
+
+        transaction.on_commit(lambda: VoucherMails.queue(voucher_ids), robust=True)
+        return errors | serializer_errors
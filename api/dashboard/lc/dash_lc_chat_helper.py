@@ -0,0 +1,324 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+
+from db.learning_circle import CircleChatMessage, UserCircleLink
+
+
+class LcChatStore:
+    """
+    Learning circle chat persistence.
+
+    Every message is pushed onto a capped Redis list of the room's latest
+    messages, replayed to clients on connect, and onto a shared pending
+    list that a debounced task drains into `circle_chat_message` in
+    batches of BATCH_SIZE. A batch is moved to a processing list and only
+    removed once its insert commits, so a failed flush writes it again.
+    """
+
+    PENDING_KEY = "lc:chat:pending"
+    PROCESSING_KEY = "lc:chat:processing"
+    QUEUED_KEY = "lc:chat:flush_queued"
+    LOCK_KEY = "lc:chat:flush_lock"
+    # Seconds a flush may hold the processing list
+    LOCK_TIMEOUT = 5 * 60
+    # Seconds to collect messages before writing them
+    FLUSH_DELAY = 5
+    BATCH_SIZE = 500
+    REPLAY_COUNT = 50
+    # Characters a message may hold; longer frames are dropped
+    MAX_MESSAGE_LENGTH = 2000
+
+    @staticmethod
+    def get_connection():
+        return get_redis_connection("redis")
+
+    @staticmethod
+    def get_recent_key(circle_id: str, room_name: str) -> str:
+        return f"lc:chat:recent:{circle_id}:{room_name}"
+
+    @classmethod
+    def add_message(cls, circle_id: str, room_name: str, user_id: str, message: str) -> dict:
+        """
+        Stores a message for replay and persistence and returns it as sent
+        to the room.
+        """
+        chat_message = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "message": message,
+            # Keeps the microseconds of DATETIME(6) to order messages sent
+            # within a second
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        recent_key = cls.get_recent_key(circle_id, room_name)
+
+        pipeline = cls.get_connection().pipeline()
+        pipeline.lpush(recent_key, json.dumps(chat_message))
+        pipeline.ltrim(recent_key, 0, cls.REPLAY_COUNT - 1)
+        pipeline.rpush(
+            cls.PENDING_KEY,
+            json.dumps(chat_message | {"circle_id": circle_id, "room_name": room_name}),
+        )
+        pending_count = pipeline.execute()[-1]
+
+        cls.schedule_flush(pending_count)
+        return chat_message
+
+    @classmethod
+    def get_message(cls, text_data) -> str | None:
+        """
+        Returns the message of a frame sent by a client, or None when the
+        frame is not a JSON object holding a non-empty `message` string of
+        at most MAX_MESSAGE_LENGTH characters.
+        """
+        try:
+            message = json.loads(text_data).get("message")
+        except (TypeError, ValueError, AttributeError):
+            return None
+        if not isinstance(message, str) or not message.strip():
+            return None
+        if len(message) > cls.MAX_MESSAGE_LENGTH:
+            return None
+        return message
+
+    @classmethod
+    def schedule_flush(cls, pending_count: int) -> None:
+        from mu_celery.task import flush_lc_chat_messages
+
+        if pending_count >= cls.BATCH_SIZE:
+            flush_lc_chat_messages.delay()
+        elif cache.add(cls.QUEUED_KEY, True, timeout=cls.FLUSH_DELAY * 2):
+            flush_lc_chat_messages.apply_async(countdown=cls.FLUSH_DELAY)
+
+    @classmethod
+    def get_recent(cls, circle_id: str, room_name: str) -> list[dict]:
+        """
+        Returns the room's latest messages, oldest first.
+        """
+        messages = cls.get_connection().lrange(
+            cls.get_recent_key(circle_id, room_name), 0, -1
+        )
+        return [json.loads(message) for message in reversed(messages)]
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Writes the pending messages in batches.
+
+        Returns:
+            int: The number of messages written.
+        """
+        from mu_celery.task import flush_lc_chat_messages
+
+        cache.delete(cls.QUEUED_KEY)
+        if not cache.add(cls.LOCK_KEY, True, timeout=cls.LOCK_TIMEOUT):
+            # Another flush owns the processing list; check again after it
+            flush_lc_chat_messages.apply_async(countdown=cls.FLUSH_DELAY)
+            return 0
+
+        try:
+            return cls._flush_batches()
+        finally:
+            cache.delete(cls.LOCK_KEY)
+
+    @classmethod
+    def _flush_batches(cls) -> int:
+        connection = cls.get_connection()
+        written = 0
+        while True:
+            # A batch left over by a flush that died is written first
+            batch = connection.lrange(cls.PROCESSING_KEY, 0, -1)
+            if not batch:
+                pipeline = connection.pipeline()
+                for _ in range(cls.BATCH_SIZE):
+                    pipeline.lmove(cls.PENDING_KEY, cls.PROCESSING_KEY, "LEFT", "RIGHT")
+                batch = [message for message in pipeline.execute() if message is not None]
+                if not batch:
+                    return written
+
+            messages = [json.loads(message) for message in batch]
+            try:
+                with transaction.atomic():
+                    CircleChatMessage.objects.bulk_create(
+                        [
+                            CircleChatMessage(
+                                id=message["id"],
+                                circle_id=message["circle_id"],
+                                room_name=message["room_name"],
+                                user_id=message["user_id"],
+                                message=message["message"],
+                                created_at=datetime.fromisoformat(message["created_at"]),
+                            )
+                            for message in messages
+                        ],
+                        # Skips messages whose circle or sender was deleted
+                        # meanwhile, and those a flush that died already wrote
+                        ignore_conflicts=True,
+                    )
+            except Exception:
+                # Puts the batch back at the head of the pending list
+                pipeline = connection.pipeline()
+                pipeline.lpush(cls.PENDING_KEY, *reversed(batch))
+                pipeline.delete(cls.PROCESSING_KEY)
+                pipeline.execute()
+                raise
+
+            connection.delete(cls.PROCESSING_KEY)
+            written += len(messages)
+
+    @staticmethod
+    def encode_cursor(message: dict) -> str:
+        cursor = f"{message['created_at'].isoformat()}|{message['id']}"
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, str]:
+        """
+        Raises:
+            ValueError: If the cursor was not issued by encode_cursor.
+        """
+        try:
+            created_at, message_id = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+            )
+            return datetime.fromisoformat(created_at), message_id
+        except (TypeError, UnicodeDecodeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    @classmethod
+    def get_history(
+        cls, circle_id: str, room_name: str, cursor: str = None, count: int = 50
+    ) -> tuple[list[dict], str | None]:
+        """
+        Returns up to `count` stored messages older than `cursor`, newest
+        first, and the cursor of the next page.
+        """
+        messages = CircleChatMessage.objects.filter(
+            circle_id=circle_id, room_name=room_name
+        ).order_by("-created_at", "-id")
+        if cursor:
+            created_at, message_id = cls.decode_cursor(cursor)
+            messages = messages.filter(
+                Q(created_at__lt=created_at)
+                | Q(created_at=created_at, id__lt=message_id)
+            )
+
+        page = list(messages.values("id", "user_id", "message", "created_at")[: count + 1])
+        next_cursor = cls.encode_cursor(page[count - 1]) if len(page) > count else None
+        return page[:count], next_cursor
+
+
+class LcChatMembership:
+    """
+    Caches the accepted members of each circle as a Redis set so chat
+    handshakes are answered without a database query. The set is dropped
+    whenever a membership of the circle is created, accepted or removed
+    and reloaded by the next lookup.
+    """
+
+    # Keeps a circle without accepted members from looking uncached
+    PLACEHOLDER = "-"
+    CACHE_TTL = 60 * 60
+
+    @staticmethod
+    def get_key(circle_id: str) -> str:
+        return f"lc:chat:members:{circle_id}"
+
+    @classmethod
+    def is_member(cls, circle_id: str, user_id: str) -> bool:
+        connection = LcChatStore.get_connection()
+        key = cls.get_key(circle_id)
+
+        pipeline = connection.pipeline()
+        pipeline.exists(key)
+        pipeline.sismember(key, user_id)
+        cached, is_member = pipeline.execute()
+        if cached:
+            return bool(is_member)
+
+        member_ids = list(
+            UserCircleLink.objects.filter(
+                circle_id=circle_id, accepted=True
+            ).values_list("user_id", flat=True)
+        )
+        pipeline = connection.pipeline()
+        pipeline.sadd(key, cls.PLACEHOLDER, *member_ids)
+        pipeline.expire(key, cls.CACHE_TTL)
+        pipeline.execute()
+        return user_id in member_ids
+
+    @classmethod
+    def invalidate(cls, circle_id: str) -> None:
+        LcChatStore.get_connection().delete(cls.get_key(circle_id))
+
+
+class LcChatPresence:
+    """
+    Tracks who is online in each chat room as a Redis hash of user id to
+    open connection count, so a member with several tabs stays online
+    until the last one closes.
+    """
+
+    # Clears rooms left behind by workers that died without disconnecting
+    PRESENCE_TTL = 60 * 60 * 24
+    # Decrements and removes in one step so a concurrent join is not lost
+    LEAVE_SCRIPT = """
+    local connections = redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+    if connections <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return {connections <= 0 and 1 or 0, redis.call('HLEN', KEYS[1])}
+    """
+
+    @staticmethod
+    def get_key(circle_id: str, room_name: str) -> str:
+        return f"lc:chat:presence:{circle_id}:{room_name}"
+
+    @classmethod
+    def join(cls, circle_id: str, room_name: str, user_id: str) -> tuple[bool, int]:
+        """
+        Returns:
+            tuple: Whether the user just came online, and the online count.
+        """
+        key = cls.get_key(circle_id, room_name)
+        pipeline = LcChatStore.get_connection().pipeline()
+        pipeline.hincrby(key, user_id, 1)
+        pipeline.hlen(key)
+        pipeline.expire(key, cls.PRESENCE_TTL)
+        connections, online_count, _ = pipeline.execute()
+        return connections == 1, online_count
+
+    @classmethod
+    def leave(cls, circle_id: str, room_name: str, user_id: str) -> tuple[bool, int]:
+        """
+        Returns:
+            tuple: Whether the user just went offline, and the online count.
+        """
+        went_offline, online_count = LcChatStore.get_connection().eval(
+            cls.LEAVE_SCRIPT, 1, cls.get_key(circle_id, room_name), user_id
+        )
+        return bool(went_offline), online_count
+
+    @classmethod
+    def get_online(cls, circle_id: str, room_name: str) -> list[str]:
+        return [
+            user_id.decode()
+            for user_id in LcChatStore.get_connection().hkeys(
+                cls.get_key(circle_id, room_name)
+            )
+        ]
+
+
+@receiver(post_save, sender=UserCircleLink)
+@receiver(post_delete, sender=UserCircleLink)
+def circle_membership_changed(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: LcChatMembership.invalidate(instance.circle_id))
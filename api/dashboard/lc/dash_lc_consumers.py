@@ -1,23 +1,42 @@
 import json
-from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
-from db.learning_circle import UserCircleLink
+from channels.generic.websocket import AsyncWebsocketConsumer
+from utils.exception import UnauthorizedAccessException
+from utils.permission import JWTUtils
+from .dash_lc_chat_helper import LcChatMembership, LcChatPresence, LcChatStore
 
 
 class LcChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
+        self.user_id = None
         try:
             self.room_name = self.scope['url_route']['kwargs']['room_name']
-            self.room_group_name = f"chat_{self.room_name}"
             self.lc_id = self.scope['url_route']['kwargs']['lc_id']
-            self.user_id = self.scope['url_route']['kwargs']['user_id']
+            self.room_group_name = f"chat_{self.lc_id}_{self.room_name}"
 
-            user_circle_link = await self.get_user_circle_link()
+            try:
+                payload = JWTUtils.fetch_websocket_payload(self.scope)
+            except UnauthorizedAccessException:
+                await self.close()
+                return
+
+            # Legacy routes still carry the user id, which must match the token
+            url_user_id = self.scope['url_route']['kwargs'].get('user_id')
+            if url_user_id is not None and url_user_id != payload['id']:
+                await self.close()
+                return
 
-            if user_circle_link is None:
+            # Falls back to the ORM on a cache miss, so runs where channels
+            # closes stale database connections
+            is_member = await database_sync_to_async(LcChatMembership.is_member)(
+                self.lc_id, payload['id']
+            )
+            if not is_member:
                 await self.close()
                 return
 
+            self.user_id = payload['id']
             await self.channel_layer.group_add(
                 self.room_group_name,
                 self.channel_name
@@ -25,38 +44,85 @@ class LcChatConsumer(AsyncWebsocketConsumer):
 
             await self.accept()
 
+            came_online, online_count = await sync_to_async(LcChatPresence.join, thread_sensitive=False)(
+                self.lc_id, self.room_name, self.user_id
+            )
+            online_users = await sync_to_async(LcChatPresence.get_online, thread_sensitive=False)(
+                self.lc_id, self.room_name
+            )
+            await self.send(text_data=json.dumps({
+                'type': 'presence',
+                'online_users': online_users,
+                'online_count': online_count,
+            }))
+            if came_online:
+                await self.send_presence(True, online_count)
+
+            recent_messages = await sync_to_async(LcChatStore.get_recent, thread_sensitive=False)(
+                self.lc_id, self.room_name
+            )
+            for message in recent_messages:
+                await self.send(text_data=json.dumps(message))
+
         except Exception as e:
             print(f"Error during WebSocket connection: {str(e)}")
             await self.close()
 
-    @database_sync_to_async
-    def get_user_circle_link(self):
-        return UserCircleLink.objects.filter(
-            user_id=self.user_id,
-            circle_id=self.lc_id,
-            accepted=True,
-        ).first()
-
     async def disconnect(self, close_code):
+        if self.user_id is None:
+            return
+
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
 
+        went_offline, online_count = await sync_to_async(LcChatPresence.leave, thread_sensitive=False)(
+            self.lc_id, self.room_name, self.user_id
+        )
+        if went_offline:
+            await self.send_presence(False, online_count)
+
+    async def send_presence(self, online, online_count):
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'chat.presence',
+                'user_id': self.user_id,
+                'online': online,
+                'online_count': online_count,
+            }
+        )
+
     async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        message = text_data_json['message']
+        # Drops malformed, empty and oversized frames
+        if (message := LcChatStore.get_message(text_data)) is None:
+            return
+
+        chat_message = await sync_to_async(LcChatStore.add_message, thread_sensitive=False)(
+            self.lc_id, self.room_name, self.user_id, message
+        )
 
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 'type': 'chat.message',
-                'message': message
+                **chat_message
             }
         )
 
     async def chat_message(self, event):
-        message = event['message']
         await self.send(text_data=json.dumps({
-            'message': message
+            'id': event['id'],
+            'user_id': event['user_id'],
+            'message': event['message'],
+            'created_at': event['created_at'],
+        }))
+
+    async def chat_presence(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'presence',
+            'user_id': event['user_id'],
+            'online': event['online'],
+            'online_count': event['online_count'],
         }))
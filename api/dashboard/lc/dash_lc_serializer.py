@@ -18,6 +18,7 @@ from db.organization import UserOrganizationLink
 from db.task import KarmaActivityLog
 from db.task import TaskList, UserIgLink, Wallet
 from db.user import User
+from utils.leaderboard import LearningCircleKarma
 from utils.types import Lc
 from utils.types import OrganizationType
 from utils.utils import DateTimeUtils
@@ -99,12 +100,7 @@ class LearningCircleMainSerializer(serializers.ModelSerializer):
         return [{"username": f"{member.user.full_name}"} for member in user_circle_link]
 
     def get_karma(self, obj):
-
-        karma_activity_log = KarmaActivityLog.objects.filter(
-            user__user_circle_link_user__circle=obj,
-        ).aggregate(karma=Sum("karma"))["karma"]
-
-        return karma_activity_log if karma_activity_log else 0
+        return LearningCircleKarma.get_total_karma(obj)
 
 
 class LearningCircleCreateSerializer(serializers.ModelSerializer):
@@ -340,15 +336,7 @@ class LearningCircleDetailsSerializer(serializers.ModelSerializer):
         ).exists()
 
     def get_total_karma(self, obj):
-        return (
-            KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=obj,
-                user__user_circle_link_user__accepted=True,
-                task__ig=obj.ig,
-                appraiser_approved=True,
-            ).aggregate(total_karma=Sum("karma"))["total_karma"]
-            or 0
-        )
+        return LearningCircleKarma.get_total_karma(obj)
 
     def get_members(self, obj):
         return self._get_member_info(obj, accepted=1)
@@ -384,47 +372,7 @@ class LearningCircleDetailsSerializer(serializers.ModelSerializer):
         return member_info
 
     def get_rank(self, obj):
-        total_karma = (
-            KarmaActivityLog.objects.filter(
-                user__user_circle_link_user__circle=obj,
-                user__user_circle_link_user__accepted=True,
-                task__ig=obj.ig,
-                appraiser_approved=True,
-            ).aggregate(total_karma=Sum("karma"))["total_karma"]
-            or 0
-        )
-
-        circle_ranks = {obj.name: {"total_karma": total_karma}}
-
-        all_learning_circles = LearningCircle.objects.filter(ig=obj.ig).exclude(
-            id=obj.id
-        )
-
-        for lc in all_learning_circles:
-            total_karma_lc = (
-                KarmaActivityLog.objects.filter(
-                    user__user_circle_link_user__circle=lc,
-                    user__user_circle_link_user__accepted=True,
-                    task__ig=lc.ig,
-                    appraiser_approved=True,
-                ).aggregate(total_karma=Sum("karma"))["total_karma"]
-                or 0
-            )
-
-            circle_ranks[lc.name] = {"total_karma": total_karma_lc}
-
-        sorted_ranks = sorted(
-            circle_ranks.items(), key=lambda x: x[1]["total_karma"], reverse=True
-        )
-
-        return next(
-            (
-                i + 1
-                for i, (circle_name, data) in enumerate(sorted_ranks)
-                if circle_name == obj.name
-            ),
-            None,
-        )
+        return LearningCircleKarma.get_rank(obj)
 
     def get_previous_meetings(self, obj):
         return (
@@ -21,6 +21,7 @@ from utils.response import CustomResponse
 from utils.types import Lc, RoleType
 from utils.utils import DateTimeUtils, send_template_mail
 from utils.permission import CustomizePermission, JWTUtils, role_required
+from .dash_lc_chat_helper import LcChatMembership, LcChatStore
 from .dash_ig_helper import (
     get_today_start_end,
     get_week_start_end,
@@ -78,7 +79,7 @@ class UserLearningCircleListApi(APIView):
 
 class LearningCircleMainApi(APIView):
     def post(self, request):
-        all_circles = LearningCircle.objects.all()
+        all_circles = LearningCircle.objects.select_related("circle_karma_circle")
         if JWTUtils.is_logged_in(request):
             ig_id = request.data.get("ig_id")
             org_id = request.data.get("org_id")
@@ -1234,3 +1235,29 @@ class CircleMeetVerifyAPI(APIView):
         return CustomResponse(
             general_message="Meetup verified successfully."
         ).get_success_response()
+
+
+class LcChatHistoryAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    def get(self, request, circle_id, room_name):
+        user_id = JWTUtils.fetch_user_id(request)
+        if not LcChatMembership.is_member(circle_id, user_id):
+            return CustomResponse(
+                general_message="User is not a member of this circle"
+            ).get_failure_response()
+
+        try:
+            per_page = min(max(int(request.query_params.get("perPage", 50)), 1), 100)
+            messages, next_cursor = LcChatStore.get_history(
+                circle_id, room_name, request.query_params.get("cursor"), per_page
+            )
+        except ValueError:
+            return CustomResponse(
+                general_message="Invalid cursor or page size"
+            ).get_failure_response()
+
+        return CustomResponse().paginated_response(
+            data=messages,
+            pagination={"isNext": next_cursor is not None, "nextCursor": next_cursor},
+        )
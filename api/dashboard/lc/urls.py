@@ -19,6 +19,11 @@ urlpatterns = [
         dash_lc_view.CircleMeetAPI.as_view(),
         name="meet-list",
     ),
+    path(
+        "<str:circle_id>/chat/<str:room_name>/history/",
+        dash_lc_view.LcChatHistoryAPI.as_view(),
+        name="chat-history",
+    ),
     path(
         "meets/report/<str:meet_id>/",
         dash_lc_view.CircleMeetReportSubmitAPI.as_view(),
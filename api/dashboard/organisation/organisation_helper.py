@@ -0,0 +1,85 @@
+import uuid
+
+from django.db.models import Q
+
+from db.organization import District, OrgAffiliation, Organization
+from utils.bulk_import import BulkImporter
+from utils.types import OrganizationType
+from .serializers import OrganizationImportSerializer
+
+
+class OrganisationImporter(BulkImporter):
+    required_headers = ["title", "code", "org_type", "affiliation", "district"]
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.title_excel = set()
+        self.code_excel = set()
+
+    def process_chunk(self, rows):
+        titles = {row.get("title") for row in rows}
+        codes = {row.get("code") for row in rows}
+        existing = Organization.objects.filter(
+            Q(title__in=titles) | Q(code__in=codes)
+        ).values_list("title", "code")
+        title_db = {title for title, _ in existing}
+        code_db = {code for _, code in existing}
+
+        affiliations_dict = dict(
+            OrgAffiliation.objects.filter(
+                title__in={row.get("affiliation") for row in rows}
+            ).values_list("title", "id")
+        )
+        districts_dict = dict(
+            District.objects.filter(
+                name__in={row.get("district") for row in rows}
+            ).values_list("name", "id")
+        )
+        org_types = OrganizationType.get_all_values()
+
+        errors = {}
+        valid_rows = {}
+        for index, row in enumerate(rows):
+            title = row.get("title")
+            code = row.get("code")
+            affiliation = row.pop("affiliation")
+            district = row.pop("district")
+
+            affiliation_id = (
+                affiliations_dict.get(affiliation) if affiliation is not None else None
+            )
+            district_id = districts_dict.get(district)
+            org_type = row.get("org_type")
+
+            if not title:
+                errors[index] = "Missing title."
+            elif title in self.title_excel:
+                errors[index] = f"Duplicate title in excel: {title}"
+            elif title in title_db:
+                errors[index] = f"Duplicate title in database: {title}"
+            else:
+                self.title_excel.add(title)
+                if not code:
+                    errors[index] = "Missing code."
+                elif code in self.code_excel:
+                    errors[index] = f"Duplicate code in excel: {code}"
+                elif code in code_db:
+                    errors[index] = f"Duplicate code in database: {code}"
+                else:
+                    self.code_excel.add(code)
+                    if affiliation and not affiliation_id:
+                        errors[index] = f"Invalid affiliation: {affiliation}"
+                    elif not district_id:
+                        errors[index] = f"Invalid district: {district}"
+                    elif org_type not in org_types:
+                        errors[index] = f"Invalid org_type: {org_type}"
+                    else:
+                        row["id"] = str(uuid.uuid4())
+                        row["updated_by_id"] = self.user_id
+                        row["created_by_id"] = self.user_id
+                        row["affiliation_id"] = affiliation_id
+                        row["district_id"] = district_id
+                        valid_rows[index] = row
+
+        serializer_errors, _ = self.save_rows(OrganizationImportSerializer, valid_rows)
+        return errors | serializer_errors
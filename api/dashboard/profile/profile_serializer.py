@@ -2,7 +2,7 @@ import uuid
 
 from decouple import config as decouple_config
 from django.db import transaction
-from django.db.models import F, Sum, Q
+from django.db.models import F, Sum
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 
@@ -18,10 +18,15 @@ from db.task import (
 )
 from db.user import User, UserSettings, Socials
 from utils.exception import CustomException
+from utils.leaderboard import (
+    InterestGroupLeaderboard,
+    KarmaAggregateTree,
+    KarmaDistribution,
+    KarmaLeaderboard,
+)
 from utils.permission import JWTUtils
 from utils.types import (
     OrganizationType,
-    RoleType,
     MainRoles,
     WebHookActions,
     WebHookCategory,
@@ -100,15 +105,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         )
 
     def get_percentile(self, obj):
-        users_count_lt_user_karma = Wallet.objects.filter(
-            karma__lt=obj.wallet_user.karma
-        ).count()
-        user_count = User.objects.all().count()
-        return (
-            0
-            if user_count == 0
-            else 100 - ((users_count_lt_user_karma * 100) / user_count)
-        )
+        return KarmaDistribution.get_percentile(obj.wallet_user.karma)
 
     def get_roles(self, obj):
         if "role_values" in self.context:
@@ -139,35 +136,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return None
 
     def get_rank(self, obj):
-        roles = self.get_roles(obj)
-        user_karma = obj.wallet_user.karma
-        if RoleType.MENTOR.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.MENTOR.value,
-                karma__gte=user_karma,
-            ).order_by("-karma", "-updated_at", "created_at")
-        elif RoleType.ENABLER.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.ENABLER.value,
-                karma__gte=user_karma,
-            ).order_by("-karma", "-updated_at", "created_at")
-        else:
-            ranks = (
-                Wallet.objects.filter(karma__gte=user_karma)
-                .exclude(
-                    Q(
-                        user__user_role_link_user__role__title__in=[
-                            RoleType.ENABLER.value,
-                            RoleType.MENTOR.value,
-                        ]
-                    )
-                )
-                .order_by("-karma", "-updated_at", "created_at")
-            )
-        ranks = list(ranks.values_list("user_id", flat=True))
-        return ranks.index(obj.id) + 1
+        board = KarmaLeaderboard.get_board(self.get_roles(obj))
+        wallet = getattr(obj, "wallet_user", None)
+        return KarmaLeaderboard.get_user_rank(
+            board, obj.id, wallet.karma if wallet else None
+        )
 
     def get_karma_distribution(self, obj):
         return (
@@ -178,26 +151,19 @@ class UserProfileSerializer(serializers.ModelSerializer):
         )
 
     def get_interest_groups(self, obj):
-        interest_groups = []
-        for ig_link in UserIgLink.objects.filter(user=obj):
-            total_ig_karma = (
-                0
-                if KarmaActivityLog.objects.filter(
-                    task__ig=ig_link.ig, user=obj, appraiser_approved=True
-                )
-                .aggregate(Sum("karma"))
-                .get("karma__sum")
-                is None
-                else KarmaActivityLog.objects.filter(
-                    task__ig=ig_link.ig, user=obj, appraiser_approved=True
-                )
-                .aggregate(Sum("karma"))
-                .get("karma__sum")
-            )
-            interest_groups.append(
-                {"id": ig_link.ig.id, "name": ig_link.ig.name, "karma": total_ig_karma}
-            )
-        return interest_groups
+        ig_links = list(UserIgLink.objects.filter(user=obj).select_related("ig"))
+        standings = InterestGroupLeaderboard.get_user_standings(
+            obj.id, [ig_link.ig_id for ig_link in ig_links]
+        )
+        return [
+            {
+                "id": ig_link.ig.id,
+                "name": ig_link.ig.name,
+                "karma": standings[ig_link.ig_id]["karma"],
+                "rank": standings[ig_link.ig_id]["rank"],
+            }
+            for ig_link in ig_links
+        ]
 
 
 class UserLevelSerializer(serializers.ModelSerializer):
@@ -259,36 +225,11 @@ class UserRankSerializer(ModelSerializer):
         return ["Learner"] if len(roles) == 0 else roles
 
     def get_rank(self, obj):
-        roles = self.get_role(obj)
-        user_karma = obj.wallet_user.karma
-        if RoleType.MENTOR.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.MENTOR.value,
-                karma__gte=user_karma,
-            ).order_by("-karma", "-updated_at", "created_at")
-        elif RoleType.ENABLER.value in roles:
-            ranks = Wallet.objects.filter(
-                user__user_role_link_user__verified=True,
-                user__user_role_link_user__role__title=RoleType.ENABLER.value,
-                karma__gte=user_karma,
-            ).order_by("-karma", "-updated_at", "created_at")
-        else:
-            ranks = (
-                Wallet.objects.filter(karma__gte=user_karma)
-                .exclude(
-                    Q(
-                        user__user_role_link_user__role__title__in=[
-                            RoleType.ENABLER.value,
-                            RoleType.MENTOR.value,
-                        ]
-                    )
-                )
-                .order_by("-karma", "-updated_at", "created_at")
-            )
-
-        ranks = list(ranks.values_list("user_id", flat=True))
-        return ranks.index(obj.id) + 1
+        board = KarmaLeaderboard.get_board(self.get_role(obj))
+        wallet = getattr(obj, "wallet_user", None)
+        return KarmaLeaderboard.get_user_rank(
+            board, obj.id, wallet.karma if wallet else None
+        )
 
     def get_karma(self, obj):
         return total_karma.karma if (total_karma := obj.wallet_user) else None
@@ -458,6 +399,8 @@ class LinkSocials(ModelSerializer):
                 Wallet.objects.filter(user_id=user_id).update(
                     karma=F("karma") + karma_value, updated_by_id=user_id
                 )
+                KarmaLeaderboard.update_users([user_id])
+                KarmaAggregateTree.apply_karma_delta([user_id], karma_value)
 
         for account, account_url in validated_data.items():
             old_account_url = getattr(instance, account)
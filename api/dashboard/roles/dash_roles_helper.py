@@ -0,0 +1,78 @@
+import uuid
+
+from django.db import transaction
+
+from db.user import Role, User, UserRoleLink
+from utils.bulk_import import BulkImporter
+from utils.types import WebHookActions, WebHookCategory
+from utils.utils import DiscordWebhooks
+from .dash_roles_serializer import UserRoleBulkAssignSerializer
+
+
+class UserRoleImporter(BulkImporter):
+    required_headers = ["muid", "role"]
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.user_role_link_to_check = set()
+
+    def process_chunk(self, rows):
+        users_to_fetch = {row.get("muid") for row in rows}
+        roles_to_fetch = {row.get("role") for row in rows}
+        users_dict = dict(
+            User.objects.filter(muid__in=users_to_fetch).values_list("muid", "id")
+        )
+        roles_dict = dict(
+            Role.objects.filter(title__in=roles_to_fetch).values_list("title", "id")
+        )
+        existing_user_role_links = set(
+            UserRoleLink.objects.filter(
+                user__muid__in=users_to_fetch, role__title__in=roles_to_fetch
+            ).values_list("user__muid", "role__title")
+        )
+
+        errors = {}
+        valid_rows = {}
+        users_by_role = {}
+        for index, row in enumerate(rows):
+            user = row.get("muid")
+            role = row.get("role")
+            user_id = users_dict.get(user)
+            role_id = roles_dict.get(role)
+
+            if (user, role) in self.user_role_link_to_check:
+                errors[index] = "Duplicate entry"
+                continue
+            self.user_role_link_to_check.add((user, role))
+
+            if not user_id:
+                errors[index] = f"Invalid user muid: {user}"
+            elif not role_id:
+                errors[index] = f"Invalid role: {role}"
+            elif (user, role) in existing_user_role_links:
+                errors[index] = f"User {user} already has role {role}"
+            else:
+                valid_rows[index] = {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "role_id": role_id,
+                    "verified": True,
+                    "created_by_id": self.user_id,
+                }
+
+        serializer_errors, _ = self.save_rows(UserRoleBulkAssignSerializer, valid_rows)
+        for index, row in valid_rows.items():
+            if index not in serializer_errors:
+                users_by_role.setdefault(rows[index]["role"], []).append(row["user_id"])
+
+        def send_role_updates():
+            for role, user_set in users_by_role.items():
+                DiscordWebhooks.general_updates(
+                    WebHookCategory.BULK_ROLE.value,
+                    WebHookActions.UPDATE.value,
+                    role,
+                    ",".join(user_set),
+                )
+
+        transaction.on_commit(send_role_updates, robust=True)
+        return errors | serializer_errors
@@ -0,0 +1,119 @@
+import uuid
+
+from db.organization import Organization
+from db.task import Channel, InterestGroup, Level, TaskList, TaskType
+from utils.bulk_import import BulkImporter
+from utils.types import Events
+from utils.utils import DateTimeUtils
+from .dash_task_serializer import TaskImportSerializer
+
+
+class TaskListImporter(BulkImporter):
+    required_headers = [
+        "hashtag",
+        "title",
+        "description",
+        "karma",
+        "usage_count",
+        "variable_karma",
+        "level",
+        "channel",
+        "type",
+        "ig",
+        "org",
+        "event",
+    ]
+
+    def __init__(self, job):
+        super().__init__(job)
+        self.hashtags_excel = set()
+
+    def process_chunk(self, rows):
+        hashtags_db = set(
+            TaskList.objects.filter(
+                hashtag__in={row.get("hashtag") for row in rows}
+            ).values_list("hashtag", flat=True)
+        )
+        channels_dict = dict(
+            Channel.objects.filter(
+                name__in={row.get("channel") for row in rows}
+            ).values_list("name", "id")
+        )
+        task_types_dict = dict(
+            TaskType.objects.filter(
+                title__in={row.get("type") for row in rows}
+            ).values_list("title", "id")
+        )
+        levels_dict = dict(
+            Level.objects.filter(
+                name__in={row.get("level") for row in rows}
+            ).values_list("name", "id")
+        )
+        igs_dict = dict(
+            InterestGroup.objects.filter(
+                name__in={row.get("ig") for row in rows}
+            ).values_list("name", "id")
+        )
+        orgs_dict = dict(
+            Organization.objects.filter(
+                code__in={row.get("org") for row in rows}
+            ).values_list("code", "id")
+        )
+        events = Events.get_all_values()
+
+        errors = {}
+        valid_rows = {}
+        for index, row in enumerate(rows):
+            hashtag = row.get("hashtag")
+            level = row.pop("level")
+            channel = row.pop("channel")
+            task_type = row.pop("type")
+            ig = row.pop("ig")
+            org = row.pop("org")
+
+            task_type_id = task_types_dict.get(task_type)
+            channel_id = channels_dict.get(channel) if channel is not None else None
+            level_id = levels_dict.get(level) if level is not None else None
+            ig_id = igs_dict.get(ig) if ig is not None else None
+            org_id = orgs_dict.get(org) if org is not None else None
+            event = row.get("event")
+
+            if not hashtag:
+                errors[index] = "Missing hashtag."
+            elif hashtag in self.hashtags_excel:
+                errors[index] = f"Duplicate hashtag in excel: {hashtag}"
+            elif hashtag in hashtags_db:
+                errors[index] = f"Duplicate hashtag in database: {hashtag}"
+            elif not row.get("title"):
+                self.hashtags_excel.add(hashtag)
+                errors[index] = "Missing title."
+            else:
+                self.hashtags_excel.add(hashtag)
+                if channel and not channel_id:
+                    errors[index] = f"Invalid channel: {channel}"
+                elif not task_type_id:
+                    errors[index] = f"Invalid task type: {task_type}"
+                elif level and not level_id:
+                    errors[index] = f"Invalid level: {level}"
+                elif ig and not ig_id:
+                    errors[index] = f"Invalid interest group: {ig}"
+                elif org and not org_id:
+                    errors[index] = f"Invalid organization: {org}"
+                elif event is not None and event not in events:
+                    errors[index] = f"Invalid event: {event}"
+                else:
+                    row["id"] = str(uuid.uuid4())
+                    row["updated_by_id"] = self.user_id
+                    row["updated_at"] = DateTimeUtils.get_current_utc_time()
+                    row["created_by_id"] = self.user_id
+                    row["created_at"] = DateTimeUtils.get_current_utc_time()
+                    row["active"] = True
+                    row["channel_id"] = channel_id or None
+                    row["type_id"] = task_type_id
+                    row["level_id"] = level_id or None
+                    row["ig_id"] = ig_id or None
+                    row["org_id"] = org_id or None
+                    valid_rows[index] = row
+
+        serializer_errors, _ = self.save_rows(TaskImportSerializer, valid_rows)
+        return errors | serializer_errors
@@ -1,15 +1,14 @@
-import uuid
-
 from rest_framework.views import APIView
 
 from db.organization import Organization
 from db.task import Channel, InterestGroup, Level, TaskList, TaskType
+from utils.bulk_import import ImportJobs
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
 from utils.types import Events, RoleType
-from utils.utils import CommonUtils, DateTimeUtils, ImportCSV
+from utils.utils import CommonUtils
+from api.dashboard.bulk_import.bulk_import_serializer import ImportJobSerializer
 from .dash_task_serializer import (
-    TaskImportSerializer,
     TaskListSerializer,
     TaskModifySerializer,
     TaskTypeCreateUpdateSerializer,
@@ -207,13 +206,13 @@ class TaskListCSV(APIView):
             "org"
         ).all()
 
-        task_serializer_data = TaskListSerializer(
+        task_rows = CommonUtils.iter_serialized(
             task_queryset,
-            many=True
-        ).data
+            TaskListSerializer
+        )
 
         return CommonUtils.generate_csv(
-            task_serializer_data,
+            task_rows,
             "Task List"
         )
 
@@ -236,201 +235,16 @@ class ImportTaskListCSV(APIView):
                 general_message="File not found."
             ).get_failure_response()
 
-        excel_data = ImportCSV()
-        excel_data = excel_data.read_excel_file(file_obj)
-
-        if not excel_data:
-            return CustomResponse(
-                general_message="Empty csv file."
-            ).get_failure_response()
-
-        temp_headers = [
-            "hashtag",
-            "title",
-            "description",
-            "karma",
-            "usage_count",
-            "variable_karma",
-            "level",
-            "channel",
-            "type",
-            "ig",
-            "org",
-            "event",
-        ]
-        first_entry = excel_data[0]
-        for key in temp_headers:
-            if key not in first_entry:
-                return CustomResponse(
-                    general_message=f"{key} does not exist in the file."
-                ).get_failure_response()
-
-        excel_data = [row for row in excel_data if any(row.values())]
-        valid_rows = []
-        error_rows = []
-
-        hashtags_excel = set()
-        hashtags_db = TaskList.objects.values_list("hashtag", flat=True)
-        channels_to_fetch = set()
-        task_types_to_fetch = set()
-        levels_to_fetch = set()
-        igs_to_fetch = set()
-        orgs_to_fetch = set()
-
-        for row in excel_data[1:]:
-            hashtag = row.get("hashtag")
-            if not hashtag:
-                row["error"] = "Missing hashtag."
-                error_rows.append(row)
-                excel_data.remove(row)
-                continue
-            elif hashtag in hashtags_excel:
-                row["error"] = f"Duplicate hashtag in excel: {hashtag}"
-                error_rows.append(row)
-                excel_data.remove(row)
-                continue
-            elif hashtag in hashtags_db:
-                row["error"] = f"Duplicate hashtag in database: {hashtag}"
-                error_rows.append(row)
-                excel_data.remove(row)
-                continue
-            else:
-                hashtags_excel.add(hashtag)
-
-            title = row.get("title")
-            if not title:
-                row["error"] = "Missing title."
-                error_rows.append(row)
-                excel_data.remove(row)
-                continue
-
-            level = row.get("level")
-            channel = row.get("channel")
-            task_type = row.get("type")
-            ig = row.get("ig")
-            org = row.get("org")
-
-            channels_to_fetch.add(channel)
-            task_types_to_fetch.add(task_type)
-            levels_to_fetch.add(level)
-            igs_to_fetch.add(ig)
-            orgs_to_fetch.add(org)
-
-        channels = Channel.objects.filter(
-            name__in=channels_to_fetch
-        ).values(
-            "id",
-            "name"
-        )
-
-        task_types = TaskType.objects.filter(
-            title__in=task_types_to_fetch
-        ).values(
-            "id",
-            "title"
-        )
-
-        levels = Level.objects.filter(
-            name__in=levels_to_fetch
-        ).values(
-            "id",
-            "name"
-        )
-
-        igs = InterestGroup.objects.filter(
-            name__in=igs_to_fetch
-        ).values(
-            "id",
-            "name"
-        )
-
-        orgs = Organization.objects.filter(
-            code__in=orgs_to_fetch
-        ).values(
-            "id",
-            "code"
-        )
-
-        channels_dict = {channel["name"]: channel["id"] for channel in channels}
-        task_types_dict = {
-            task_type["title"]: task_type["id"] for task_type in task_types
-        }
-        levels_dict = {level["name"]: level["id"] for level in levels}
-        igs_dict = {ig["name"]: ig["id"] for ig in igs}
-        orgs_dict = {org["code"]: org["id"] for org in orgs}
-        events = Events.get_all_values()
-
-        for row in excel_data[1:]:
-            level = row.pop("level")
-            channel = row.pop("channel")
-            task_type = row.pop("type")
-            ig = row.pop("ig")
-            org = row.pop("org")
-
-            task_type_id = task_types_dict.get(task_type)
-            channel_id = channels_dict.get(channel) if channel is not None else None
-            level_id = levels_dict.get(level) if level is not None else None
-            ig_id = igs_dict.get(ig) if ig is not None else None
-            org_id = orgs_dict.get(org) if org is not None else None
-            event = row.get("event")
-
-            if channel and not channel_id:
-                row["error"] = f"Invalid channel: {channel}"
-                error_rows.append(row)
-            elif not task_type_id:
-                row["error"] = f"Invalid task type: {task_type}"
-                error_rows.append(row)
-            elif level and not level_id:
-                row["error"] = f"Invalid level: {level}"
-                error_rows.append(row)
-            elif ig and not ig_id:
-                row["error"] = f"Invalid interest group: {ig}"
-                error_rows.append(row)
-            elif org and not org_id:
-                row["error"] = f"Invalid organization: {org}"
-                error_rows.append(row)
-            elif event is not None and event not in events:
-                row["error"] = f"Invalid event: {event}"
-                error_rows.append(row)
-            else:
-                user_id = JWTUtils.fetch_user_id(request)
-                row["id"] = str(uuid.uuid4())
-                row["updated_by_id"] = user_id
-                row["updated_at"] = DateTimeUtils.get_current_utc_time()
-                row["created_by_id"] = user_id
-                row["created_at"] = DateTimeUtils.get_current_utc_time()
-                row["active"] = True
-                row["channel_id"] = channel_id or None
-                row["type_id"] = task_type_id
-                row["level_id"] = level_id or None
-                row["ig_id"] = ig_id or None
-                row["org_id"] = org_id or None
-                valid_rows.append(row)
-
-        task_list_serializer = TaskImportSerializer(data=valid_rows, many=True)
-        success_data = []
-        if task_list_serializer.is_valid():
-            task_list_serializer.save()
-            for task_data in task_list_serializer.data:
-                success_data.append({
-                    'hashtag': task_data.get('hashtag', ''),
-                    'title': task_data.get('title', ''),
-                    'description': task_data.get('description', ''),
-                    'karma': task_data.get('karma', ''),
-                    'usage_count': task_data.get('usage_count', ''),
-                    'variable_karma': task_data.get('variable_karma', ''),
-                    'level': task_data.get('level_id', ''),
-                    'channel': task_data.get('channel_id', ''),
-                    'type': task_data.get('type_id', ''),
-                    'ig': task_data.get('ig_id', ''),
-                    'org': task_data.get('org_id', ''),
-                    'event': task_data.get('event', ''),
-                })
-        else:
-            error_rows.append(task_list_serializer.errors)
+        try:
+            job = ImportJobs.request(
+                "tasks", file_obj, user_id=JWTUtils.fetch_user_id(request)
+            )
+        except ValueError as e:
+            return CustomResponse(general_message=str(e)).get_failure_response()
 
         return CustomResponse(
-            response={"Success": success_data, "Failed": error_rows}
+            general_message="Import queued",
+            response=ImportJobSerializer(job).data,
         ).get_success_response()
 
 
@@ -25,4 +25,6 @@ urlpatterns = [
     path("events/", include("api.dashboard.events.urls")),
     path("coupon/", include("api.dashboard.coupon.urls")),
     path("projects/", include("api.dashboard.projects.urls")),
+    path("export/", include("api.dashboard.export.urls")),
+    path("import/", include("api.dashboard.bulk_import.urls")),
 ]
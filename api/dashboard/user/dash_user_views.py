@@ -9,6 +9,7 @@ from rest_framework.views import APIView
 
 from db.organization import UserOrganizationLink
 from db.user import ForgotPassword, User, UserRoleLink
+from utils.leaderboard import KarmaDistribution
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
 from utils.types import OrganizationType, RoleType, WebHookActions, WebHookCategory
@@ -129,11 +130,27 @@ class UserManagementCSV(APIView):
             "wallet_user", "user_lvl_link_user", "user_lvl_link_user__level"
         ).all()
 
-        serializer = dash_user_serializer.UserDashboardSerializer(
-            user_queryset, many=True
+        user_rows = CommonUtils.iter_serialized(
+            user_queryset, dash_user_serializer.UserDashboardSerializer
         )
 
-        return CommonUtils.generate_csv(serializer.data, "User")
+        return CommonUtils.generate_csv(user_rows, "User")
+
+
+class KarmaDistributionAPI(APIView):
+    authentication_classes = [CustomizePermission]
+
+    @role_required([RoleType.ADMIN.value])
+    def get(self, request):
+        try:
+            bucket_count = int(request.query_params.get("buckets", 20))
+        except ValueError:
+            return CustomResponse(
+                general_message="buckets must be a number"
+            ).get_failure_response()
+
+        buckets = KarmaDistribution.get_buckets(min(max(bucket_count, 1), 100))
+        return CustomResponse(response=buckets).get_success_response()
 
 
 class UserVerificationAPI(APIView):
@@ -222,10 +239,10 @@ class UserVerificationCSV(APIView):
             verified=False
         )
 
-        serializer = dash_user_serializer.UserVerificationSerializer(
-            user_queryset, many=True
+        user_rows = CommonUtils.iter_serialized(
+            user_queryset, dash_user_serializer.UserVerificationSerializer
         )
-        return CommonUtils.generate_csv(serializer.data, "User")
+        return CommonUtils.generate_csv(user_rows, "User")
 
 
 class ForgotPasswordAPI(APIView):
@@ -46,6 +46,11 @@ urlpatterns = [
     ),
     path("profile/update/", dash_user_views.UserProfilePictureView.as_view()),
     path("csv/", dash_user_views.UserManagementCSV.as_view(), name="csv-user"),
+    path(
+        "karma-distribution/",
+        dash_user_views.KarmaDistributionAPI.as_view(),
+        name="karma-distribution",
+    ),
     path("", dash_user_views.UserAPI.as_view(), name="list-user"),
     path(
         "<str:user_id>/",
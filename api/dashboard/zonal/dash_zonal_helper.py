@@ -1,8 +1,43 @@
+from django.db.models import F
+
 from db.organization import UserOrganizationLink
+from db.user import User
 from utils.types import OrganizationType
+from utils.utils import CommonUtils
 
 
 def get_user_college_link(user_id):
     return UserOrganizationLink.objects.filter(
         user_id=user_id, org__org_type=OrganizationType.COLLEGE.value
     ).first()
+
+
+def get_zonal_student_details(user_org_link, request=None):
+    """
+    Returns the college students of the lead's zone, ranked by karma, one
+    row per student however many of its colleges they are linked to. Pass
+    the request the list is paginated with, so a search keeps the ranks of
+    the whole zone.
+    """
+    students = User.objects.filter(
+        pk__in=UserOrganizationLink.objects.filter(
+            org__district__zone=user_org_link.org.district.zone,
+            org__org_type=OrganizationType.COLLEGE.value,
+        ).values("user_id")
+    )
+    return (
+        students.annotate(
+            user_id=F("id"),
+            karma=F("wallet_user__karma"),
+            level=F("user_lvl_link_user__level__name"),
+            rank=CommonUtils.get_rank(
+                students,
+                [
+                    F("wallet_user__karma").desc(),
+                    F("wallet_user__updated_at").desc(),
+                    F("wallet_user__created_at").asc(),
+                ],
+                request,
+            ),
+        )
+    )
@@ -1,13 +1,10 @@
-from datetime import timedelta
-
-from django.db.models import Sum
 from rest_framework import serializers
 
 from db.organization import UserOrganizationLink, District
-from db.task import KarmaActivityLog, Level
+from db.task import Level
 from db.user import User
-from utils.types import OrganizationType
-from utils.utils import DateTimeUtils
+from utils.leaderboard import KarmaAggregateTree
+from utils.types import KarmaAggregateLevel, OrganizationType
 
 
 class ZonalDetailsSerializer(serializers.ModelSerializer):
@@ -29,54 +26,27 @@ class ZonalDetailsSerializer(serializers.ModelSerializer):
             "active_members",
         ]
 
-    def get_rank(self, obj):
-        org_karma_dict = (
-            UserOrganizationLink.objects.filter(
-                org__org_type=OrganizationType.COLLEGE.value)
-            .values("org__district__zone")
-            .annotate(total_karma=Sum("user__wallet_user__karma"))
-        ).order_by("-total_karma", "org__created_at")
-
-        rank_dict = {
-            data["org__district__zone"]: data["total_karma"]
-            if data["total_karma"] is not None
-            else 0
-            for data in org_karma_dict
-        }
-
-        sorted_rank_dict = dict(
-            sorted(rank_dict.items(), key=lambda x: x[1], reverse=True)
-        )
+    def _get_aggregate(self, obj):
+        if not hasattr(self, "aggregate"):
+            self.aggregate = KarmaAggregateTree.get_aggregate(
+                KarmaAggregateLevel.ZONE.value, obj.org.district.zone_id
+            )
+        return self.aggregate
 
-        if obj.org.district.zone.id in sorted_rank_dict:
-            keys_list = list(sorted_rank_dict.keys())
-            position = keys_list.index(obj.org.district.zone.id)
-            return position + 1
+    def get_rank(self, obj):
+        return KarmaAggregateTree.get_rank(self._get_aggregate(obj))
 
     def get_karma(self, obj):
-        return UserOrganizationLink.objects.filter(
-            org_org_type=OrganizationType.COLLEGE.value,
-            org__district__zone=obj.org.district.zone,
-        ).aggregate(total_karma=Sum("user__wallet_user__karma"))["total_karma"]
+        aggregate = self._get_aggregate(obj)
+        return aggregate.total_karma if aggregate else 0
 
     def get_total_members(self, obj):
-        return UserOrganizationLink.objects.filter(
-            org_org_type=OrganizationType.COLLEGE.value,
-            org__district__zone=obj.org.district.zone,
-        ).count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.member_count if aggregate else 0
 
     def get_active_members(self, obj):
-        today = DateTimeUtils.get_current_utc_time()
-        start_date = today.replace(day=1)
-        end_date = start_date.replace(
-            day=1, month=(start_date.month % 12) + 1
-        ) - timedelta(days=1)
-
-        return KarmaActivityLog.objects.filter(
-            user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            user__user_organization_link_user__org__district__zone=obj.org.district.zone,
-            created_at__range=(start_date, end_date),
-        ).count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.active_members if aggregate else 0
 
 
 class ZonalTopThreeDistrictSerializer(serializers.ModelSerializer):
@@ -122,16 +92,12 @@ class ZonalStudentDetailsSerializer(serializers.Serializer):
     full_name = serializers.SerializerMethodField()
     muid = serializers.CharField()
     karma = serializers.IntegerField()
-    rank = serializers.SerializerMethodField()
+    rank = serializers.IntegerField()
     level = serializers.CharField()
 
     class Meta:
         fields = ["user_id", "full_name", "karma", "muid", "level", "rank"]
 
-    def get_rank(self, obj):
-        ranks = self.context.get("ranks")
-        return ranks.get(obj.id, None)
-
     def get_full_name(self, obj):
         return obj.full_name
 
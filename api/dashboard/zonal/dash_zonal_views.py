@@ -1,14 +1,13 @@
-from itertools import islice
-
-from django.db.models import Case, CharField, F, Sum, When
+from django.db.models import Case, CharField, F, When
 from rest_framework.views import APIView
 
 from db.organization import District, Organization, UserOrganizationLink
-from db.task import Level, Wallet
+from db.task import Level
 from db.user import User
+from utils.leaderboard import KarmaAggregateTree
 from utils.permission import CustomizePermission, JWTUtils, role_required
 from utils.response import CustomResponse
-from utils.types import OrganizationType, RoleType
+from utils.types import KarmaAggregateLevel, OrganizationType, RoleType
 from utils.utils import CommonUtils
 from . import dash_zonal_helper, dash_zonal_serializer
 
@@ -37,33 +36,22 @@ class ZonalTopThreeDistrictAPI(APIView):
 
         user_org_link = dash_zonal_helper.get_user_college_link(user_id)
 
-        district_karma_dict = (
-            UserOrganizationLink.objects.filter(
-                org__org_type=OrganizationType.COLLEGE.value,
-                org__district__zone=user_org_link.org.district.zone,
-                verified=True,
+        top_districts = {
+            aggregate.entity_id: aggregate.total_karma
+            for aggregate in KarmaAggregateTree.get_top(
+                KarmaAggregateLevel.DISTRICT.value,
+                user_org_link.org.district.zone_id,
+                3,
             )
-            .values("org__district")
-            .annotate(total_karma=Sum("user__wallet_user__karma"))
-        )
-
-        district_ranks = {
-            data["org__district"]: data["total_karma"]
-            if data["total_karma"] is not None
-            else 0
-            for data in district_karma_dict
         }
 
-        district_ranks = dict(
-            sorted(district_ranks.items(), key=lambda x: x[1], reverse=True)
+        org_user_district = District.objects.filter(id__in=top_districts)
+        org_user_district = sorted(
+            org_user_district, key=lambda district: list(top_districts).index(district.id)
         )
 
-        top_districts = dict(islice(district_ranks.items(), 3))
-
-        org_user_district = District.objects.filter(id__in=top_districts).distinct()
-
         serializer = dash_zonal_serializer.ZonalTopThreeDistrictSerializer(
-            org_user_district, many=True, context={"ranks": district_ranks}
+            org_user_district, many=True, context={"ranks": top_districts}
         )
 
         return CustomResponse(response=serializer.data).get_success_response()
@@ -96,32 +84,8 @@ class ZonalStudentDetailsAPI(APIView):
 
         user_org_link = dash_zonal_helper.get_user_college_link(user_id)
 
-        rank = (
-            Wallet.objects.filter(
-                user__user_organization_link_user__org__district__zone=user_org_link.org.district.zone,
-                user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .order_by("-karma", "-updated_at", "created_at")
-            .values(
-                "user_id",
-                "karma",
-            )
-        )
-
-        ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
-
-        user_org_links = (
-            User.objects.filter(
-                user_organization_link_user__org__district__zone=user_org_link.org.district.zone,
-                user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .annotate(
-                user_id=F("id"),
-                karma=F("wallet_user__karma"),
-                level=F("user_lvl_link_user__level__name"),
-            )
+        user_org_links = dash_zonal_helper.get_zonal_student_details(
+            user_org_link, request
         )
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
@@ -137,7 +101,7 @@ class ZonalStudentDetailsAPI(APIView):
         )
 
         serializer = dash_zonal_serializer.ZonalStudentDetailsSerializer(
-            paginated_queryset.get("queryset"), many=True, context={"ranks": ranks}
+            paginated_queryset.get("queryset"), many=True
         )
 
         return CustomResponse(
@@ -157,38 +121,12 @@ class ZonalStudentDetailsCSVAPI(APIView):
 
         user_org_link = dash_zonal_helper.get_user_college_link(user_id)
 
-        rank = (
-            Wallet.objects.filter(
-                user__user_organization_link_user__org__district__zone=user_org_link.org.district.zone,
-                user__user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .order_by("-karma", "-updated_at", "created_at")
-            .values(
-                "user_id",
-                "karma",
-            )
-        )
-
-        ranks = {user["user_id"]: i + 1 for i, user in enumerate(rank)}
+        user_org_links = dash_zonal_helper.get_zonal_student_details(user_org_link)
 
-        user_org_links = (
-            User.objects.filter(
-                user_organization_link_user__org__district__zone=user_org_link.org.district.zone,
-                user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-            )
-            .distinct()
-            .annotate(
-                user_id=F("id"),
-                karma=F("wallet_user__karma"),
-                level=F("user_lvl_link_user__level__name"),
-            )
-        )
-
-        serializer = dash_zonal_serializer.ZonalStudentDetailsSerializer(
-            user_org_links, many=True, context={"ranks": ranks}
+        student_rows = CommonUtils.iter_serialized(
+            user_org_links, dash_zonal_serializer.ZonalStudentDetailsSerializer
         )
-        return CommonUtils.generate_csv(serializer.data, "Zonal Student Details")
+        return CommonUtils.generate_csv(student_rows, "Zonal Student Details")
 
 
 class ZonalCollegeDetailsAPI(APIView):
@@ -294,7 +232,9 @@ class ZonalCollegeDetailsCSVAPI(APIView):
             )
         )
 
-        serializer = dash_zonal_serializer.ZonalCollegeDetailsSerializer(
-            organizations, many=True, context={"leads": leads}
+        college_rows = CommonUtils.iter_serialized(
+            organizations,
+            dash_zonal_serializer.ZonalCollegeDetailsSerializer,
+            context={"leads": leads},
         )
-        return CommonUtils.generate_csv(serializer.data, "Zonal College Details")
+        return CommonUtils.generate_csv(college_rows, "Zonal College Details")
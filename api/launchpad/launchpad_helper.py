@@ -0,0 +1,203 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from db.launchpad import LaunchPadStanding, LaunchPadUserCollegeLink, LaunchPadUsers
+from db.organization import Organization, UserOrganizationLink
+from db.task import KarmaActivityLog
+from utils.bulk_import import BulkImporter
+from utils.leaderboard import get_log_task
+
+LAUNCHPAD_EVENT = "launchpad"
+INTRO_TASK_HASHTAG = "#lp24-introduction"
+ALLOWED_ORG_TYPES = ["College", "School", "Company"]
+
+RERANK_QUERY = """
+UPDATE launchpad_standing AS standing
+INNER JOIN (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY karma DESC, last_karma_at) AS new_position
+    FROM launchpad_standing
+) AS ranked ON ranked.id = standing.id
+SET standing.position = ranked.new_position
+"""
+
+
+class LaunchpadStandings:
+    """
+    Maintains the `launchpad_standing` table: launchpad karma, tie-break
+    time, rank and latest org/district/state of every participant who has
+    completed the introduction task.
+
+    Approving launchpad karma recomputes that participant's row and queues
+    a single debounced re-rank, so leaderboard pages, search and per-user
+    rank are plain indexed reads.
+    """
+
+    QUEUED_KEY = "launchpad:rerank_queued"
+    # Seconds to coalesce approvals into one re-rank
+    RERANK_DELAY = 30
+    REBUILD_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def _get_standings(user_ids=None) -> list[dict]:
+        logs = KarmaActivityLog.objects.filter(
+            task__event=LAUNCHPAD_EVENT, appraiser_approved=True
+        ).exclude(user_id=None)
+        if user_ids is not None:
+            logs = logs.filter(user_id__in=user_ids)
+
+        standings = list(
+            logs.values("user_id")
+            .annotate(
+                karma=Sum("karma"),
+                last_karma_at=Max("created_at"),
+                intro_completed=Count("id", filter=Q(task__hashtag=INTRO_TASK_HASHTAG)),
+            )
+            .filter(intro_completed__gt=0)
+            .order_by()
+        )
+
+        latest_orgs = {}
+        for user_id, org, district_name, state in (
+            UserOrganizationLink.objects.filter(
+                user_id__in=[standing["user_id"] for standing in standings],
+                org__org_type__in=ALLOWED_ORG_TYPES,
+            )
+            .order_by("created_at")
+            .values_list(
+                "user_id",
+                "org__title",
+                "org__district__name",
+                "org__district__zone__state__name",
+            )
+        ):
+            latest_orgs[user_id] = {
+                "org": org,
+                "district_name": district_name,
+                "state": state,
+            }
+
+        for standing in standings:
+            del standing["intro_completed"]
+            standing.update(
+                latest_orgs.get(
+                    standing["user_id"],
+                    {"org": None, "district_name": None, "state": None},
+                )
+            )
+        return standings
+
+    @staticmethod
+    def rerank() -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(RERANK_QUERY)
+
+    @classmethod
+    def refresh_users(cls, user_ids: list[str]) -> None:
+        """
+        Recomputes the standings of the given users and queues a re-rank.
+        """
+        user_ids = list(user_ids)
+        standings = {
+            standing.pop("user_id"): standing
+            for standing in cls._get_standings(user_ids)
+        }
+
+        with transaction.atomic():
+            LaunchPadStanding.objects.filter(user_id__in=user_ids).exclude(
+                user_id__in=standings
+            ).delete()
+            for user_id, standing in standings.items():
+                LaunchPadStanding.objects.update_or_create(
+                    user_id=user_id, defaults=standing
+                )
+        transaction.on_commit(cls.schedule_rerank)
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recomputes every standing from the karma activity log and ranks
+        them.
+
+        Returns:
+            int: The number of participants.
+        """
+        standings = cls._get_standings()
+        with transaction.atomic():
+            LaunchPadStanding.objects.all().delete()
+            LaunchPadStanding.objects.bulk_create(
+                [LaunchPadStanding(id=uuid.uuid4(), **standing) for standing in standings],
+                batch_size=cls.REBUILD_CHUNK_SIZE,
+            )
+            cls.rerank()
+        return len(standings)
+
+    @classmethod
+    def schedule_rerank(cls) -> None:
+        from mu_celery.task import rerank_launchpad_standings
+
+        if cache.add(cls.QUEUED_KEY, True, timeout=cls.RERANK_DELAY * 2):
+            rerank_launchpad_standings.apply_async(countdown=cls.RERANK_DELAY)
+
+    @staticmethod
+    def get_rank(user_id: str) -> int | None:
+        return (
+            LaunchPadStanding.objects.filter(user_id=user_id)
+            .values_list("position", flat=True)
+            .first()
+        )
+
+
+
+class LaunchpadUserImporter(BulkImporter):
+    """
+    Adds launchpad users and links them to their colleges. Jobs are queued
+    by a launchpad admin, whose id is kept in the job's `auth_user_id`
+    param.
+    """
+
+    def process_chunk(self, rows):
+        # The serializers module imports this one
+        from .serializers import LaunchpadUserSerializer
+
+        auth_user = LaunchPadUsers.objects.get(id=self.params["auth_user_id"])
+        errors = {}
+        for index, data in enumerate(rows):
+            not_found_colleges = []
+            data['colleges'] = data['colleges'].split(",") if data.get('colleges') else []
+            serializer = LaunchpadUserSerializer(data=data)
+            if not serializer.is_valid():
+                errors[index] = self.get_error_message(serializer.errors)
+                continue
+            user = serializer.save()
+            for college in data.get('colleges'):
+                if not (org := Organization.objects.filter(title=college, org_type="College").first()):
+                    not_found_colleges.append(college)
+                elif link := LaunchPadUserCollegeLink.objects.filter(college_id=college).first():
+                    link.delete()
+                else:
+                    LaunchPadUserCollegeLink.objects.create(
+                        id=uuid.uuid4(),
+                        user=user,
+                        college=org,
+                        created_by=auth_user,
+                        updated_by=auth_user
+                    )
+            if not_found_colleges:
+                errors[index] = f"User added, but colleges not found: {', '.join(not_found_colleges)}"
+        return errors
+
+
+@receiver(post_save, sender=KarmaActivityLog)
+@receiver(post_delete, sender=KarmaActivityLog)
+def launchpad_karma_changed(sender, instance, *args, **kwargs):
+    if instance.user_id is None:
+        return
+    if get_log_task(instance)["event"] == LAUNCHPAD_EVENT:
+        transaction.on_commit(
+            lambda: LaunchpadStandings.refresh_users([instance.user_id])
+        )
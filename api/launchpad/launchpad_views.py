@@ -8,80 +8,36 @@ from .serializers import LaunchpadLeaderBoardSerializer, LaunchpadParticipantsSe
       CollegeDataSerializer, LaunchpadUserSerializer, UserProfileUpdateSerializer, LaunchpadUpdateUserSerializer,LaunchPadRankSerializer,\
           TaskCompletedLeaderBoardSerializer
 from api.dashboard.profile.profile_serializer import UserProfileSerializer , LinkSocials ,UserLevelSerializer ,UserLogSerializer
+from api.dashboard.bulk_import.bulk_import_serializer import ImportJobSerializer
+from api.dashboard.bulk_import.bulk_import_views import get_error_sheet_response
 
 from utils.response import CustomResponse
-from utils.utils import CommonUtils, ImportCSV
+from utils.bulk_import import ImportJobs
+from utils.utils import CommonUtils
 from utils.types import LaunchPadLevels, LaunchPadRoles
 from utils.permission import JWTUtils
 from db.user import User, UserRoleLink , Role , Socials
 from db.organization import UserOrganizationLink, Organization
 from db.task import KarmaActivityLog, Level, TaskList, Wallet
-from db.launchpad import LaunchPadUsers, LaunchPadUserCollegeLink , LaunchPad
+from db.launchpad import LaunchPadUsers, LaunchPadUserCollegeLink , LaunchPad, LaunchPadStanding
+from db.bulk_import import ImportJob
 
 
 
 class Leaderboard(APIView):
     def get(self, request):
-        total_karma_subquery = KarmaActivityLog.objects.filter(
-            user=OuterRef('id'),
-            task__event='launchpad',
-            appraiser_approved=True,
-        ).values('user').annotate(
-            total_karma=Sum('karma')
-        ).values('total_karma')
-        allowed_org_types = ["College", "School", "Company"]
-
-        intro_task_completed_users = KarmaActivityLog.objects.filter(
-            task__event='launchpad',
-            appraiser_approved=True,
-            task__hashtag='#lp24-introduction',
-        ).values('user')
-
-        latest_org_link = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__title')[:1]
-
-        latest_district = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__district__name')[:1]
-
-        latest_state = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__district__zone__state__name')[:1]
+        standings = LaunchPadStanding.objects.select_related(
+            "user", "user__wallet_user"
+        ).order_by("-karma", "last_karma_at")
 
-        users = User.objects.filter(
-            karma_activity_log_user__task__event="launchpad",
-            karma_activity_log_user__appraiser_approved=True,
-            id__in=intro_task_completed_users
-        ).annotate(
-            karma=Subquery(total_karma_subquery, output_field=IntegerField()),
-            org=Subquery(latest_org_link),
-            district_name=Subquery(latest_district),
-            state=Subquery(latest_state),
-            time_=Max("karma_activity_log_user__created_at"),
-        ).order_by("-karma", "time_")
-
-        rank_list = list(users) 
-        for index, user in enumerate(rank_list):
-            user.rank = index + 1
-        
         paginated_queryset = CommonUtils.get_paginated_queryset(
-            users,
+            standings,
             request,
-            ["full_name", "karma", "org", "district_name", "state"]
+            ["user__full_name", "karma", "org", "district_name", "state"]
         )
 
-        final_users = paginated_queryset.get("queryset")
-        if request.query_params.get("search"):
-            final_users = list(final_users)
-            for user in final_users:
-                user.rank = next(rank_user.rank for rank_user in rank_list if rank_user.muid == user.muid)
-
         serializer = LaunchpadLeaderBoardSerializer(
-            final_users,
+            paginated_queryset.get("queryset"),
             many=True
         )
         
@@ -522,41 +478,40 @@ class BulkLaunchpadUser(APIView):
             file_obj = request.FILES['user_data']
         except KeyError:
             return CustomResponse(general_message={'File not found.'}).get_failure_response()
-        excel_data = ImportCSV()
-        excel_data = excel_data.read_excel_file(file_obj)
-        if not excel_data:
-            return CustomResponse(general_message={'Empty csv file.'}).get_failure_response()
-        errors = {}
-        error = False
+        try:
+            job = ImportJobs.request(
+                "launchpad-users", file_obj, params={"auth_user_id": auth_user.id}
+            )
+        except ValueError as e:
+            return CustomResponse(general_message=str(e)).get_failure_response()
+        return CustomResponse(
+            general_message="Import queued", response=ImportJobSerializer(job).data
+        ).get_success_response()
 
-        for data in excel_data[1:]:
-            not_found_colleges = []
-            data['colleges'] = data['colleges'].split(",") if data.get('colleges') else []
-            serializer = LaunchpadUserSerializer(data=data)
-            if not serializer.is_valid():
-                continue
-            user = serializer.save()
-            if data.get('colleges') is None:
-                continue
-            for college in data.get('colleges'):
-                if not (org := Organization.objects.filter(title=college, org_type="College").first()):
-                    error = True
-                    not_found_colleges.append(college)
-                elif link := LaunchPadUserCollegeLink.objects.filter(college_id=college).first():
-                    link.delete()
-                else:
-                    LaunchPadUserCollegeLink.objects.create(
-                        id=uuid.uuid4(),
-                        user=user,
-                        college=org,
-                        created_by=auth_user,
-                        updated_by=auth_user
-                    )
-            errors[data.get('email')] = {}
-            errors[data.get('email')]["not_found_colleges"] = not_found_colleges
-        if error:
-            return CustomResponse(message=errors).get_failure_response()
-        return CustomResponse(general_message="Successfully added users").get_success_response()
+
+class BulkLaunchpadUserJob(APIView):
+
+    @staticmethod
+    def get_job(request, job_id):
+        auth_mail = request.query_params.get('current_user')
+        if not (auth_user := LaunchPadUsers.objects.filter(email=auth_mail, role=LaunchPadRoles.ADMIN.value).first()):
+            return None
+        return ImportJob.objects.filter(
+            id=job_id, import_type="launchpad-users", params__auth_user_id=auth_user.id
+        ).first()
+
+    def get(self, request, job_id):
+        if not (job := self.get_job(request, job_id)):
+            return CustomResponse(general_message="Import not found").get_failure_response()
+        return CustomResponse(response=ImportJobSerializer(job).data).get_success_response()
+
+
+class BulkLaunchpadUserErrorSheet(APIView):
+
+    def get(self, request, job_id):
+        if not (job := BulkLaunchpadUserJob.get_job(request, job_id)):
+            return CustomResponse(general_message="Import not found").get_failure_response()
+        return get_error_sheet_response(job)
 
 
 class LaunchPadListAdmin(APIView):
@@ -566,52 +521,14 @@ class LaunchPadListAdmin(APIView):
         auth_mail = auth_mail[0] if isinstance(auth_mail, list) else auth_mail
         if not (auth_user := LaunchPadUsers.objects.filter(email=auth_mail, role=LaunchPadRoles.ADMIN.value).first()):
             return CustomResponse(general_message="Unauthorized").get_failure_response()
-        total_karma_subquery = KarmaActivityLog.objects.filter(
-            user=OuterRef('id'),
-            task__event='launchpad',
-            appraiser_approved=True,
-        ).values('user').annotate(
-            total_karma=Sum('karma')
-        ).values('total_karma')
-        allowed_org_types = ["College", "School", "Company"]
-
-        intro_task_completed_users = KarmaActivityLog.objects.filter(
-            task__event='launchpad',
-            appraiser_approved=True,
-            task__hashtag='#lp24-introduction',
-        ).values('user')
-
-        latest_org_link = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__title')[:1]
-
-        latest_district = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__district__name')[:1]
-
-        latest_state = UserOrganizationLink.objects.filter(
-            user=OuterRef('id'),
-            org__org_type__in=allowed_org_types
-        ).order_by('-created_at').values('org__district__zone__state__name')[:1]
-
-        users = User.objects.filter(
-            karma_activity_log_user__task__event="launchpad",
-            karma_activity_log_user__appraiser_approved=True,
-            id__in=intro_task_completed_users
-        ).annotate(
-            karma=Subquery(total_karma_subquery, output_field=IntegerField()),
-            org=Subquery(latest_org_link),
-            district_name=Subquery(latest_district),
-            state=Subquery(latest_state),
-            time_=Max("karma_activity_log_user__created_at"),
-        ).order_by("-karma", "time_")
+        standings = LaunchPadStanding.objects.select_related(
+            "user", "user__wallet_user"
+        ).order_by("-karma", "last_karma_at")
 
         paginated_queryset = CommonUtils.get_paginated_queryset(
-            users,
+            standings,
             request,
-            ["full_name", "karma", "org", "district_name", "state"]
+            ["user__full_name", "karma", "org", "district_name", "state"]
         )
 
         serializer = LaunchpadLeaderBoardSerializer(
@@ -1,15 +1,15 @@
 import uuid
 
-from django.db.models import Sum, Max, Prefetch, F, OuterRef, Subquery, IntegerField, Q
+from django.db.models import Prefetch, F, Q
 
 from rest_framework import serializers
 
 from db.user import User
 from db.organization import UserOrganizationLink, Organization
-from db.task import KarmaActivityLog
-from db.launchpad import LaunchPadUsers, LaunchPadUserCollegeLink, LaunchPad
+from db.launchpad import LaunchPadUsers, LaunchPadUserCollegeLink, LaunchPad, LaunchPadStanding
 from utils.types import LaunchPadRoles
 from utils.utils import DateTimeUtils
+from .launchpad_helper import LaunchpadStandings
 
 class LaunchPadIDSerializer(serializers.ModelSerializer):
     class Meta:
@@ -25,49 +25,16 @@ class LaunchPadRankSerializer(serializers.ModelSerializer):
         fields = ['launchpad_rank']
         
     def get_rank(self, obj):
-        total_karma_subquery = KarmaActivityLog.objects.filter(
-            user=OuterRef('id'),
-            task__event='launchpad',
-            appraiser_approved=True,
-        ).values('user').annotate(
-            total_karma=Sum('karma')
-        ).values('total_karma')
-
-        intro_task_completed_users = KarmaActivityLog.objects.filter(
-            task__event='launchpad',
-            appraiser_approved=True,
-            task__hashtag='#lp24-introduction',
-        ).values('user')
-
-        users = User.objects.filter(
-            karma_activity_log_user__task__event="launchpad",
-            karma_activity_log_user__appraiser_approved=True,
-            id__in=intro_task_completed_users
-        ).annotate(
-            karma=Subquery(total_karma_subquery, output_field=IntegerField()),
-            time_=Max("karma_activity_log_user__created_at"),
-        ).order_by("-karma", "time_")
-        
-        # high complexity
-        rank = 0
-        for data in users:
-            rank += 1
-            if data.id == obj.id:
-                break    
-        
-        return rank
+        return LaunchpadStandings.get_rank(obj.id)
     
 class LaunchpadLeaderBoardSerializer(serializers.ModelSerializer):
-    rank = serializers.IntegerField()
-    karma = serializers.IntegerField()
-    actual_karma = serializers.IntegerField(source="wallet_user.karma", default=None)
-    org = serializers.CharField(allow_null=True, allow_blank=True)
-    district_name = serializers.CharField(allow_null=True, allow_blank=True)
-    state = serializers.CharField(allow_null=True, allow_blank=True)
-    launchpad_id = LaunchPadIDSerializer(source='launchpad_user.first', read_only=True)
+    rank = serializers.IntegerField(source="position")
+    full_name = serializers.CharField(source="user.full_name")
+    actual_karma = serializers.IntegerField(source="user.wallet_user.karma", default=None)
+    launchpad_id = LaunchPadIDSerializer(source='user.launchpad_user.first', read_only=True)
 
     class Meta:
-        model = User
+        model = LaunchPadStanding
         fields = ("rank", "full_name", "actual_karma", "karma", "org", "district_name", "state","launchpad_id")
         
 
@@ -14,6 +14,8 @@ urlpatterns = [
     path('user-profile/', launchpad_views.UserProfile.as_view()),
     path('user-college-data/', launchpad_views.UserBasedCollegeData.as_view()),
     path('bulk-user-college-link/', launchpad_views.BulkLaunchpadUser.as_view()),
+    path('bulk-user-college-link/jobs/<str:job_id>/', launchpad_views.BulkLaunchpadUserJob.as_view()),
+    path('bulk-user-college-link/jobs/<str:job_id>/errors/', launchpad_views.BulkLaunchpadUserErrorSheet.as_view()),
     path('list-participants-admin/', launchpad_views.LaunchPadListAdmin.as_view()),
     path('user-details/<str:launchpad_id>/', launchpad_views.UserProfileAPI.as_view()),
     path('socials/<str:launchpad_id>/', launchpad_views.GetSocialsAPI.as_view()),
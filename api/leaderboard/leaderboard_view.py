@@ -4,9 +4,11 @@ from rest_framework.views import APIView
 from . import serializers
 
 from db.organization import Organization, UserOrganizationLink
+from db.task import MonthlyKarma
 from db.user import User
+from utils.leaderboard import KarmaLeaderboard, MonthlyKarmaRollup
 from utils.response import CustomResponse
-from utils.types import OrganizationType, RoleType
+from utils.types import KarmaLeaderboardType, OrganizationType, RoleType
 from utils.utils import DateTimeUtils
 
 
@@ -29,7 +31,9 @@ class StudentsLeaderboard(APIView):
                     to_attr="colleges",
                 )
             )
-            .order_by("-wallet_user__karma")[:20]
+        )
+        students_leaderboard = KarmaLeaderboard.get_top_users(
+            KarmaLeaderboardType.STUDENT.value, students_leaderboard, 20
         )
         serialized_students_leaderboard = serializers.StudentLeaderboardSerializer(
             students_leaderboard, many=True
@@ -44,30 +48,18 @@ class StudentsMonthlyLeaderboard(APIView):
     def get(self, request):
         start_date, end_date = DateTimeUtils.get_start_and_end_of_previous_month()
         student_monthly_leaderboard = (
-            User.objects.filter(
-                user_role_link_user__role__title=RoleType.STUDENT.value,
-                user_organization_link_user__org__org_type=OrganizationType.COLLEGE.value,
-                exist_in_guild=True,
-            )
-            .annotate(
-                institution=F("user_organization_link_user__org__title"),
-                total_karma=Coalesce(
-                    Sum(
-                        "karma_activity_log_user__karma",
-                        filter=Q(
-                            karma_activity_log_user__created_at__range=(
-                                start_date,
-                                end_date,
-                            )
-                        ),
-                    ),
-                    Value(0),
-                ),
+            MonthlyKarma.objects.filter(
+                month=MonthlyKarmaRollup.get_month(start_date),
+                org__org_type=OrganizationType.COLLEGE.value,
+                user__user_role_link_user__role__title=RoleType.STUDENT.value,
+                user__exist_in_guild=True,
             )
+            .values("user_id", "org_id")
+            .annotate(total_karma=Sum("karma"))
             .values(
-                "full_name",
                 "total_karma",
-                "institution",
+                full_name=F("user__full_name"),
+                institution=F("org__title"),
             )
             .order_by("-total_karma")[:20]
         )
@@ -101,31 +93,16 @@ class CollegeMonthlyLeaderboard(APIView):
     def get(self, request):
         start_date, end_date = DateTimeUtils.get_start_and_end_of_previous_month()
         college_monthly_leaderboard = (
-            Organization.objects.filter(
-                org_type=OrganizationType.COLLEGE.value,
-                user_organization_link_org__user__karma_activity_log_user__created_at__range=(
-                    start_date,
-                    end_date,
-                ),
-                user_organization_link_org__user__karma_activity_log_user__appraiser_approved=True,
+            MonthlyKarma.objects.filter(
+                month=MonthlyKarmaRollup.get_month(start_date),
+                org__org_type=OrganizationType.COLLEGE.value,
             )
+            .values("org_id")
             .annotate(
-                total_karma=Coalesce(
-                    Sum(
-                        "user_organization_link_org__user__karma_activity_log_user__karma",
-                        filter=Q(
-                            user_organization_link_org__user__karma_activity_log_user__created_at__range=(
-                                start_date,
-                                end_date,
-                            )
-                        ),
-                    ),
-                    Value(0),
-                ),
-                students=Count("user_organization_link_org__user", distinct=True),
-                institution=F("title"),
+                total_karma=Sum("karma"),
+                students=Count("user_id", distinct=True),
             )
-            .values("code", "total_karma", "students")
+            .values("total_karma", "students", code=F("org__code"))
             .order_by("-total_karma")[:20]
         )
 
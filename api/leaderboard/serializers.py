@@ -1,13 +1,9 @@
-from datetime import timedelta
-
-from django.db.models import Sum
 from rest_framework import serializers
 
 from db.organization import UserOrganizationLink
-from db.task import KarmaActivityLog
 from db.user import User
-from utils.types import OrganizationType
-from utils.utils import DateTimeUtils
+from utils.leaderboard import KarmaAggregateTree
+from utils.types import KarmaAggregateLevel
 
 
 class CampusDetailsSerializer(serializers.ModelSerializer):
@@ -33,47 +29,27 @@ class CampusDetailsSerializer(serializers.ModelSerializer):
             "rank",
         ]
 
+    def _get_aggregate(self, obj):
+        if not hasattr(self, "aggregate"):
+            self.aggregate = KarmaAggregateTree.get_aggregate(
+                KarmaAggregateLevel.ORG.value, obj.org_id
+            )
+        return self.aggregate
+
     def get_total_members(self, obj):
-        return obj.org.user_organization_link_org.count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.member_count if aggregate else 0
 
     def get_active_members(self, obj):
-        last_month = DateTimeUtils.get_current_utc_time() - timedelta(days=30)
-        return obj.org.user_organization_link_org.filter(
-            verified=True,
-            user__wallet_user__isnull=False,
-            user__wallet_user__created_at__gte=last_month,
-        ).count()
+        aggregate = self._get_aggregate(obj)
+        return aggregate.active_members if aggregate else 0
 
     def get_total_karma(self, obj):
-        return (
-            obj.org.user_organization_link_org.filter(
-                org__org_type=OrganizationType.COLLEGE.value,
-                verified=True,
-                user__wallet_user__isnull=False,
-            ).aggregate(total_karma=Sum("user__wallet_user__karma"))["total_karma"]
-            or 0
-        )
+        aggregate = self._get_aggregate(obj)
+        return aggregate.total_karma if aggregate else 0
 
     def get_rank(self, obj):
-        org_karma_dict = (
-            UserOrganizationLink.objects.all()
-            .values("org")
-            .annotate(total_karma=Sum("user__wallet_user__karma"))
-        )
-
-        rank_dict = {
-            data["org"]: data["total_karma"] if data["total_karma"] is not None else 0
-            for data in org_karma_dict
-        }
-
-        sorted_rank_dict = dict(
-            sorted(rank_dict.items(), key=lambda x: x[1], reverse=True)
-        )
-
-        if obj.org.id in sorted_rank_dict:
-            keys_list = list(sorted_rank_dict.keys())
-            position = keys_list.index(obj.org.id)
-            return position + 1
+        return KarmaAggregateTree.get_rank(self._get_aggregate(obj))
 
 
 class StudentLeaderboardSerializer(serializers.ModelSerializer):
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+from rest_framework.utils.encoders import JSONEncoder
+
+from db.task import KarmaActivityLog
+from utils.leaderboard import get_log_task
+
+TOP100_EVENT = "TOP100"
+
+LEADERBOARD_QUERY = """
+        SELECT
+        u.id,
+        u.full_name,
+        u.profile_pic,
+        SUM(kal.karma) AS total_karma,
+        COALESCE(org.title, comm.title) AS org,
+        COALESCE(org.dis, d.name) AS dis,
+        COALESCE(org.state, s.name) AS state,
+        MAX(kal.created_at) AS time_
+        FROM karma_activity_log AS kal
+        INNER JOIN user AS u ON kal.user_id = u.id
+        INNER JOIN task_list AS tl ON tl.id = kal.task_id
+        LEFT JOIN (
+            SELECT
+                uol.user_id,
+                org.id,
+                org.title AS title,
+                d.name dis,
+                s.name state
+            FROM user_organization_link AS uol
+            INNER JOIN organization AS org ON org.id = uol.org_id AND org.org_type IN ('College', 'School', 'Company')
+            LEFT JOIN district AS d ON d.id = org.district_id
+            LEFT JOIN zone AS z ON z.id = d.zone_id
+            LEFT JOIN state AS s ON s.id = z.state_id
+            GROUP BY uol.user_id
+            ) AS org ON org.user_id = u.id
+            LEFT JOIN (SELECT
+                uol.user_id,
+                org.id,
+                org.title AS title
+            FROM user_organization_link AS uol
+            INNER JOIN organization AS org ON org.id = uol.org_id AND org.org_type IN ('Community')
+            GROUP BY uol.user_id) AS comm ON comm.user_id = u.id
+            LEFT JOIN district AS d ON d.id = u.district_id
+            LEFT JOIN zone AS z ON d.zone_id = z.id
+            LEFT JOIN state AS s ON z.state_id = s.id
+            WHERE
+                tl.event = 'TOP100' AND
+                kal.appraiser_approved = TRUE
+                AND u.id IN (select user_id from karma_activity_log as kal
+            INNER JOIN task_list AS tl ON tl.id = kal.task_id
+            WHERE tl.hashtag = '#thc-realworld-problem-proposal' AND kal.appraiser_approved = TRUE)
+            GROUP BY u.id
+            ORDER BY total_karma DESC, time_;
+            """
+
+
+class Top100Snapshot:
+    """
+    Versioned TOP100 leaderboard snapshot stored as a Redis list.
+
+    The leaderboard query only runs when a TOP100 karma log is approved
+    (debounced by REFRESH_DELAY) or on the beat schedule. A refresh whose
+    rows differ from the current snapshot writes a new version, so readers
+    can use the version as an ETag and page through a consistent snapshot.
+    """
+
+    VERSION_KEY = "top100:version"
+    CURRENT_KEY = "top100:current"
+    HASH_KEY = "top100:hash"
+    QUEUED_KEY = "top100:refresh_queued"
+    LOCK_KEY = "top100:build_lock"
+    # Seconds a request waits for another one to build the first snapshot
+    BUILD_WAIT = 10
+    # Seconds to coalesce approvals into one refresh
+    REFRESH_DELAY = 30
+    # Seconds a replaced snapshot stays readable for in-flight paginations
+    STALE_SNAPSHOT_TTL = 300
+
+    @staticmethod
+    def get_connection():
+        return get_redis_connection("redis")
+
+    @staticmethod
+    def get_snapshot_key(version: int) -> str:
+        return f"top100:snapshot:{version}"
+
+    @staticmethod
+    def fetch_leaderboard() -> list[dict]:
+        with connection.cursor() as cursor:
+            cursor.execute(LEADERBOARD_QUERY)
+            column_names = [desc[0] for desc in cursor.description]
+            return [dict(zip(column_names, row)) for row in cursor.fetchall()]
+
+    @classmethod
+    def refresh(cls) -> int:
+        """
+        Recomputes the leaderboard and publishes it as a new version,
+        unless its rows are those of the current snapshot.
+
+        Returns:
+            int: The current version.
+        """
+        rows = [
+            json.dumps(row, cls=JSONEncoder) for row in cls.fetch_leaderboard()
+        ]
+        rows_hash = hashlib.sha256("\n".join(rows).encode()).hexdigest()
+        redis = cls.get_connection()
+
+        previous_version, previous_hash = redis.mget(cls.CURRENT_KEY, cls.HASH_KEY)
+        if previous_version is not None and previous_hash == rows_hash.encode():
+            return int(previous_version)
+
+        version = redis.incr(cls.VERSION_KEY)
+        pipeline = redis.pipeline()
+        if rows:
+            pipeline.rpush(cls.get_snapshot_key(version), *rows)
+        pipeline.set(cls.CURRENT_KEY, version)
+        pipeline.set(cls.HASH_KEY, rows_hash)
+        if previous_version is not None:
+            pipeline.expire(
+                cls.get_snapshot_key(int(previous_version)), cls.STALE_SNAPSHOT_TTL
+            )
+        pipeline.execute()
+        return version
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Returns the current snapshot version, building the first snapshot
+        if none exists yet. Concurrent requests wait for one of them to
+        build it.
+        """
+        redis = cls.get_connection()
+        deadline = time.monotonic() + cls.BUILD_WAIT
+        while (version := redis.get(cls.CURRENT_KEY)) is None:
+            if cache.add(cls.LOCK_KEY, True, timeout=cls.BUILD_WAIT * 6):
+                try:
+                    return cls.refresh()
+                finally:
+                    cache.delete(cls.LOCK_KEY)
+            if time.monotonic() > deadline:
+                return cls.refresh()
+            time.sleep(0.1)
+        return int(version)
+
+    @classmethod
+    def get_page(cls, version: int, page: int, per_page: int) -> tuple[list, int]:
+        """
+        Returns one page of a snapshot and the total number of rows in it.
+        """
+        key = cls.get_snapshot_key(version)
+        start = (page - 1) * per_page
+
+        pipeline = cls.get_connection().pipeline()
+        pipeline.lrange(key, start, start + per_page - 1)
+        pipeline.llen(key)
+        rows, count = pipeline.execute()
+        return [json.loads(row) for row in rows], count
+
+    @classmethod
+    def schedule_refresh(cls) -> None:
+        """
+        Queues one refresh for every burst of approvals.
+        """
+        from mu_celery.task import refresh_top100_snapshot
+
+        if cache.add(cls.QUEUED_KEY, True, timeout=cls.REFRESH_DELAY * 2):
+            refresh_top100_snapshot.apply_async(countdown=cls.REFRESH_DELAY)
+
+
+@receiver(post_save, sender=KarmaActivityLog)
+def top100_karma_approved(sender, instance, *args, **kwargs):
+    if not instance.appraiser_approved:
+        return
+    if get_log_task(instance)["event"] == TOP100_EVENT:
+        transaction.on_commit(Top100Snapshot.schedule_refresh)
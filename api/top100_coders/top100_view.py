@@ -1,61 +1,45 @@
-from django.db import connection
+import math
+
+from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from utils.response import CustomResponse
+from .top100_helper import Top100Snapshot
+
+MAX_PER_PAGE = 100
 
 
 class Leaderboard(APIView):
     def get(self, request):
-        query = """
-        SELECT 
-        u.id,
-        u.full_name, 
-        u.profile_pic,
-        SUM(kal.karma) AS total_karma,
-        COALESCE(org.title, comm.title) AS org,
-        COALESCE(org.dis, d.name) AS dis,
-        COALESCE(org.state, s.name) AS state,
-        MAX(kal.created_at) AS time_
-        FROM karma_activity_log AS kal
-        INNER JOIN user AS u ON kal.user_id = u.id
-        INNER JOIN task_list AS tl ON tl.id = kal.task_id
-        LEFT JOIN (
-            SELECT 
-                uol.user_id, 
-                org.id, 
-                org.title AS title, 
-                d.name dis, 
-                s.name state
-            FROM user_organization_link AS uol
-            INNER JOIN organization AS org ON org.id = uol.org_id AND org.org_type IN ('College', 'School', 'Company')
-            LEFT JOIN district AS d ON d.id = org.district_id
-            LEFT JOIN zone AS z ON z.id = d.zone_id
-            LEFT JOIN state AS s ON s.id = z.state_id
-            GROUP BY uol.user_id 
-            ) AS org ON org.user_id = u.id
-            LEFT JOIN (SELECT 
-                uol.user_id, 
-                org.id, 
-                org.title AS title
-            FROM user_organization_link AS uol
-            INNER JOIN organization AS org ON org.id = uol.org_id AND org.org_type IN ('Community')
-            GROUP BY uol.user_id) AS comm ON comm.user_id = u.id
-            LEFT JOIN district AS d ON d.id = u.district_id
-            LEFT JOIN zone AS z ON d.zone_id = z.id
-            LEFT JOIN state AS s ON z.state_id = s.id
-            WHERE 
-                tl.event = 'TOP100' AND
-                kal.appraiser_approved = TRUE 
-                AND u.id IN (select user_id from karma_activity_log as kal
-            INNER JOIN task_list AS tl ON tl.id = kal.task_id
-            WHERE tl.hashtag = '#thc-realworld-problem-proposal' AND kal.appraiser_approved = TRUE)
-            GROUP BY u.id
-            ORDER BY total_karma DESC, time_;
-            """
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
-            column_names = [desc[0] for desc in cursor.description]
-
-            list_of_dicts = [dict(zip(column_names, row)) for row in results]
-            return CustomResponse(response=list_of_dicts).get_success_response()
+        version = Top100Snapshot.get_version()
+        etag = f'"top100-{version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        try:
+            page = max(int(request.query_params.get("pageIndex", 1)), 1)
+            per_page = min(
+                max(int(request.query_params.get("perPage", MAX_PER_PAGE)), 1),
+                MAX_PER_PAGE,
+            )
+        except ValueError:
+            return CustomResponse(
+                general_message="Invalid page index or page size"
+            ).get_failure_response()
+
+        data, count = Top100Snapshot.get_page(version, page, per_page)
+        total_pages = max(math.ceil(count / per_page), 1)
+
+        response = CustomResponse().paginated_response(
+            data=data,
+            pagination={
+                "count": count,
+                "totalPages": total_pages,
+                "isNext": page < total_pages,
+                "isPrev": page > 1,
+                "nextPage": page + 1 if page < total_pages else None,
+            },
+        )
+        response["ETag"] = etag
+        return response
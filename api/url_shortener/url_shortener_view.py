@@ -58,7 +58,7 @@ class UrlShortenerAPI(APIView):
             },
         )
 
-        if len(url_shortener_objects) == 0:
+        if not url_shortener_objects.exists():
             return CustomResponse(
                 general_message="No URL related data available"
             ).get_failure_response()
@@ -0,0 +1,26 @@
+from django.db import models
+
+from db.user import User
+
+
+class ImportJob(models.Model):
+    id = models.CharField(primary_key=True, max_length=36)
+    import_type = models.CharField(max_length=50)
+    file_path = models.CharField(max_length=255)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=20)
+    total_rows = models.IntegerField(null=True)
+    processed_rows = models.IntegerField(default=0)
+    success_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    error_file_path = models.CharField(max_length=255, null=True)
+    error = models.TextField(null=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, db_column="created_by", null=True,
+                                   related_name="import_job_created_by")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "import_job"
@@ -0,0 +1,25 @@
+from django.db import models
+
+from db.user import User
+
+
+class ExportJob(models.Model):
+    id = models.CharField(primary_key=True, max_length=36)
+    export_type = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    dedupe_key = models.CharField(max_length=64)
+    status = models.CharField(max_length=20)
+    rows_written = models.IntegerField(default=0)
+    total_rows = models.IntegerField(null=True)
+    file_path = models.CharField(max_length=255, null=True)
+    error = models.TextField(null=True)
+    attempts = models.IntegerField(default=0)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, db_column="created_by",
+                                   related_name="export_job_created_by")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "export_job"
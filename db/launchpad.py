@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.conf import settings
 from db.user import User
@@ -44,4 +46,19 @@ class LaunchPad(models.Model):
 
     class Meta:
         managed = False
-        db_table = 'launchpad'
\ No newline at end of file
+        db_table = 'launchpad'
+
+class LaunchPadStanding(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="launchpad_standing_user")
+    karma = models.IntegerField(default=0)
+    last_karma_at = models.DateTimeField()
+    position = models.IntegerField(blank=True, null=True)
+    org = models.CharField(max_length=100, blank=True, null=True)
+    district_name = models.CharField(max_length=75, blank=True, null=True)
+    state = models.CharField(max_length=75, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = 'launchpad_standing'
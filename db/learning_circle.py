@@ -42,6 +42,29 @@ class UserCircleLink(models.Model):
         managed = False
         db_table = "user_circle_link"
 
+class CircleKarma(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    circle = models.OneToOneField(LearningCircle, on_delete=models.CASCADE, related_name="circle_karma_circle")
+    ig = models.ForeignKey(InterestGroup, on_delete=models.CASCADE, related_name="circle_karma_ig")
+    total_karma = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = "circle_karma"
+
+class CircleChatMessage(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    circle = models.ForeignKey(LearningCircle, on_delete=models.CASCADE, related_name="circle_chat_message_circle")
+    room_name = models.CharField(max_length=100)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="circle_chat_message_user")
+    message = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "circle_chat_message"
+
 class CircleMeetingLog(models.Model):
     MODE_CHOICES = (
         ("online", "Online"),
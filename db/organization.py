@@ -220,6 +220,24 @@ class OrgKarmaLog(models.Model):
         return self.org.district
 
 
+class KarmaAggregate(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    level = models.CharField(max_length=10)
+    entity_id = models.CharField(max_length=36)
+    parent_id = models.CharField(max_length=36, blank=True, null=True)
+    total_karma = models.BigIntegerField(default=0)
+    member_count = models.IntegerField(default=0)
+    active_members = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = 'karma_aggregate'
+        constraints = [
+            models.UniqueConstraint(fields=['level', 'entity_id'], name="KarmaAggregateEntity")
+        ]
+
+
 class UnverifiedOrganization(models.Model):
     id = models.CharField(primary_key=True, max_length=36, default=lambda:str(uuid.uuid4()))
     title = models.CharField(max_length=100)
@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    id = models.CharField(primary_key=True, max_length=36)
+    entity = models.CharField(max_length=30)
+    entity_id = models.CharField(max_length=36)
+    content = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = "search_document"
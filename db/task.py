@@ -175,6 +175,20 @@ class KarmaActivityLog(models.Model):
         db_table = "karma_activity_log"
 
 
+class MonthlyKarma(models.Model):
+    id = models.CharField(primary_key=True, max_length=36, default=uuid.uuid4)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="monthly_karma_user")
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, blank=True, null=True,
+                            related_name="monthly_karma_org")
+    month = models.DateField()
+    karma = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = "monthly_karma"
+
+
 class MucoinActivityLog(models.Model):
     id = models.CharField(primary_key=True, max_length=36)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mucoin_activity_log_user")
@@ -237,6 +251,10 @@ class VoucherLog(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET(settings.SYSTEM_ADMIN_ID), db_column="created_by",
                                    related_name="voucher_log_created_by")
     created_at = models.DateTimeField(auto_now_add=True)
+    mail_status = models.CharField(max_length=20, null=True)
+    mail_attempts = models.IntegerField(default=0)
+    mail_error = models.TextField(null=True)
+    mailed_at = models.DateTimeField(null=True)
 
     class Meta:
         managed = False
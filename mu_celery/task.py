@@ -1,5 +1,14 @@
 from celery import shared_task
-from utils.utils import send_template_mail
+from django.core.cache import cache
+from utils.leaderboard import (
+    InterestGroupLeaderboard,
+    KarmaAggregateTree,
+    KarmaDistribution,
+    KarmaLeaderboard,
+    LearningCircleKarma,
+    MonthlyKarmaRollup,
+)
+from utils.utils import DateTimeUtils, send_template_mail
 import requests
 from decouple import config
 from db.user import User
@@ -13,6 +22,147 @@ def send_email(context: dict, subject: str, address: list[str], attachment: str
     return send_template_mail(context, subject, address, attachment)
 
 
+@shared_task
+def refresh_monthly_karma():
+    # Picks up karma written straight to the database by the discord bot
+    MonthlyKarmaRollup.backfill(DateTimeUtils.get_current_utc_time())
+
+
+@shared_task
+def rebuild_karma_leaderboard():
+    # Picks up karma written straight to the database by the discord bot
+    KarmaLeaderboard.rebuild()
+
+
+@shared_task
+def rebuild_karma_aggregates():
+    KarmaAggregateTree.rebuild()
+
+
+@shared_task
+def refresh_karma_distribution():
+    KarmaDistribution.refresh()
+
+
+@shared_task
+def rebuild_ig_leaderboards():
+    # Picks up karma written straight to the database by the discord bot
+    InterestGroupLeaderboard.rebuild()
+
+
+@shared_task
+def rebuild_circle_karma():
+    LearningCircleKarma.rebuild()
+
+
+@shared_task
+def refresh_top100_snapshot():
+    from api.top100_coders.top100_helper import Top100Snapshot
+
+    cache.delete(Top100Snapshot.QUEUED_KEY)
+    Top100Snapshot.refresh()
+
+
+@shared_task
+def rerank_launchpad_standings():
+    from api.launchpad.launchpad_helper import LaunchpadStandings
+
+    cache.delete(LaunchpadStandings.QUEUED_KEY)
+    LaunchpadStandings.rerank()
+
+
+@shared_task
+def rebuild_launchpad_standings():
+    # Picks up karma written straight to the database by the discord bot
+    from api.launchpad.launchpad_helper import LaunchpadStandings
+
+    LaunchpadStandings.rebuild()
+
+
+@shared_task
+def flush_landing_stats():
+    from api.common.common_consumer import landing_stats
+
+    landing_stats.flush()
+
+
+@shared_task
+def reconcile_landing_stats():
+    from api.common.common_consumer import landing_stats
+
+    landing_stats.reconcile()
+
+
+@shared_task
+def flush_lc_chat_messages():
+    from api.dashboard.lc.dash_lc_chat_helper import LcChatStore
+
+    LcChatStore.flush()
+
+
+@shared_task
+def flush_search_index():
+    from utils.search import SearchIndex
+
+    SearchIndex.flush()
+
+
+@shared_task
+def rebuild_search_index():
+    from utils.search import SearchIndex
+
+    SearchIndex.rebuild_all()
+
+
+@shared_task
+def run_export_job(job_id: str):
+    from api.dashboard.export.export_helper import ExportJobs
+
+    ExportJobs.run(job_id)
+
+
+@shared_task
+def purge_export_jobs():
+    from api.dashboard.export.export_helper import ExportJobs
+
+    ExportJobs.purge_expired()
+
+
+@shared_task
+def requeue_export_jobs():
+    from api.dashboard.export.export_helper import ExportJobs
+
+    ExportJobs.requeue_stale()
+
+
+@shared_task
+def run_import_job(job_id: str):
+    from utils.bulk_import import ImportJobs
+
+    ImportJobs.run(job_id)
+
+
+@shared_task
+def purge_import_jobs():
+    from utils.bulk_import import ImportJobs
+
+    ImportJobs.purge_expired()
+
+
+@shared_task
+def send_voucher_mails(voucher_ids: list[str], attempt: int = 1):
+    from api.dashboard.karma_voucher.karma_voucher_helper import VoucherMails
+
+    VoucherMails.send(voucher_ids, attempt)
+
+
+@shared_task
+def requeue_voucher_mails():
+    from api.dashboard.karma_voucher.karma_voucher_helper import VoucherMails
+
+    VoucherMails.requeue_stale()
+
+
 @shared_task
 def onboard_user(access_token: str, user_id: int):
     user = User.objects.get(id=user_id)
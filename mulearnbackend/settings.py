@@ -136,6 +136,64 @@ CACHES = {
 
 CELERY_BROKER_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/2"
 CELERY_RESULT_BACKEND = f"redis://{REDIS_HOST}:{REDIS_PORT}/2"
+CELERY_BEAT_SCHEDULE = {
+    "refresh-monthly-karma": {
+        "task": "mu_celery.task.refresh_monthly_karma",
+        "schedule": 15 * 60,
+    },
+    "rebuild-karma-leaderboard": {
+        "task": "mu_celery.task.rebuild_karma_leaderboard",
+        "schedule": 15 * 60,
+    },
+    "rebuild-karma-aggregates": {
+        "task": "mu_celery.task.rebuild_karma_aggregates",
+        "schedule": 30 * 60,
+    },
+    "refresh-karma-distribution": {
+        "task": "mu_celery.task.refresh_karma_distribution",
+        "schedule": 10 * 60,
+    },
+    "rebuild-ig-leaderboards": {
+        "task": "mu_celery.task.rebuild_ig_leaderboards",
+        "schedule": 30 * 60,
+    },
+    "rebuild-circle-karma": {
+        "task": "mu_celery.task.rebuild_circle_karma",
+        "schedule": 30 * 60,
+    },
+    "reconcile-landing-stats": {
+        "task": "mu_celery.task.reconcile_landing_stats",
+        "schedule": 10 * 60,
+    },
+    "refresh-top100-snapshot": {
+        "task": "mu_celery.task.refresh_top100_snapshot",
+        "schedule": 10 * 60,
+    },
+    "rebuild-launchpad-standings": {
+        "task": "mu_celery.task.rebuild_launchpad_standings",
+        "schedule": 15 * 60,
+    },
+    "rebuild-search-index": {
+        "task": "mu_celery.task.rebuild_search_index",
+        "schedule": 6 * 60 * 60,
+    },
+    "purge-export-jobs": {
+        "task": "mu_celery.task.purge_export_jobs",
+        "schedule": 60 * 60,
+    },
+    "requeue-export-jobs": {
+        "task": "mu_celery.task.requeue_export_jobs",
+        "schedule": 10 * 60,
+    },
+    "purge-import-jobs": {
+        "task": "mu_celery.task.purge_import_jobs",
+        "schedule": 60 * 60,
+    },
+    "requeue-voucher-mails": {
+        "task": "mu_celery.task.requeue_voucher_mails",
+        "schedule": 15 * 60,
+    },
+}
 
 # Use the Redis cache as the default cache
 CACHES["default"] = CACHES["redis"]
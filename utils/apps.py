@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utils'
+
+    def ready(self):
+        # Connects the signal receivers that keep the karma and search
+        # indexes current
+        from . import leaderboard  # noqa: F401
+        from . import search  # noqa: F401
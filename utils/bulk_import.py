@@ -0,0 +1,256 @@
+import copy
+import itertools
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+import openpyxl
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from db.bulk_import import ImportJob
+from utils.types import JobStatus
+from utils.utils import DateTimeUtils, ImportCSV
+
+# Import type: dotted path of the BulkImporter that writes its rows
+IMPORTERS = {
+    "vouchers": "api.dashboard.karma_voucher.karma_voucher_helper.VoucherLogImporter",
+    "tasks": "api.dashboard.task.dash_task_helper.TaskListImporter",
+    "organisations": "api.dashboard.organisation.organisation_helper.OrganisationImporter",
+    "user-roles": "api.dashboard.roles.dash_roles_helper.UserRoleImporter",
+    "launchpad-users": "api.launchpad.launchpad_helper.LaunchpadUserImporter",
+}
+
+
+class BulkImporter(ABC):
+    """
+    Validates and writes the rows of one import type. An instance lives for
+    a whole job, so state such as the keys already imported carries over
+    from one chunk to the next.
+    """
+
+    required_headers = []
+
+    def __init__(self, job: ImportJob):
+        self.job = job
+        self.user_id = job.created_by_id
+        self.params = job.params
+
+    @abstractmethod
+    def process_chunk(self, rows: list[dict]) -> dict[int, str]:
+        """
+        Writes the valid rows of a chunk. Runs inside the chunk's
+        transaction, so side effects such as mails belong in
+        `transaction.on_commit`.
+
+        Returns:
+            dict: The error of each rejected row, by its index in `rows`.
+        """
+
+    def get_state(self) -> dict:
+        """
+        Returns a copy of the state carried from one chunk to the next, to
+        restore with `set_state` when a chunk rolls back.
+        """
+        return copy.deepcopy(
+            {name: value for name, value in vars(self).items() if name != "job"}
+        )
+
+    def set_state(self, state: dict) -> None:
+        vars(self).update(state)
+
+    @classmethod
+    def get_error_message(cls, errors) -> str:
+        """
+        Flattens serializer errors into one line of the error sheet.
+        """
+        if isinstance(errors, dict):
+            return "; ".join(
+                f"{field}: {cls.get_error_message(error)}"
+                for field, error in errors.items()
+            )
+        if isinstance(errors, list):
+            return ", ".join(cls.get_error_message(error) for error in errors)
+        return str(errors)
+
+    def save_rows(self, serializer_class, rows: dict[int, dict]):
+        """
+        Saves the rows that pass `serializer_class` and reports the others.
+
+        Returns:
+            tuple: The errors by row index, and the saved list serializer.
+        """
+        serializer = serializer_class(data=list(rows.values()), many=True)
+        if serializer.is_valid():
+            serializer.save()
+            return {}, serializer
+
+        errors = {
+            index: self.get_error_message(error)
+            for index, error in zip(rows, serializer.errors)
+            if error
+        }
+        serializer = serializer_class(
+            data=[row for index, row in rows.items() if index not in errors],
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return errors, serializer
+
+
+class ImportJobs:
+    """
+    Runs bulk sheet imports in Celery instead of the web request.
+
+    The upload is stored under MEDIA_ROOT and read back CHUNK_SIZE rows at
+    a time, each chunk written in its own transaction so a failure only
+    rejects that chunk's rows. Progress is saved after every chunk, and the
+    rejected rows are written to an error sheet in the upload's format, so
+    it can be fixed and uploaded again.
+    """
+
+    IMPORT_DIR = "imports"
+    CHUNK_SIZE = 500
+    # Seconds a job and its files are kept
+    ARTIFACT_TTL = 24 * 60 * 60
+
+    @staticmethod
+    def get_importer_class(import_type: str) -> type[BulkImporter]:
+        return import_string(IMPORTERS[import_type])
+
+    @staticmethod
+    def get_file_path(file_path: str) -> str:
+        return os.path.join(settings.MEDIA_ROOT, file_path)
+
+    @classmethod
+    def request(cls, import_type: str, file_obj, user_id: str = None, params: dict = None) -> ImportJob:
+        """
+        Stores the upload and queues its import.
+
+        Raises:
+            ValueError: If the sheet is empty or misses a required header.
+        """
+        headers, rows = ImportCSV().read_rows(file_obj)
+        rows.close()
+        if not headers:
+            raise ValueError("Empty csv file.")
+        for key in cls.get_importer_class(import_type).required_headers:
+            if key not in headers:
+                raise ValueError(f"{key} does not exist in the file.")
+
+        job_id = str(uuid.uuid4())
+        extension = ".csv" if ImportCSV.is_csv(file_obj) else ".xlsx"
+        file_path = os.path.join(cls.IMPORT_DIR, f"{job_id}{extension}")
+        absolute_path = cls.get_file_path(file_path)
+
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+        file_obj.seek(0)
+        with open(absolute_path, "wb") as import_file:
+            for chunk in file_obj.chunks():
+                import_file.write(chunk)
+
+        job = ImportJob.objects.create(
+            id=job_id,
+            import_type=import_type,
+            file_path=file_path,
+            params=params or {},
+            status=JobStatus.PENDING.value,
+            created_by_id=user_id,
+        )
+
+        from mu_celery.task import run_import_job
+
+        transaction.on_commit(lambda: run_import_job.delay(job_id))
+        return job
+
+    @staticmethod
+    def process_chunk(importer: BulkImporter, rows: list[dict]) -> dict[int, str]:
+        state = importer.get_state()
+        try:
+            with transaction.atomic():
+                # Importers annotate their rows; the originals go to the error sheet
+                return importer.process_chunk([dict(row) for row in rows])
+        except Exception as e:
+            # Forgets the keys of the rolled back rows, so a later chunk
+            # does not report them as duplicates
+            importer.set_state(state)
+            return {index: str(e) for index in range(len(rows))}
+
+    @classmethod
+    def run(cls, job_id: str) -> None:
+        # Claims the job in one statement, so a redelivered task finds it
+        # already running
+        if not ImportJob.objects.filter(
+            id=job_id, status=JobStatus.PENDING.value
+        ).update(status=JobStatus.RUNNING.value):
+            return
+
+        jobs = ImportJob.objects.filter(id=job_id)
+        job = jobs.get()
+        error_file_path = os.path.join(cls.IMPORT_DIR, f"{job.id}-errors.xlsx")
+        error_workbook = None
+        processed_rows = success_count = error_count = 0
+
+        try:
+            importer = cls.get_importer_class(job.import_type)(job)
+            with open(cls.get_file_path(job.file_path), "rb") as import_file:
+                _, rows = ImportCSV().read_rows(import_file)
+                jobs.update(total_rows=sum(1 for _ in rows))
+
+                headers, rows = ImportCSV().read_rows(import_file)
+                headers = [header for header in headers if header is not None]
+                while chunk := list(itertools.islice(rows, cls.CHUNK_SIZE)):
+                    errors = cls.process_chunk(importer, chunk)
+
+                    if errors and error_workbook is None:
+                        error_workbook = openpyxl.Workbook(write_only=True)
+                        error_sheet = error_workbook.create_sheet()
+                        error_sheet.append([*headers, "error"])
+                    for index, error in sorted(errors.items()):
+                        error_sheet.append(
+                            [*(chunk[index].get(header) for header in headers), error]
+                        )
+
+                    processed_rows += len(chunk)
+                    success_count += len(chunk) - len(errors)
+                    error_count += len(errors)
+                    jobs.update(
+                        processed_rows=processed_rows,
+                        success_count=success_count,
+                        error_count=error_count,
+                    )
+
+            if error_workbook is not None:
+                error_workbook.save(cls.get_file_path(error_file_path))
+        except Exception as e:
+            jobs.update(status=JobStatus.FAILED.value, error=str(e))
+            return
+
+        os.remove(cls.get_file_path(job.file_path))
+        jobs.update(
+            status=JobStatus.COMPLETED.value,
+            error_file_path=error_file_path if error_workbook is not None else None,
+            completed_at=DateTimeUtils.get_current_utc_time(),
+        )
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        """
+        Deletes jobs older than ARTIFACT_TTL and their files.
+
+        Returns:
+            int: The number of jobs deleted.
+        """
+        expired_jobs = ImportJob.objects.filter(
+            created_at__lt=DateTimeUtils.get_current_utc_time()
+            - timedelta(seconds=cls.ARTIFACT_TTL)
+        )
+        for file_paths in expired_jobs.values_list("file_path", "error_file_path"):
+            for file_path in file_paths:
+                if file_path and os.path.exists(absolute_path := cls.get_file_path(file_path)):
+                    os.remove(absolute_path)
+        deleted, _ = expired_jobs.delete()
+        return deleted
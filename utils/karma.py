@@ -1,8 +1,11 @@
 import uuid
 from db.task import KarmaActivityLog, TaskList, Wallet
 from db.user import User
+from utils.leaderboard import KarmaAggregateTree, KarmaLeaderboard
 from utils.utils import DateTimeUtils
+from django.db import transaction
 from django.db.models import F
+from django.db.models.signals import post_save
 
 
 def add_karma(
@@ -20,7 +23,7 @@ def add_karma(
         if count != len(user_id):
             return False
         user_ids = user_id
-        KarmaActivityLog.objects.bulk_create(
+        karma_logs = KarmaActivityLog.objects.bulk_create(
             [
                 KarmaActivityLog(
                     id=str(uuid.uuid4()),
@@ -45,6 +48,23 @@ def add_karma(
             karma_last_updated_at=DateTimeUtils.get_current_utc_time(),
             updated_at=DateTimeUtils.get_current_utc_time(),
         )
+        # bulk_create and update() send no signals; run the receivers the
+        # single path triggers, which defer their work to on_commit
+        for karma_log in karma_logs:
+            post_save.send(
+                sender=KarmaActivityLog,
+                instance=karma_log,
+                created=True,
+                raw=False,
+                using=karma_log._state.db,
+                update_fields=None,
+            )
+
+        def refresh_wallets():
+            KarmaLeaderboard.update_users(user_ids)
+            KarmaAggregateTree.apply_karma_delta(user_ids, karma)
+
+        transaction.on_commit(refresh_wallets)
     else:
         if not User.objects.filter(id=user_id).exists():
             return False
@@ -1,13 +1,58 @@
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional
 
+from django.db.models import IntegerField, Max
+from django.db.models.functions import Cast, Substr
+from django_redis import get_redis_connection
 from PIL import Image, ImageDraw, ImageFont
 
 import time
 
+from db.task import VoucherLog
+
 image_location = './api/dashboard/karma_voucher/assets/karmacard.png'
 font_location =  './api/dashboard/karma_voucher/fonts/Roboto-Light.ttf'
 
+# field: (position, font size) of each text drawn on the card
+VOUCHER_LAYOUT = {
+    'name': ((135, 250), 60),
+    'hashtag': ((135, 450), 45),
+    'karma': ((920, 135), 45),
+    'code': ((135, 135), 20),
+    'month': ((135, 375), 30),
+}
+
+
+@lru_cache(maxsize=None)
+def get_voucher_template():
+    image = Image.open(image_location)
+    image.load()
+    return image.convert('RGB')
+
+
+@lru_cache(maxsize=None)
+def get_voucher_font(size):
+    return ImageFont.truetype(font_location, size=size)
+
+
+def render_karma_voucher(voucher):
+    """
+    Draws a voucher on the cached card template
+    :param voucher: dict of name, hashtag, karma, code and month
+    :return: the JPEG image
+    """
+    image = get_voucher_template().copy()
+    draw = ImageDraw.Draw(image)
+    for field, (position, font_size) in VOUCHER_LAYOUT.items():
+        draw.text(position, voucher[field], fill=(255, 255, 255), font=get_voucher_font(font_size))
+
+    image_data = BytesIO()
+    image.save(image_data, format='JPEG')
+    image_data.seek(0)
+    return image_data
+
+
 def generate_karma_voucher(name, hashtag, karma, code, month):
     """
     Generate a karma voucher for the given users
@@ -17,47 +62,50 @@ def generate_karma_voucher(name, hashtag, karma, code, month):
     :param code:
     :param month:
     :return:
-    """   
+    """
+    return render_karma_voucher(
+        {'name': name, 'hashtag': hashtag, 'karma': karma, 'code': code, 'month': month}
+    )
 
 
-    image = Image.open(image_location)
-    image = image.convert('RGB')
+VOUCHER_SEQUENCE_KEY = 'voucher:code_sequence:{prefix}'
+# Keeps a day's sequence past midnight in every timezone
+VOUCHER_SEQUENCE_TTL = 2 * 24 * 60 * 60
 
-    draw = ImageDraw.Draw(image)
-    x = 135
-    y = 250
-    font1 = ImageFont.truetype(font_location, size=60)
-    draw.text((x, y), name, fill=(255, 255, 255), font=font1)
-
-    x1 = 135
-    y1 = 450
-    font2 = ImageFont.truetype(font_location, size=45)
-    draw.text((x1, y1), hashtag, fill=(255, 255, 255), font=font2)
-
-    x2 = 920
-    y2 = 135
-    font3 = ImageFont.truetype(font_location, size=45)
-    draw.text((x2, y2), karma, fill=(255, 255, 255), font=font3)
-
-    x3 = 135
-    y3 = 135
-    font3 = ImageFont.truetype(font_location, size=20)
-    draw.text((x3, y3), code, fill=(255, 255, 255), font=font3)
-
-    x3 = 135
-    y3 = 375
-    font3 = ImageFont.truetype(font_location, size=30)
-    draw.text((x3, y3), month, fill=(255, 255, 255), font=font3)
 
-    image_data = BytesIO()
-    image.save(image_data, format='JPEG')
-    return image_data
+def get_code_prefix():
+    return time.strftime('P%d%m%y')
 
 
-def generate_ordered_id(count):
-    day = time.strftime('%d')
-    month = time.strftime('%m')
-    year = time.strftime('%y')
+def generate_ordered_id(count, prefix=None):
     serial = str(count).zfill(4)
-    ordered_id = f'P{day}{month}{year}{serial}'
+    ordered_id = f'{prefix or get_code_prefix()}{serial}'
     return ordered_id
+
+
+def allocate_voucher_codes(count):
+    """
+    Reserves `count` consecutive voucher codes of today's prefix with one
+    Redis INCRBY. The day's counter starts from the highest serial already
+    issued, so codes never collide with existing vouchers.
+    :param count:
+    :return:
+    """
+    if count <= 0:
+        return []
+
+    prefix = get_code_prefix()
+    key = VOUCHER_SEQUENCE_KEY.format(prefix=prefix)
+    connection = get_redis_connection('redis')
+    if not connection.exists(key):
+        last_serial = VoucherLog.objects.filter(code__startswith=prefix).aggregate(
+            last_serial=Max(Cast(Substr('code', len(prefix) + 1), IntegerField()))
+        )['last_serial'] or 0
+        # Concurrent first allocations seed once and then take separate blocks
+        connection.set(key, last_serial, ex=VOUCHER_SEQUENCE_TTL, nx=True)
+
+    last_serial = connection.incrby(key, count)
+    return [
+        generate_ordered_id(serial, prefix)
+        for serial in range(last_serial - count + 1, last_serial + 1)
+    ]
@@ -0,0 +1,1106 @@
+import bisect
+import datetime
+import math
+import time
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+
+from db.learning_circle import CircleKarma, LearningCircle, UserCircleLink
+from db.organization import (
+    District,
+    KarmaAggregate,
+    Organization,
+    State,
+    UserOrganizationLink,
+    Zone,
+)
+from db.task import InterestGroup, KarmaActivityLog, MonthlyKarma, TaskList, Wallet
+from db.user import User, UserRoleLink
+from utils.types import (
+    KarmaAggregateLevel,
+    KarmaLeaderboardType,
+    OrganizationType,
+    RoleType,
+)
+from utils.utils import DateTimeUtils
+
+
+class KarmaLeaderboard:
+    """
+    Global karma leaderboards kept as Redis sorted sets.
+
+    Every wallet is indexed in the student, mentor and/or enabler board
+    depending on the user's roles, scored by get_score(). Rank, neighbour
+    and top-N lookups are O(log n) instead of loading every wallet from
+    MySQL.
+
+    Karma the discord bot writes straight to MySQL reaches the boards
+    through the periodic rebuild.
+    """
+
+    KEY_PREFIX = "leaderboard:karma"
+    REBUILD_CHUNK_SIZE = 5000
+    # Divides the wallet's update time, in seconds, into the score's
+    # fraction: below 1 until 2286, and still a second apart at 10**6 karma
+    TIME_SCALE = 10**10
+    # Board entries get_top_users reads before leaving a selective filter
+    # to MySQL
+    MAX_SCAN = 2000
+
+    @staticmethod
+    def get_connection():
+        return get_redis_connection("redis")
+
+    @classmethod
+    def get_key(cls, board: str) -> str:
+        return f"{cls.KEY_PREFIX}:{board}"
+
+    @classmethod
+    def get_score(cls, karma: int, updated_at: datetime.datetime | None) -> float:
+        """
+        Returns the score of a wallet: its karma, with ties broken by the
+        latest update first, as the SQL leaderboards ordered them. Wallets
+        updated in the same second are left in member id order.
+        """
+        return karma + (updated_at.timestamp() / cls.TIME_SCALE if updated_at else 0)
+
+    @staticmethod
+    def get_karma(score: float) -> int:
+        return math.floor(score)
+
+    @staticmethod
+    def get_board(roles: list[str]) -> str:
+        """
+        Returns the board a user is ranked on, based on their role titles.
+        """
+        if RoleType.MENTOR.value in roles:
+            return KarmaLeaderboardType.MENTOR.value
+        if RoleType.ENABLER.value in roles:
+            return KarmaLeaderboardType.ENABLER.value
+        return KarmaLeaderboardType.STUDENT.value
+
+    @staticmethod
+    def _get_user_boards(role_links) -> dict:
+        """
+        Maps user ids to the boards they belong to.
+
+        Args:
+            role_links: Iterable of (user_id, role_title, verified) tuples
+                for the Mentor and Enabler roles.
+
+        Returns:
+            dict: user_id -> set of board names, for users that are excluded
+                from the student board.
+        """
+        user_boards = {}
+        for user_id, role_title, verified in role_links:
+            boards = user_boards.setdefault(user_id, set())
+            if not verified:
+                continue
+            if role_title == RoleType.MENTOR.value:
+                boards.add(KarmaLeaderboardType.MENTOR.value)
+            elif role_title == RoleType.ENABLER.value:
+                boards.add(KarmaLeaderboardType.ENABLER.value)
+        return user_boards
+
+    @staticmethod
+    def _get_role_links(user_ids=None):
+        role_links = UserRoleLink.objects.filter(
+            role__title__in=[RoleType.MENTOR.value, RoleType.ENABLER.value]
+        )
+        if user_ids is not None:
+            role_links = role_links.filter(user_id__in=user_ids)
+        return role_links.values_list("user_id", "role__title", "verified")
+
+    @classmethod
+    def update_users(cls, user_ids: list[str]) -> None:
+        """
+        Re-indexes the given users from their current wallet and roles.
+        Users without a wallet are removed from every board.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+
+        wallets = {
+            user_id: cls.get_score(karma, updated_at)
+            for user_id, karma, updated_at in Wallet.objects.filter(
+                user_id__in=user_ids
+            ).values_list("user_id", "karma", "updated_at")
+        }
+        user_boards = cls._get_user_boards(cls._get_role_links(user_ids))
+
+        pipeline = cls.get_connection().pipeline()
+        for user_id in user_ids:
+            boards = user_boards.get(user_id, {KarmaLeaderboardType.STUDENT.value})
+            score = wallets.get(user_id)
+
+            for board in KarmaLeaderboardType.get_all_values():
+                if score is not None and board in boards:
+                    pipeline.zadd(cls.get_key(board), {user_id: score})
+                else:
+                    pipeline.zrem(cls.get_key(board), user_id)
+        pipeline.execute()
+
+    @classmethod
+    def remove_user(cls, user_id: str) -> None:
+        pipeline = cls.get_connection().pipeline()
+        for board in KarmaLeaderboardType.get_all_values():
+            pipeline.zrem(cls.get_key(board), user_id)
+        pipeline.execute()
+
+    @classmethod
+    def rebuild(cls) -> dict:
+        """
+        Rebuilds every board from the wallet table and atomically swaps
+        the new sorted sets in.
+
+        Returns:
+            dict: The number of users indexed on each board.
+        """
+        connection = cls.get_connection()
+        user_boards = cls._get_user_boards(cls._get_role_links())
+        temp_keys = {
+            board: f"{cls.get_key(board)}:rebuild"
+            for board in KarmaLeaderboardType.get_all_values()
+        }
+        counts = dict.fromkeys(temp_keys, 0)
+
+        connection.delete(*temp_keys.values())
+
+        batch = {board: {} for board in temp_keys}
+        wallets = Wallet.objects.values_list("user_id", "karma", "updated_at").iterator(
+            chunk_size=cls.REBUILD_CHUNK_SIZE
+        )
+        for index, (user_id, karma, updated_at) in enumerate(wallets, start=1):
+            score = cls.get_score(karma, updated_at)
+            for board in user_boards.get(
+                user_id, {KarmaLeaderboardType.STUDENT.value}
+            ):
+                batch[board][user_id] = score
+                counts[board] += 1
+
+            if index % cls.REBUILD_CHUNK_SIZE == 0:
+                cls._flush_batch(connection, temp_keys, batch)
+
+        cls._flush_batch(connection, temp_keys, batch)
+
+        pipeline = connection.pipeline()
+        for board, temp_key in temp_keys.items():
+            if counts[board]:
+                pipeline.rename(temp_key, cls.get_key(board))
+            else:
+                pipeline.delete(cls.get_key(board))
+        pipeline.execute()
+
+        return counts
+
+    @staticmethod
+    def _flush_batch(connection, temp_keys: dict, batch: dict) -> None:
+        pipeline = connection.pipeline()
+        for board, members in batch.items():
+            if members:
+                pipeline.zadd(temp_keys[board], members)
+                members.clear()
+        pipeline.execute()
+
+    @classmethod
+    def get_rank(cls, board: str, user_id: str) -> int | None:
+        """
+        Returns the 1-based rank of a user on a board, or None when the
+        user is not indexed on it.
+        """
+        rank = cls.get_connection().zrevrank(cls.get_key(board), user_id)
+        return None if rank is None else rank + 1
+
+    @classmethod
+    def get_user_rank(cls, board: str, user_id: str, karma: int | None) -> int | None:
+        """
+        Returns the rank of a user, re-indexing them first when they are
+        missing from the board or indexed with other karma than `karma`,
+        their wallet's.
+        """
+        pipeline = cls.get_connection().pipeline()
+        pipeline.zrevrank(cls.get_key(board), user_id)
+        pipeline.zscore(cls.get_key(board), user_id)
+        rank, score = pipeline.execute()
+        if rank is None and karma is None:
+            return None
+        if rank is None or cls.get_karma(score) != karma:
+            cls.update_users([user_id])
+            return cls.get_rank(board, user_id)
+        return rank + 1
+
+    @classmethod
+    def get_top(cls, board: str, count: int, offset: int = 0) -> list[dict]:
+        """
+        Returns `count` entries of a board starting at `offset`, highest
+        karma first.
+        """
+        entries = cls.get_connection().zrevrange(
+            cls.get_key(board), offset, offset + count - 1, withscores=True
+        )
+        return [
+            {
+                "user_id": user_id.decode(),
+                "karma": cls.get_karma(score),
+                "rank": offset + position,
+            }
+            for position, (user_id, score) in enumerate(entries, start=1)
+        ]
+
+    @classmethod
+    def get_neighbours(cls, board: str, user_id: str, count: int = 5) -> list[dict]:
+        """
+        Returns up to `count` entries above and below a user on a board,
+        including the user.
+        """
+        rank = cls.get_rank(board, user_id)
+        if rank is None:
+            return []
+        offset = max(rank - 1 - count, 0)
+        return cls.get_top(board, rank + count - offset, offset)
+
+    @classmethod
+    def get_top_users(
+        cls, board: str, queryset, count: int, chunk_size: int = 100
+    ) -> list:
+        """
+        Returns the first `count` users of `queryset` in board order.
+
+        The board is walked in chunks so that filters it does not encode
+        (guild membership, college links, ...) can still be applied by the
+        queryset without sorting the whole user table. A filter too
+        selective to fill `count` within MAX_SCAN entries is left to MySQL.
+        """
+        user_ids = []
+        offset = 0
+        while len(user_ids) < count:
+            if offset >= cls.MAX_SCAN:
+                return list(
+                    queryset.filter(wallet_user__isnull=False).order_by(
+                        "-wallet_user__karma",
+                        "-wallet_user__updated_at",
+                        "wallet_user__created_at",
+                    )[:count]
+                )
+            entries = cls.get_top(board, chunk_size, offset)
+            if not entries:
+                break
+            candidate_ids = [entry["user_id"] for entry in entries]
+            eligible_ids = set(
+                queryset.filter(id__in=candidate_ids).values_list("id", flat=True)
+            )
+            user_ids.extend(
+                user_id for user_id in candidate_ids if user_id in eligible_ids
+            )
+            offset += chunk_size
+
+        user_ids = user_ids[:count]
+        users = {user.id: user for user in queryset.filter(id__in=user_ids)}
+        return [users[user_id] for user_id in user_ids if user_id in users]
+
+    @classmethod
+    def get_size(cls, board: str) -> int:
+        return cls.get_connection().zcard(cls.get_key(board))
+
+
+class InterestGroupLeaderboard:
+    """
+    Approved karma per interest group kept as one Redis sorted set per IG.
+
+    Approving or removing karma for an IG task re-indexes that user's
+    karma in the IG, so top-k boards, per-IG ranks and multi-IG totals
+    never aggregate the karma activity log.
+    """
+
+    KEY_PREFIX = "leaderboard:ig"
+    # Seconds a merged multi-IG board is reused
+    MERGED_BOARD_TTL = 60
+    REBUILD_CHUNK_SIZE = 5000
+
+    @staticmethod
+    def get_connection():
+        return get_redis_connection("redis")
+
+    @classmethod
+    def get_key(cls, ig_id: str) -> str:
+        return f"{cls.KEY_PREFIX}:{ig_id}"
+
+    @staticmethod
+    def _get_ig_karma(user_ids=None, ig_ids=None):
+        logs = KarmaActivityLog.objects.filter(
+            appraiser_approved=True, task__ig__isnull=False
+        ).exclude(user_id=None)
+        if user_ids is not None:
+            logs = logs.filter(user_id__in=user_ids)
+        if ig_ids is not None:
+            logs = logs.filter(task__ig_id__in=ig_ids)
+        return (
+            logs.values_list("user_id", "task__ig_id")
+            .annotate(ig_karma=Sum("karma"))
+            .order_by()
+        )
+
+    @classmethod
+    def update_user(cls, user_id: str, ig_ids: list[str]) -> None:
+        """
+        Re-indexes a user's karma in the given interest groups. The user
+        is removed from the IGs they no longer have approved karma in.
+        """
+        ig_karma = {
+            ig_id: karma
+            for _, ig_id, karma in cls._get_ig_karma([user_id], ig_ids)
+        }
+
+        pipeline = cls.get_connection().pipeline()
+        for ig_id in ig_ids:
+            if ig_id in ig_karma:
+                pipeline.zadd(cls.get_key(ig_id), {user_id: ig_karma[ig_id]})
+            else:
+                pipeline.zrem(cls.get_key(ig_id), user_id)
+        pipeline.execute()
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Rebuilds every IG board from the karma activity log and atomically
+        swaps the new sorted sets in.
+
+        Returns:
+            int: The number of (user, IG) entries indexed.
+        """
+        connection = cls.get_connection()
+        ig_ids = list(InterestGroup.objects.values_list("id", flat=True))
+        temp_keys = {ig_id: f"{cls.get_key(ig_id)}:rebuild" for ig_id in ig_ids}
+        if temp_keys:
+            connection.delete(*temp_keys.values())
+
+        indexed_igs = set()
+        batch = {ig_id: {} for ig_id in ig_ids}
+        rows = cls._get_ig_karma().iterator(chunk_size=cls.REBUILD_CHUNK_SIZE)
+        index = 0
+        for index, (user_id, ig_id, karma) in enumerate(rows, start=1):
+            if ig_id not in batch:
+                continue
+            batch[ig_id][user_id] = karma
+            indexed_igs.add(ig_id)
+
+            if index % cls.REBUILD_CHUNK_SIZE == 0:
+                KarmaLeaderboard._flush_batch(connection, temp_keys, batch)
+
+        KarmaLeaderboard._flush_batch(connection, temp_keys, batch)
+
+        pipeline = connection.pipeline()
+        for ig_id, temp_key in temp_keys.items():
+            if ig_id in indexed_igs:
+                pipeline.rename(temp_key, cls.get_key(ig_id))
+            else:
+                pipeline.delete(cls.get_key(ig_id))
+        pipeline.execute()
+
+        return index
+
+    @classmethod
+    def _get_board_key(cls, ig_ids: list[str]) -> str:
+        """
+        Returns the key of a single IG board, or of a short-lived board
+        summing the karma of several IGs.
+        """
+        ig_ids = sorted(set(ig_ids))
+        if len(ig_ids) == 1:
+            return cls.get_key(ig_ids[0])
+
+        key = f"{cls.KEY_PREFIX}:merged:{','.join(ig_ids)}"
+        connection = cls.get_connection()
+        if not connection.exists(key):
+            pipeline = connection.pipeline()
+            pipeline.zunionstore(key, [cls.get_key(ig_id) for ig_id in ig_ids])
+            pipeline.expire(key, cls.MERGED_BOARD_TTL)
+            pipeline.execute()
+        return key
+
+    @classmethod
+    def get_top(cls, ig_ids: list[str], count: int) -> list[dict]:
+        """
+        Returns the `count` users with the most karma across the given IGs,
+        highest first.
+        """
+        if not ig_ids:
+            return []
+        entries = cls.get_connection().zrevrange(
+            cls._get_board_key(ig_ids), 0, count - 1, withscores=True
+        )
+        return [
+            {"user_id": user_id.decode(), "karma": int(karma), "rank": rank}
+            for rank, (user_id, karma) in enumerate(entries, start=1)
+        ]
+
+    @classmethod
+    def get_user_standings(cls, user_id: str, ig_ids: list[str]) -> dict:
+        """
+        Returns ig_id -> {"karma", "rank"} for a user. Karma is 0 and rank
+        None in IGs the user has no approved karma in.
+        """
+        pipeline = cls.get_connection().pipeline()
+        for ig_id in ig_ids:
+            pipeline.zscore(cls.get_key(ig_id), user_id)
+            pipeline.zrevrank(cls.get_key(ig_id), user_id)
+        results = pipeline.execute()
+
+        standings = {}
+        for ig_id, karma, rank in zip(ig_ids, results[::2], results[1::2]):
+            standings[ig_id] = {
+                "karma": 0 if karma is None else int(karma),
+                "rank": None if rank is None else rank + 1,
+            }
+        return standings
+
+
+class LearningCircleKarma:
+    """
+    Maintains the `circle_karma` table: the approved karma accepted members
+    earned in their circle's interest group, one row per circle.
+
+    Rows are recomputed when a member's IG karma changes or circle
+    membership changes, so circle karma, circle rank within an IG and IG
+    circle leaderboards are indexed lookups.
+    """
+
+    REBUILD_CHUNK_SIZE = 500
+
+    @staticmethod
+    def refresh_circles(circle_ids: list[str]) -> None:
+        circle_ids = list(circle_ids)
+        if not circle_ids:
+            return
+
+        totals = dict(
+            KarmaActivityLog.objects.filter(
+                appraiser_approved=True,
+                user__user_circle_link_user__circle_id__in=circle_ids,
+                user__user_circle_link_user__accepted=True,
+                task__ig_id=F("user__user_circle_link_user__circle__ig_id"),
+            )
+            .values_list("user__user_circle_link_user__circle_id")
+            .annotate(total_karma=Sum("karma"))
+            .order_by()
+        )
+        rows = [
+            CircleKarma(
+                id=uuid.uuid4(),
+                circle_id=circle_id,
+                ig_id=ig_id,
+                total_karma=totals.get(circle_id, 0),
+            )
+            for circle_id, ig_id in LearningCircle.objects.filter(
+                id__in=circle_ids
+            ).values_list("id", "ig_id")
+        ]
+
+        with transaction.atomic():
+            CircleKarma.objects.filter(circle_id__in=circle_ids).delete()
+            CircleKarma.objects.bulk_create(rows)
+
+    @classmethod
+    def refresh_user_circles(cls, user_id: str, ig_id: str) -> None:
+        cls.refresh_circles(
+            UserCircleLink.objects.filter(
+                user_id=user_id, circle__ig_id=ig_id
+            ).values_list("circle_id", flat=True)
+        )
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recomputes the karma of every learning circle.
+
+        Returns:
+            int: The number of circles.
+        """
+        circle_ids = list(LearningCircle.objects.values_list("id", flat=True))
+        for start in range(0, len(circle_ids), cls.REBUILD_CHUNK_SIZE):
+            cls.refresh_circles(circle_ids[start : start + cls.REBUILD_CHUNK_SIZE])
+        return len(circle_ids)
+
+    @staticmethod
+    def get_total_karma(circle: LearningCircle) -> int:
+        circle_karma = getattr(circle, "circle_karma_circle", None)
+        return circle_karma.total_karma if circle_karma else 0
+
+    @staticmethod
+    def get_rank(circle: LearningCircle) -> int | None:
+        """
+        Returns the 1-based rank of a circle among the circles of its
+        interest group. Circles with equal karma share a rank.
+        """
+        if not (circle_karma := getattr(circle, "circle_karma_circle", None)):
+            return None
+        return (
+            CircleKarma.objects.filter(
+                ig_id=circle_karma.ig_id, total_karma__gt=circle_karma.total_karma
+            ).count()
+            + 1
+        )
+
+    @staticmethod
+    def get_top(ig_id: str, count: int):
+        return (
+            CircleKarma.objects.filter(ig_id=ig_id)
+            .select_related("circle")
+            .order_by("-total_karma")[:count]
+        )
+
+
+class MonthlyKarmaRollup:
+    """
+    Maintains the `monthly_karma` table: approved karma per user, per
+    college and per calendar month, so monthly leaderboards read a few
+    indexed rows instead of aggregating the whole karma activity log.
+
+    A user linked to several colleges gets one row per college; users
+    without a college get a single row with an empty org.
+    """
+
+    BACKFILL_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def get_month(date_time: datetime.datetime | datetime.date) -> datetime.date:
+        if isinstance(date_time, datetime.datetime):
+            date_time = date_time.date()
+        return date_time.replace(day=1)
+
+    @staticmethod
+    def get_month_range(month: datetime.date) -> tuple:
+        start = datetime.datetime.combine(month, datetime.time.min, datetime.timezone.utc)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        return start, end
+
+    @classmethod
+    def refresh(cls, user_ids: list[str], month: datetime.date = None) -> None:
+        """
+        Recomputes the rollup rows of the given users from the karma log.
+
+        Args:
+            user_ids (list): The users to recompute.
+            month (date, optional): Only recompute this month. Defaults to
+                every month.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+
+        logs = KarmaActivityLog.objects.filter(
+            user_id__in=user_ids, appraiser_approved=True
+        )
+        rollups = MonthlyKarma.objects.filter(user_id__in=user_ids)
+        if month:
+            month = cls.get_month(month)
+            start, end = cls.get_month_range(month)
+            logs = logs.filter(created_at__gte=start, created_at__lt=end)
+            rollups = rollups.filter(month=month)
+
+        totals = (
+            logs.annotate(log_month=TruncMonth("created_at"))
+            .values("user_id", "log_month")
+            .annotate(total_karma=Sum("karma"))
+            .order_by()
+        )
+
+        colleges = {}
+        for user_id, org_id in UserOrganizationLink.objects.filter(
+            user_id__in=user_ids, org__org_type=OrganizationType.COLLEGE.value
+        ).values_list("user_id", "org_id"):
+            colleges.setdefault(user_id, []).append(org_id)
+
+        monthly_karma = [
+            MonthlyKarma(
+                id=uuid.uuid4(),
+                user_id=total["user_id"],
+                org_id=org_id,
+                month=cls.get_month(total["log_month"]),
+                karma=total["total_karma"],
+            )
+            for total in totals
+            for org_id in colleges.get(total["user_id"], [None])
+        ]
+
+        # Concurrent refreshes of a user upsert on the (user, org, month)
+        # key instead of each inserting its own copy of the rows
+        current_keys = {(row.user_id, row.org_id, row.month) for row in monthly_karma}
+        stale_ids = [
+            rollup_id
+            for rollup_id, *key in rollups.values_list("id", "user_id", "org_id", "month")
+            if tuple(key) not in current_keys
+        ]
+        with transaction.atomic():
+            MonthlyKarma.objects.bulk_create(
+                monthly_karma,
+                update_conflicts=True,
+                update_fields=["karma", "updated_at"],
+            )
+            MonthlyKarma.objects.filter(id__in=stale_ids).delete()
+
+    @classmethod
+    def backfill(cls, month: datetime.date = None) -> int:
+        """
+        Rebuilds the rollup for every user with karma, in chunks of users.
+
+        Args:
+            month (date, optional): Only rebuild this month. Defaults to
+                every month.
+
+        Returns:
+            int: The number of users processed.
+        """
+        logs = KarmaActivityLog.objects.filter(appraiser_approved=True)
+        if month:
+            start, end = cls.get_month_range(cls.get_month(month))
+            logs = logs.filter(created_at__gte=start, created_at__lt=end)
+        user_ids = (
+            logs.exclude(user_id=None)
+            .values_list("user_id", flat=True)
+            .distinct()
+            .order_by()
+            .iterator(chunk_size=cls.BACKFILL_CHUNK_SIZE)
+        )
+
+        processed = 0
+        chunk = []
+        for user_id in user_ids:
+            chunk.append(user_id)
+            if len(chunk) == cls.BACKFILL_CHUNK_SIZE:
+                cls.refresh(chunk, month)
+                processed += len(chunk)
+                chunk = []
+        cls.refresh(chunk, month)
+        return processed + len(chunk)
+
+
+class KarmaAggregateTree:
+    """
+    Maintains the `karma_aggregate` table: total karma, member count and
+    active members of every college, rolled up to its district, zone and
+    state so the campus, district and zonal dashboards read one row each.
+
+    Wallet changes are applied as deltas along the org -> district -> zone
+    -> state chain, membership changes recompute the affected branch, and
+    the periodic rebuild reconciles karma written outside Django and the
+    time based active member counts. Ranks are counted from the
+    (level, total_karma) index rather than stored, so a single karma
+    change never has to renumber a whole level.
+    """
+
+    # Members whose karma changed within this period count as active
+    ACTIVE_MEMBER_PERIOD = datetime.timedelta(weeks=26)
+
+    PARENT_LEVELS = {
+        KarmaAggregateLevel.ORG.value: KarmaAggregateLevel.DISTRICT.value,
+        KarmaAggregateLevel.DISTRICT.value: KarmaAggregateLevel.ZONE.value,
+        KarmaAggregateLevel.ZONE.value: KarmaAggregateLevel.STATE.value,
+    }
+
+    @staticmethod
+    def _get_parent_maps() -> dict:
+        """
+        Returns, per level, a map of entity id -> id of the parent entity
+        on the level above it.
+        """
+        return {
+            KarmaAggregateLevel.DISTRICT.value: dict(
+                District.objects.values_list("id", "zone_id")
+            ),
+            KarmaAggregateLevel.ZONE.value: dict(
+                Zone.objects.values_list("id", "state_id")
+            ),
+            KarmaAggregateLevel.STATE.value: dict(
+                State.objects.values_list("id", "country_id")
+            ),
+        }
+
+    @classmethod
+    def _get_org_rows(cls, org_ids=None) -> list[dict]:
+        since = DateTimeUtils.get_current_utc_time() - cls.ACTIVE_MEMBER_PERIOD
+        links = UserOrganizationLink.objects.filter(
+            org__org_type=OrganizationType.COLLEGE.value
+        )
+        if org_ids is not None:
+            links = links.filter(org_id__in=org_ids)
+
+        return [
+            {
+                "level": KarmaAggregateLevel.ORG.value,
+                "entity_id": row["org_id"],
+                "parent_id": row["district_id"],
+                "total_karma": row["total_karma"],
+                "member_count": row["member_count"],
+                "active_members": row["active_members"],
+            }
+            for row in links.values("org_id", district_id=F("org__district_id"))
+            .annotate(
+                total_karma=Coalesce(Sum("user__wallet_user__karma"), 0),
+                member_count=Count("id"),
+                active_members=Count(
+                    "id",
+                    filter=Q(user__wallet_user__karma_last_updated_at__gte=since),
+                ),
+            )
+            .order_by()
+        ]
+
+    @staticmethod
+    def _roll_up(rows: list[dict], level: str, parent_map: dict) -> list[dict]:
+        """
+        Sums child rows into rows for the level above them.
+        """
+        parents = {}
+        for row in rows:
+            if row["parent_id"] is None:
+                continue
+            parent = parents.setdefault(
+                row["parent_id"],
+                {
+                    "level": level,
+                    "entity_id": row["parent_id"],
+                    "parent_id": parent_map.get(row["parent_id"]),
+                    "total_karma": 0,
+                    "member_count": 0,
+                    "active_members": 0,
+                },
+            )
+            parent["total_karma"] += row["total_karma"]
+            parent["member_count"] += row["member_count"]
+            parent["active_members"] += row["active_members"]
+        return list(parents.values())
+
+    @staticmethod
+    def _replace_rows(level: str, entity_ids, rows: list[dict]) -> None:
+        KarmaAggregate.objects.filter(level=level, entity_id__in=entity_ids).delete()
+        KarmaAggregate.objects.bulk_create(
+            [KarmaAggregate(id=uuid.uuid4(), **row) for row in rows]
+        )
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Recomputes the whole tree from the organization links and wallets.
+
+        Returns:
+            int: The number of aggregate rows written.
+        """
+        parent_maps = cls._get_parent_maps()
+        rows = level_rows = cls._get_org_rows()
+        for level in cls.PARENT_LEVELS.values():
+            level_rows = cls._roll_up(level_rows, level, parent_maps[level])
+            rows = rows + level_rows
+
+        with transaction.atomic():
+            KarmaAggregate.objects.all().delete()
+            KarmaAggregate.objects.bulk_create(
+                [KarmaAggregate(id=uuid.uuid4(), **row) for row in rows]
+            )
+        return len(rows)
+
+    @classmethod
+    def refresh_orgs(cls, org_ids: list[str]) -> None:
+        """
+        Recomputes the given colleges and every aggregate above them.
+        """
+        org_ids = list(org_ids)
+        if not org_ids:
+            return
+
+        parent_maps = cls._get_parent_maps()
+        org_rows = cls._get_org_rows(org_ids)
+        parent_ids = set(
+            Organization.objects.filter(id__in=org_ids).values_list(
+                "district_id", flat=True
+            )
+        )
+
+        with transaction.atomic():
+            cls._replace_rows(KarmaAggregateLevel.ORG.value, org_ids, org_rows)
+
+            for level, parent_level in cls.PARENT_LEVELS.items():
+                child_rows = [
+                    {
+                        "parent_id": row["parent_id"],
+                        "total_karma": row["total_karma"],
+                        "member_count": row["member_count"],
+                        "active_members": row["active_members"],
+                    }
+                    for row in KarmaAggregate.objects.filter(
+                        level=level, parent_id__in=parent_ids
+                    ).values(
+                        "parent_id", "total_karma", "member_count", "active_members"
+                    )
+                ]
+                parent_rows = cls._roll_up(
+                    child_rows, parent_level, parent_maps[parent_level]
+                )
+                cls._replace_rows(parent_level, parent_ids, parent_rows)
+                parent_ids = {
+                    parent_maps[parent_level].get(parent_id)
+                    for parent_id in parent_ids
+                } - {None}
+
+    @staticmethod
+    def apply_karma_delta(user_ids: list[str], delta: int) -> None:
+        """
+        Adds `delta` karma for each of the given users to their colleges
+        and every aggregate above them.
+        """
+        if not delta or not user_ids:
+            return
+
+        entity_counts = Counter()
+        for chain in UserOrganizationLink.objects.filter(
+            user_id__in=user_ids, org__org_type=OrganizationType.COLLEGE.value
+        ).values_list(
+            "org_id",
+            "org__district_id",
+            "org__district__zone_id",
+            "org__district__zone__state_id",
+        ):
+            entity_counts.update(zip(KarmaAggregateLevel.get_all_values(), chain))
+
+        entities_by_count = {}
+        for (level, entity_id), count in entity_counts.items():
+            entities_by_count[count] = entities_by_count.get(count, Q()) | Q(
+                level=level, entity_id=entity_id
+            )
+
+        for count, entities in entities_by_count.items():
+            KarmaAggregate.objects.filter(entities).update(
+                total_karma=F("total_karma") + delta * count,
+                updated_at=DateTimeUtils.get_current_utc_time(),
+            )
+
+    @staticmethod
+    def get_aggregate(level: str, entity_id: str) -> KarmaAggregate | None:
+        return KarmaAggregate.objects.filter(level=level, entity_id=entity_id).first()
+
+    @staticmethod
+    def get_rank(aggregate: KarmaAggregate | None) -> int | None:
+        """
+        Returns the 1-based rank of an aggregate among every entity of its
+        level. Entities with equal karma share a rank.
+        """
+        if aggregate is None:
+            return None
+        return (
+            KarmaAggregate.objects.filter(
+                level=aggregate.level, total_karma__gt=aggregate.total_karma
+            ).count()
+            + 1
+        )
+
+    @staticmethod
+    def get_top(level: str, parent_id: str, count: int):
+        return KarmaAggregate.objects.filter(level=level, parent_id=parent_id).order_by(
+            "-total_karma"
+        )[:count]
+
+
+class KarmaDistribution:
+    """
+    Histogram of wallet karma used for profile percentiles and the admin
+    karma distribution chart.
+
+    The distinct karma values and the number of wallets below each one are
+    refreshed on the beat schedule and cached. Every process also keeps the
+    snapshot for LOCAL_TTL seconds, so a percentile is a binary search
+    instead of two table counts.
+    """
+
+    CACHE_KEY = "karma:distribution"
+    # Outlives the beat interval so readers never rebuild in between
+    CACHE_TTL = 60 * 60
+    LOCAL_TTL = 60
+
+    _snapshot = None
+    _loaded_at = 0
+
+    @classmethod
+    def refresh(cls) -> dict:
+        values, below = [], []
+        wallets = 0
+        for karma, count in (
+            Wallet.objects.values_list("karma")
+            .annotate(count=Count("id"))
+            .order_by("karma")
+        ):
+            values.append(karma)
+            below.append(wallets)
+            wallets += count
+
+        snapshot = {
+            "values": values,
+            "below": below,
+            "wallets": wallets,
+            "users": User.objects.count(),
+        }
+        cache.set(cls.CACHE_KEY, snapshot, timeout=cls.CACHE_TTL)
+        cls._snapshot, cls._loaded_at = snapshot, time.monotonic()
+        return snapshot
+
+    @classmethod
+    def get_snapshot(cls) -> dict:
+        if cls._snapshot is not None and (
+            time.monotonic() - cls._loaded_at < cls.LOCAL_TTL
+        ):
+            return cls._snapshot
+        if (snapshot := cache.get(cls.CACHE_KEY)) is None:
+            return cls.refresh()
+        cls._snapshot, cls._loaded_at = snapshot, time.monotonic()
+        return snapshot
+
+    @staticmethod
+    def _count_below(snapshot: dict, karma: int) -> int:
+        index = bisect.bisect_left(snapshot["values"], karma)
+        if index == len(snapshot["values"]):
+            return snapshot["wallets"]
+        return snapshot["below"][index]
+
+    @classmethod
+    def get_percentile(cls, karma: int) -> float:
+        """
+        Returns the percentage of users whose karma is not below `karma`.
+        """
+        snapshot = cls.get_snapshot()
+        if snapshot["users"] == 0:
+            return 0
+        return 100 - ((cls._count_below(snapshot, karma) * 100) / snapshot["users"])
+
+    @classmethod
+    def get_buckets(cls, bucket_count: int) -> list[dict]:
+        """
+        Splits the karma range into equal-width buckets for charting.
+        """
+        snapshot = cls.get_snapshot()
+        if not snapshot["values"]:
+            return []
+
+        lowest, highest = snapshot["values"][0], snapshot["values"][-1]
+        width = max(-(-(highest - lowest + 1) // bucket_count), 1)
+        buckets = []
+        for start in range(lowest, highest + 1, width):
+            end = start + width
+            buckets.append(
+                {
+                    "min_karma": start,
+                    "max_karma": end - 1,
+                    "users": cls._count_below(snapshot, end)
+                    - cls._count_below(snapshot, start),
+                }
+            )
+        return buckets
+
+
+@receiver(post_save, sender=Wallet)
+def wallet_saved(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: KarmaLeaderboard.update_users([instance.user_id]))
+
+
+@receiver(post_delete, sender=Wallet)
+def wallet_deleted(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: KarmaLeaderboard.remove_user(instance.user_id))
+
+
+@receiver(post_save, sender=UserRoleLink)
+@receiver(post_delete, sender=UserRoleLink)
+def user_role_link_changed(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: KarmaLeaderboard.update_users([instance.user_id]))
+
+
+@receiver(post_save, sender=KarmaActivityLog)
+@receiver(post_delete, sender=KarmaActivityLog)
+def karma_activity_log_changed(sender, instance, *args, **kwargs):
+    if instance.user_id is None:
+        return
+    month = MonthlyKarmaRollup.get_month(instance.created_at)
+    transaction.on_commit(
+        lambda: MonthlyKarmaRollup.refresh([instance.user_id], month)
+    )
+
+
+def get_log_task(instance: KarmaActivityLog) -> dict:
+    """
+    Returns the ig_id and event of a karma log's task. The lookup is kept on
+    the instance, so the receivers of one save or delete share one query.
+    """
+    if KarmaActivityLog.task.is_cached(instance) and instance.task is not None:
+        return {"ig_id": instance.task.ig_id, "event": instance.task.event}
+
+    cached_task_id, task = getattr(instance, "_log_task", (None, None))
+    if task is None or cached_task_id != instance.task_id:
+        task = (
+            TaskList.objects.filter(id=instance.task_id).values("ig_id", "event").first()
+            or {"ig_id": None, "event": None}
+        )
+        instance._log_task = (instance.task_id, task)
+    return task
+
+
+@receiver(post_save, sender=KarmaActivityLog)
+@receiver(post_delete, sender=KarmaActivityLog)
+def ig_karma_changed(sender, instance, *args, **kwargs):
+    if instance.user_id is None:
+        return
+    if (ig_id := get_log_task(instance)["ig_id"]) is None:
+        return
+
+    def refresh():
+        InterestGroupLeaderboard.update_user(instance.user_id, [ig_id])
+        LearningCircleKarma.refresh_user_circles(instance.user_id, ig_id)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=UserCircleLink)
+@receiver(post_delete, sender=UserCircleLink)
+def user_circle_link_changed(sender, instance, *args, **kwargs):
+    transaction.on_commit(
+        lambda: LearningCircleKarma.refresh_circles([instance.circle_id])
+    )
+
+
+@receiver(post_save, sender=LearningCircle)
+def learning_circle_saved(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: LearningCircleKarma.refresh_circles([instance.id]))
+
+
+@receiver(post_init, sender=Wallet)
+def wallet_loaded(sender, instance, *args, **kwargs):
+    # Read from __dict__ so deferred karma fields are not fetched
+    instance._loaded_karma = instance.__dict__.get("karma")
+
+
+@receiver(post_save, sender=Wallet)
+def wallet_karma_changed(sender, instance, created=False, *args, **kwargs):
+    loaded_karma = 0 if created else instance._loaded_karma
+    if not isinstance(instance.karma, int) or loaded_karma is None:
+        return
+    delta = instance.karma - loaded_karma
+    instance._loaded_karma = instance.karma
+    transaction.on_commit(
+        lambda: KarmaAggregateTree.apply_karma_delta([instance.user_id], delta)
+    )
+
+
+@receiver(post_save, sender=UserOrganizationLink)
+@receiver(post_delete, sender=UserOrganizationLink)
+def user_organization_link_changed(sender, instance, *args, **kwargs):
+    def refresh():
+        MonthlyKarmaRollup.refresh([instance.user_id])
+        KarmaAggregateTree.refresh_orgs([instance.org_id])
+
+    transaction.on_commit(refresh)
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.leaderboard import MonthlyKarmaRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the monthly_karma rollup from the karma activity log"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            help="Only rebuild the given month, formatted as YYYY-MM",
+        )
+
+    def handle(self, *args, **options):
+        month = None
+        if options["month"]:
+            try:
+                month = datetime.datetime.strptime(options["month"], "%Y-%m").date()
+            except ValueError as e:
+                raise CommandError("Month must be formatted as YYYY-MM") from e
+
+        processed = MonthlyKarmaRollup.backfill(month)
+        self.stdout.write(
+            self.style.SUCCESS(f"Monthly karma rebuilt for {processed} users")
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.leaderboard import LearningCircleKarma
+
+
+class Command(BaseCommand):
+    help = "Recomputes the karma of every learning circle"
+
+    def handle(self, *args, **options):
+        circles = LearningCircleKarma.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{circles} learning circles refreshed"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from utils.leaderboard import InterestGroupLeaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per interest group karma leaderboards in Redis"
+
+    def handle(self, *args, **options):
+        entries = InterestGroupLeaderboard.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"{entries} interest group karma entries indexed")
+        )
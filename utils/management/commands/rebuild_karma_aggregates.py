@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.leaderboard import KarmaAggregateTree
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the campus, district, zone and state karma aggregates"
+
+    def handle(self, *args, **options):
+        rows = KarmaAggregateTree.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{rows} karma aggregates rebuilt"))
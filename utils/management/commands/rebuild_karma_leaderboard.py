@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from utils.leaderboard import KarmaLeaderboard
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the Redis karma leaderboards from the wallet table"
+
+    def handle(self, *args, **options):
+        counts = KarmaLeaderboard.rebuild()
+        for board, count in counts.items():
+            self.stdout.write(f"{board}: {count} users indexed")
+        self.stdout.write(self.style.SUCCESS("Karma leaderboards rebuilt"))
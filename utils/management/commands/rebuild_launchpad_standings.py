@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.launchpad.launchpad_helper import LaunchpadStandings
+
+
+class Command(BaseCommand):
+    help = "Rebuilds and re-ranks the launchpad leaderboard standings"
+
+    def handle(self, *args, **options):
+        participants = LaunchpadStandings.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"{participants} launchpad standings rebuilt")
+        )
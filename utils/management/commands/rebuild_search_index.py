@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.search import SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search documents of every indexed entity"
+
+    def handle(self, *args, **options):
+        for entity, documents in SearchIndex.rebuild_all().items():
+            self.stdout.write(self.style.SUCCESS(f"{documents} {entity} documents indexed"))
@@ -1,5 +1,6 @@
 import datetime
 from datetime import datetime
+from urllib.parse import parse_qs
 
 import jwt
 from django.conf import settings
@@ -155,6 +156,31 @@ class JWTUtils:
                 }
             ) from e
 
+    @staticmethod
+    def fetch_websocket_payload(scope):
+        """
+        Authenticates a websocket handshake with the same checks as
+        `is_jwt_authenticated`. Browsers cannot set headers on websockets,
+        so the token may also be passed as the `token` query parameter.
+
+        Returns:
+            dict: The token payload.
+
+        Raises:
+            UnauthorizedAccessException: If authentication fails.
+        """
+        headers = dict(scope.get("headers", []))
+        auth_header = headers.get(b"authorization", b"")
+        if not auth_header:
+            query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+            if token := query.get("token", [None])[0]:
+                auth_header = f"Bearer {token}".encode("utf-8")
+
+        request = HttpRequest()
+        request.META["HTTP_AUTHORIZATION"] = auth_header
+        _, payload = JWTUtils.is_jwt_authenticated(request)
+        return payload
+
     @staticmethod
     def is_logged_in(request):
         try:
@@ -0,0 +1,287 @@
+import re
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+
+from db.learning_circle import LearningCircle
+from db.organization import Organization
+from db.search import SearchDocument
+from db.task import TaskList, UserLvlLink, VoucherLog
+from db.user import User
+
+# The fields concatenated into each entity's search document. Only forward
+# relations and reverse one-to-ones (user_lvl_link_user), so every entity
+# maps to one row.
+SEARCH_ENTITIES = {
+    "user": (
+        User,
+        ["muid", "full_name", "email", "mobile", "user_lvl_link_user__level__name"],
+    ),
+    "organization": (
+        Organization,
+        [
+            "title",
+            "code",
+            "org_type",
+            "affiliation__title",
+            "district__name",
+            "district__zone__name",
+            "district__zone__state__name",
+        ],
+    ),
+    "task": (
+        TaskList,
+        [
+            "hashtag",
+            "title",
+            "description",
+            "event",
+            "type__title",
+            "channel__name",
+            "ig__name",
+            "org__title",
+            "level__name",
+            "created_by__full_name",
+            "updated_by__full_name",
+        ],
+    ),
+    "voucher": (
+        VoucherLog,
+        [
+            "code",
+            "user__full_name",
+            "user__muid",
+            "task__title",
+            "task__hashtag",
+            "karma",
+            "month",
+            "week",
+            "event",
+            "description",
+            "created_by__full_name",
+            "updated_by__full_name",
+        ],
+    ),
+    "learning_circle": (
+        LearningCircle,
+        ["title", "description", "ig__name", "org__title", "created_by__full_name"],
+    ),
+}
+
+
+class SearchIndex:
+    """
+    Keeps one denormalised search document per user, organisation, task,
+    voucher and learning circle in `search_document`, whose content has a
+    FULLTEXT index.
+
+    Saves queue the entity for a debounced reindex; a periodic rebuild
+    catches bulk writes and renamed related rows.
+    """
+
+    DIRTY_KEY = "search:dirty:{entity}"
+    QUEUED_KEY = "search:flush_queued"
+    READY_KEY = "search:ready:{entity}"
+    # Seconds to collect saves before reindexing them
+    FLUSH_DELAY = 10
+    CHUNK_SIZE = 1000
+    # InnoDB ignores shorter words (innodb_ft_min_token_size)
+    MIN_TOKEN_LENGTH = 3
+
+    @staticmethod
+    def get_entity(model) -> str | None:
+        return next(
+            (
+                entity
+                for entity, (entity_model, _) in SEARCH_ENTITIES.items()
+                if entity_model is model
+            ),
+            None,
+        )
+
+    @classmethod
+    def _write_documents(cls, entity: str, rows) -> int:
+        documents = [
+            SearchDocument(
+                id=str(uuid.uuid4()),
+                entity=entity,
+                entity_id=row[0],
+                content=" ".join(str(value) for value in row[1:] if value is not None),
+            )
+            for row in rows
+        ]
+        SearchDocument.objects.bulk_create(
+            documents,
+            batch_size=cls.CHUNK_SIZE,
+            update_conflicts=True,
+            update_fields=["content", "updated_at"],
+        )
+        return len(documents)
+
+    @classmethod
+    def index(cls, entity: str, entity_ids: list[str]) -> None:
+        """
+        Rewrites the documents of the given entities, dropping those that
+        no longer exist.
+        """
+        model, fields = SEARCH_ENTITIES[entity]
+        entity_ids = list(entity_ids)
+        rows = list(model.objects.filter(pk__in=entity_ids).values_list("pk", *fields))
+
+        with transaction.atomic():
+            SearchDocument.objects.filter(
+                entity=entity, entity_id__in=entity_ids
+            ).exclude(entity_id__in=[row[0] for row in rows]).delete()
+            cls._write_documents(entity, rows)
+
+    @classmethod
+    def rebuild(cls, entity: str) -> int:
+        """
+        Rewrites every document of the entity and marks its index ready.
+
+        Returns:
+            int: The number of documents.
+        """
+        model, fields = SEARCH_ENTITIES[entity]
+        indexed_ids = set()
+        chunk = []
+        for row in model.objects.values_list("pk", *fields).iterator(cls.CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == cls.CHUNK_SIZE:
+                cls._write_documents(entity, chunk)
+                indexed_ids.update(row[0] for row in chunk)
+                chunk = []
+        cls._write_documents(entity, chunk)
+        indexed_ids.update(row[0] for row in chunk)
+
+        stale_ids = set(
+            SearchDocument.objects.filter(entity=entity).values_list("entity_id", flat=True)
+        ) - indexed_ids
+        SearchDocument.objects.filter(entity=entity, entity_id__in=stale_ids).delete()
+
+        cache.set(cls.READY_KEY.format(entity=entity), True, None)
+        return len(indexed_ids)
+
+    @classmethod
+    def rebuild_all(cls) -> dict[str, int]:
+        return {entity: cls.rebuild(entity) for entity in SEARCH_ENTITIES}
+
+    @classmethod
+    def is_ready(cls, entity: str) -> bool:
+        """
+        Whether a rebuild of the entity has completed, so its index holds
+        every row and not only the ones saved since the table was created.
+        """
+        return bool(cache.get(cls.READY_KEY.format(entity=entity)))
+
+    @classmethod
+    def mark_dirty(cls, entity: str, *entity_ids: str) -> None:
+        from mu_celery.task import flush_search_index
+
+        get_redis_connection("redis").sadd(
+            cls.DIRTY_KEY.format(entity=entity), *entity_ids
+        )
+        if cache.add(cls.QUEUED_KEY, True, timeout=cls.FLUSH_DELAY * 2):
+            flush_search_index.apply_async(countdown=cls.FLUSH_DELAY)
+
+    @classmethod
+    def flush(cls) -> None:
+        """
+        Reindexes the entities saved since the last flush.
+        """
+        cache.delete(cls.QUEUED_KEY)
+        connection = get_redis_connection("redis")
+        for entity in SEARCH_ENTITIES:
+            dirty_key = cls.DIRTY_KEY.format(entity=entity)
+            pipeline = connection.pipeline()
+            pipeline.smembers(dirty_key)
+            pipeline.delete(dirty_key)
+            entity_ids, _ = pipeline.execute()
+            entity_ids = [entity_id.decode() for entity_id in entity_ids]
+            for start in range(0, len(entity_ids), cls.CHUNK_SIZE):
+                cls.index(entity, entity_ids[start : start + cls.CHUNK_SIZE])
+
+    @classmethod
+    def get_boolean_query(cls, search_query: str) -> str | None:
+        """
+        Turns user input into a boolean-mode query requiring every word as a
+        prefix, or None when no word is long enough to be indexed.
+        """
+        tokens = [
+            token
+            for token in re.split(r"\W+", search_query)
+            if len(token) >= cls.MIN_TOKEN_LENGTH
+        ]
+        return " ".join(f"+{token}*" for token in tokens) or None
+
+    @staticmethod
+    def get_field_path(queryset, field: str) -> str:
+        """
+        Resolves a search field that aliases a related field, such as
+        `level=F("user_lvl_link_user__level__name")`, to the field's path.
+        """
+        annotation = queryset.query.annotations.get(field)
+        return annotation.name if isinstance(annotation, F) else field
+
+    @classmethod
+    def get_search_filter(
+        cls, queryset, search_fields: list[str], search_query: str
+    ) -> Q | None:
+        """
+        Returns a filter matching the queryset's rows whose document matches
+        `search_query`, or None when the model is not indexed, its document
+        does not hold every one of `search_fields`, its index is not built
+        yet or the query has no indexable word.
+        """
+        entity = cls.get_entity(queryset.model)
+        if entity is None:
+            return None
+        indexed_fields = set(SEARCH_ENTITIES[entity][1])
+        if any(
+            cls.get_field_path(queryset, field) not in indexed_fields
+            for field in search_fields
+        ):
+            return None
+        if not cls.is_ready(entity):
+            return None
+        if not (boolean_query := cls.get_boolean_query(search_query)):
+            return None
+
+        matching_ids = (
+            SearchDocument.objects.filter(entity=entity)
+            .filter(
+                RawSQL(
+                    "MATCH (content) AGAINST (%s IN BOOLEAN MODE)",
+                    (boolean_query,),
+                    output_field=BooleanField(),
+                )
+            )
+            .values("entity_id")
+        )
+        return Q(pk__in=matching_ids)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+@receiver(post_save, sender=TaskList)
+@receiver(post_delete, sender=TaskList)
+@receiver(post_save, sender=VoucherLog)
+@receiver(post_delete, sender=VoucherLog)
+@receiver(post_save, sender=LearningCircle)
+@receiver(post_delete, sender=LearningCircle)
+def search_entity_changed(sender, instance, *args, **kwargs):
+    entity = SearchIndex.get_entity(sender)
+    transaction.on_commit(lambda: SearchIndex.mark_dirty(entity, instance.pk))
+
+
+@receiver(post_save, sender=UserLvlLink)
+def user_level_changed(sender, instance, *args, **kwargs):
+    transaction.on_commit(lambda: SearchIndex.mark_dirty("user", instance.user_id))
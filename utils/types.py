@@ -54,6 +54,27 @@ class RoleType(Enum):
         return f"{ig_code} IGLead"
 
 
+class KarmaLeaderboardType(Enum):
+    STUDENT = "student"
+    MENTOR = "mentor"
+    ENABLER = "enabler"
+
+    @classmethod
+    def get_all_values(cls):
+        return [member.value for member in cls]
+
+
+class KarmaAggregateLevel(Enum):
+    ORG = "org"
+    DISTRICT = "district"
+    ZONE = "zone"
+    STATE = "state"
+
+    @classmethod
+    def get_all_values(cls):
+        return [member.value for member in cls]
+
+
 class OrganizationType(Enum):
     COLLEGE = "College"
     COMPANY = "Company"
@@ -192,6 +213,28 @@ class LearningCircleRecurrenceType(Enum):
         return [member.value for member in cls]
 
 
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    @classmethod
+    def get_all_values(cls):
+        return [member.value for member in cls]
+
+
+class VoucherMailStatus(Enum):
+    QUEUED = "queued"
+    SENT = "sent"
+    RETRYING = "retrying"
+    FAILED = "failed"
+
+    @classmethod
+    def get_all_values(cls):
+        return [member.value for member in cls]
+
+
 DEFAULT_HACKATHON_FORM_FIELDS = {
     "name": "system",
     "gender": "system",
@@ -1,23 +1,147 @@
+import base64
 import csv
 import datetime
-import gzip
+import hashlib
 import io
+import itertools
+import json
+import zlib
 from datetime import timedelta
+from typing import Iterator
 
 import openpyxl
 import pytz
 import requests
+from asgiref.sync import sync_to_async
 from decouple import config
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.core.mail import EmailMessage, send_mail
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import Q
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value, Window
+from django.db.models.expressions import OrderBy
+from django.db.models.functions import Coalesce, Rank
 from django.db.models.query import QuerySet
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
+from django.utils.functional import cached_property
 import string, random
 
 
+class EstimatedPage(Page):
+    """
+    A page whose paginator only knows an estimated total, so whether a
+    next page exists comes from reading one row past the page.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountCachingPaginator(Paginator):
+    """
+    Paginator that caches the total count of a query and search term for
+    COUNT_TTL seconds. Unfiltered queries on large tables use the table's
+    row statistics instead of COUNT(*); `is_count_exact` tells which.
+    """
+
+    COUNT_TTL = 60
+    # Tables smaller than this are cheap enough to count exactly
+    ESTIMATE_THRESHOLD = 100000
+
+    def __init__(self, object_list, per_page, search_query=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.search_query = search_query
+        self.is_count_exact = True
+
+    def get_count_key(self) -> str | None:
+        try:
+            signature = f"{self.object_list.db}:{self.object_list.query}:{self.search_query}"
+        except EmptyResultSet:
+            return None
+        return f"paginator:count:{hashlib.md5(signature.encode()).hexdigest()}"
+
+    def get_estimated_count(self) -> int | None:
+        """
+        Returns the table's estimated row count when the query selects the
+        whole table, otherwise None.
+        """
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if (
+            connection.vendor != "mysql"
+            or query.where
+            or query.distinct
+            or query.group_by is not None
+            or query.combinator
+            or query.is_sliced
+        ):
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [query.get_meta().db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+
+        estimated_count = self.get_estimated_count()
+        if estimated_count is not None and estimated_count >= self.ESTIMATE_THRESHOLD:
+            self.is_count_exact = False
+            return estimated_count
+
+        count_key = self.get_count_key()
+        if count_key is None:
+            return 0
+        count = cache.get(count_key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(count_key, count, self.COUNT_TTL)
+        return count
+
+    def validate_number(self, number):
+        # Reading count settles is_count_exact; an estimated total must not
+        # hide the pages past it
+        if self.count and not self.is_count_exact:
+            try:
+                number = int(number)
+            except (TypeError, ValueError) as e:
+                raise PageNotAnInteger("That page number is not an integer") from e
+            if number < 1:
+                raise EmptyPage("That page number is less than 1")
+            return number
+        return super().validate_number(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.is_count_exact:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        return EstimatedPage(
+            rows[: self.per_page], number, self, len(rows) > self.per_page
+        )
+
+
+# Rows serialized per query and CSV text compressed per chunk when streaming
+CSV_CHUNK_ROWS = 1000
+CSV_CHUNK_BYTES = 64 * 1024
+
+
 class CommonUtils:
     @staticmethod
     def get_paginated_queryset(
@@ -37,6 +161,11 @@ class CommonUtils:
             - sort_fields (dict, optional): A dictionary mapping sort fields. Defaults to None.
             - is_pagination (bool, optional): Flag indicating whether pagination should be applied. Defaults to True.
 
+        Sending a `cursor` query parameter (empty for the first page) switches
+        to keyset pagination: pages are read after or before the opaque
+        `nextCursor` / `prevCursor` token instead of by offset, and no total
+        count is computed, so deep pages cost the same as the first one.
+
         Returns:
             - QuerySet or dict: The paginated queryset or a dictionary containing the paginated queryset and pagination information.
         """
@@ -49,9 +178,17 @@ class CommonUtils:
         sort_by = request.query_params.get("sortBy")
 
         if search_query:
-            query = Q()
-            for field in search_fields:
-                query |= Q(**{f"{field}__icontains": search_query})
+            from utils.search import SearchIndex
+
+            # Indexed entities search their full-text document; other lists
+            # fall back to scanning the search fields
+            query = SearchIndex.get_search_filter(
+                queryset, search_fields, search_query
+            )
+            if query is None:
+                query = Q()
+                for field in search_fields:
+                    query |= Q(**{f"{field}__icontains": search_query})
 
             queryset = queryset.filter(query)
 
@@ -63,7 +200,15 @@ class CommonUtils:
 
                 queryset = queryset.order_by(sort_field_name)
         if is_pagination:
-            paginator = Paginator(queryset, per_page)
+            cursor = request.query_params.get("cursor")
+            if cursor is not None and (
+                ordering := CommonUtils.get_keyset_ordering(queryset)
+            ):
+                return CommonUtils.get_keyset_page(
+                    queryset, ordering, cursor, max(per_page, 1)
+                )
+
+            paginator = CountCachingPaginator(queryset, per_page, search_query)
             try:
                 queryset = paginator.page(page)
             except PageNotAnInteger:
@@ -75,6 +220,7 @@ class CommonUtils:
                 "queryset": queryset,
                 "pagination": {
                     "count": paginator.count,
+                    "isCountExact": paginator.is_count_exact,
                     "totalPages": paginator.num_pages,
                     "isNext": queryset.has_next(),
                     "isPrev": queryset.has_previous(),
@@ -87,24 +233,226 @@ class CommonUtils:
         return queryset
 
     @staticmethod
-    def generate_csv(queryset: QuerySet, csv_name: str) -> HttpResponse:
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="{csv_name}.csv"'
-        fieldnames = list(queryset[0].keys())
-        writer = csv.DictWriter(response, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(queryset)
+    def get_keyset_ordering(queryset: QuerySet) -> list[tuple[str, bool]] | None:
+        """
+        Returns the queryset ordering as (field, descending) pairs ending in
+        the primary key, or None when it cannot be paginated by keyset.
+        """
+        query = queryset.query
+        if query.group_by is not None or any(
+            annotation.contains_over_clause for annotation in query.annotations.values()
+        ):
+            return None
+
+        ordering = []
+        for field in query.order_by or query.get_meta().ordering:
+            if isinstance(field, str) and field != "?":
+                ordering.append((field.lstrip("-"), field.startswith("-")))
+            elif (
+                isinstance(field, OrderBy)
+                and isinstance(field.expression, F)
+                and not (field.nulls_first or field.nulls_last)
+            ):
+                ordering.append((field.expression.name, field.descending))
+            else:
+                return None
+
+        pk_name = query.get_meta().pk.name
+        if not any(field in ("pk", pk_name) for field, _ in ordering):
+            ordering.append(("pk", ordering[-1][1] if ordering else False))
+        return ordering
 
-        compressed_response = HttpResponse(
-            gzip.compress(response.content),
-            content_type="text/csv",
+    @staticmethod
+    def encode_cursor(values: list, is_next: bool) -> str:
+        cursor = json.dumps(
+            {"values": values, "next": is_next},
+            default=lambda value: (
+                value.isoformat() if hasattr(value, "isoformat") else str(value)
+            ),
+        )
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, ordering: list) -> tuple[list, bool] | None:
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, is_next = cursor["values"], cursor["next"]
+        except (TypeError, KeyError, ValueError):
+            return None
+        # Tokens issued for another sort order start from the first page
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        return values, bool(is_next)
+
+    @staticmethod
+    def get_keyset_filter(ordering: list, values: list, is_next: bool) -> Q:
+        """
+        Builds the lexicographic "comes after" (or "comes before") condition
+        for `values`. MySQL sorts NULL lowest, so NULLs come first in
+        ascending and last in descending order.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (field, descending), value in zip(ordering, values):
+            if descending == is_next:
+                if value is None:
+                    after = Q(pk__in=[])
+                else:
+                    after = Q(**{f"{field}__lt": value}) | Q(**{f"{field}__isnull": True})
+            elif value is None:
+                after = Q(**{f"{field}__isnull": False})
+            else:
+                after = Q(**{f"{field}__gt": value})
+
+            condition |= equal & after
+            equal &= Q(**{f"{field}__isnull": True} if value is None else {field: value})
+        return condition
+
+    @staticmethod
+    def get_rank(scope: QuerySet, order_by: list[OrderBy], request=None):
+        """
+        Returns the rank of each row within `scope` by `order_by`, like
+        RANK() over it. `scope` must hold one row per ranked object, so
+        filter multi-valued relations through a subquery, not a join.
+
+        A window is computed after the WHERE clause, so when `request`, the
+        one the list is paginated with, searches it, rows are ranked by
+        counting the rows of `scope` ahead of them in a correlated subquery
+        instead.
+        """
+        if request is None or not request.query_params.get("search"):
+            return Window(expression=Rank(), order_by=order_by)
+
+        ahead = Q(pk__in=[])
+        equal = Q()
+        for ordering in order_by:
+            field = ordering.expression.name
+            lookup = "gt" if ordering.descending else "lt"
+            ahead |= equal & Q(**{f"{field}__{lookup}": OuterRef(field)})
+            equal &= Q(**{field: OuterRef(field)})
+
+        rows_ahead = (
+            scope.filter(ahead)
+            .order_by()
+            .annotate(group=Value(1))
+            .values("group")
+            .annotate(count=Count("pk", distinct=True))
+            .values("count")
+        )
+        return Coalesce(Subquery(rows_ahead, output_field=IntegerField()), 0) + 1
+
+    @staticmethod
+    def get_keyset_page(queryset: QuerySet, ordering: list, cursor: str, per_page: int) -> dict:
+        aliases = [f"_cursor_{index}" for index in range(len(ordering))]
+        queryset = queryset.annotate(
+            **{alias: F(field) for alias, (field, _) in zip(aliases, ordering)}
         )
-        compressed_response["Content-Disposition"] = (
-            f'attachment; filename="{csv_name}.csv"'
+
+        decoded = CommonUtils.decode_cursor(cursor, ordering) if cursor else None
+        is_next = decoded is None or decoded[1]
+        if decoded:
+            queryset = queryset.filter(
+                CommonUtils.get_keyset_filter(ordering, decoded[0], is_next)
+            )
+        queryset = queryset.order_by(
+            *(
+                f"-{field}" if descending == is_next else field
+                for field, descending in ordering
+            )
+        )
+
+        rows = list(queryset[: per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if not is_next:
+            rows.reverse()
+
+        cursors = []
+        for row in rows:
+            if isinstance(row, dict):
+                cursors.append([row.pop(alias) for alias in aliases])
+            else:
+                cursors.append([getattr(row, alias) for alias in aliases])
+
+        has_next = bool(cursors) and (has_more if is_next else decoded is not None)
+        has_prev = bool(cursors) and (decoded is not None if is_next else has_more)
+        return {
+            "queryset": rows,
+            "pagination": {
+                "perPage": per_page,
+                "isNext": has_next,
+                "isPrev": has_prev,
+                "nextCursor": (
+                    CommonUtils.encode_cursor(cursors[-1], True) if has_next else None
+                ),
+                "prevCursor": (
+                    CommonUtils.encode_cursor(cursors[0], False) if has_prev else None
+                ),
+            },
+        }
+
+    @staticmethod
+    def iter_serialized(queryset: QuerySet, serializer_class, chunk_size: int = CSV_CHUNK_ROWS, **kwargs):
+        """
+        Yields the serialized rows of `queryset`, reading and serializing
+        `chunk_size` rows at a time instead of the whole list at once.
+        """
+        chunk = []
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(instance)
+            if len(chunk) == chunk_size:
+                yield from serializer_class(chunk, many=True, **kwargs).data
+                chunk = []
+        if chunk:
+            yield from serializer_class(chunk, many=True, **kwargs).data
+
+    @staticmethod
+    def iter_gzip_csv(rows):
+        """
+        Writes dict rows as CSV and yields it gzip-compressed, buffering at
+        most CSV_CHUNK_BYTES of text at a time. The header comes from the
+        keys of the first row.
+        """
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        buffer = io.StringIO()
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+
+            if buffer.tell() >= CSV_CHUNK_BYTES:
+                if compressed := compressor.compress(buffer.getvalue().encode()):
+                    yield compressed
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield compressor.compress(buffer.getvalue().encode()) + compressor.flush()
+
+    @staticmethod
+    async def iter_async(iterator):
+        # daphne would collect a synchronous iterator into memory before
+        # sending it, so each chunk is produced in the ORM's sync thread
+        iterator = iter(iterator)
+        while (chunk := await sync_to_async(next)(iterator, None)) is not None:
+            yield chunk
+
+    @staticmethod
+    def generate_csv(queryset, csv_name: str) -> StreamingHttpResponse:
+        """
+        Streams the rows of `queryset`, any iterable of dicts, as a gzip
+        encoded CSV download. Pass a lazy iterable such as `iter_serialized`
+        to keep memory flat for large exports.
+        """
+        response = StreamingHttpResponse(
+            CommonUtils.iter_async(CommonUtils.iter_gzip_csv(queryset)),
+            content_type="text/csv",
         )
-        compressed_response["Content-Encoding"] = "gzip"
+        response["Content-Disposition"] = f'attachment; filename="{csv_name}.csv"'
+        response["Content-Encoding"] = "gzip"
 
-        return compressed_response
+        return response
 
 
 class DateTimeUtils:
@@ -178,19 +526,86 @@ class DiscordWebhooks:
 
 
 class ImportCSV:
-    def read_excel_file(self, file_obj):
-        workbook = openpyxl.load_workbook(filename=io.BytesIO(file_obj.read()))
-        sheet = workbook.active
+    """
+    Reads uploaded .xlsx and .csv sheets row by row. The first row is the
+    header; every following non-empty row is yielded as a dict keyed by it,
+    so memory stays bounded however long the sheet is.
+    """
 
-        rows = []
-        for row in sheet.iter_rows(values_only=True):
-            row_dict = {
-                header.value: cell_value for header, cell_value in zip(sheet[1], row)
-            }
-            rows.append(row_dict)
-        workbook.close()
+    @staticmethod
+    def is_csv(file_obj) -> bool:
+        return getattr(file_obj, "name", "").lower().endswith(".csv") or (
+            getattr(file_obj, "content_type", None) == "text/csv"
+        )
+
+    @staticmethod
+    def _parse_csv_value(value: str):
+        # Matches the typed values openpyxl returns for spreadsheet cells
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            return value
+        return number if str(number) == value else value
+
+    def _iter_csv_values(self, file_obj):
+        file_obj.seek(0)
+        text_file = io.TextIOWrapper(file_obj, encoding="utf-8-sig", newline="")
+        try:
+            for row in csv.reader(text_file):
+                yield tuple(self._parse_csv_value(value) for value in row)
+        finally:
+            # Leaves the upload open for its owner
+            text_file.detach()
+
+    @staticmethod
+    def _iter_excel_values(file_obj):
+        file_obj.seek(0)
+        workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def read_rows(self, file_obj) -> tuple[list, Iterator[dict]]:
+        """
+        Returns the header of the sheet and a lazy iterator over its rows.
+        """
+        values = (
+            self._iter_csv_values(file_obj)
+            if self.is_csv(file_obj)
+            else self._iter_excel_values(file_obj)
+        )
+        header_row = next(values, None) or ()
+        headers = [
+            header.strip() if isinstance(header, str) else header
+            for header in header_row
+        ]
+
+        def iter_rows():
+            for row in values:
+                if not any(value is not None for value in row):
+                    continue
+                yield {
+                    header: value
+                    for header, value in zip(headers, itertools.chain(row, itertools.repeat(None)))
+                    if header is not None
+                }
+
+        return headers, iter_rows()
+
+    def read_excel_file(self, file_obj):
+        """
+        Returns every row of the sheet, led by the header row mapped onto
+        itself, as the bulk importers expect.
+        """
+        headers, rows = self.read_rows(file_obj)
+        if not headers:
+            return []
 
-        return rows
+        return [{header: header for header in headers if header is not None}, *rows]
 
 
 def send_template_mail(